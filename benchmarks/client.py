@@ -0,0 +1,269 @@
+"""Client performance benchmarks against the local stand-in server.
+
+Measures latency, throughput, request counts and peak memory of the main
+client operations, without network access:
+
+    python benchmarks/client.py run --output benchmarks/results/client.json
+    python benchmarks/client.py run --payload-mb 1 10 100 1000
+    python benchmarks/client.py compare baseline.json current.json --threshold 0.2
+
+``compare`` exits with a non-zero status if any benchmark's median latency
+or peak memory regressed by more than ``--threshold`` (a fraction).
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+os.environ.setdefault("DISABLE_RICH_CONSOLE", "true")
+
+from bermuda import meyers_tri  # noqa: E402
+
+from ledger_analytics.__about__ import __version__  # noqa: E402
+from ledger_analytics.local_server import LocalAnalyticsServer  # noqa: E402
+
+RESULTS = Path(__file__).parent / "results" / "client.json"
+METRICS = ("p50_s", "peak_mb")
+
+
+def _measure(
+    server: LocalAnalyticsServer,
+    name: str,
+    fn: Callable[[], object],
+    repeat: int,
+    **params,
+) -> dict:
+    """Time ``repeat`` calls of ``fn``, then make one more call under
+    ``tracemalloc`` to record peak memory."""
+    latencies = []
+    requests_before = server.request_count
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    n_requests = (server.request_count - requests_before) / repeat
+
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    result = {
+        "name": name,
+        "params": params,
+        "repeat": repeat,
+        "mean_s": statistics.fmean(latencies),
+        "p50_s": statistics.median(latencies),
+        "p95_s": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        "throughput_per_s": repeat / sum(latencies),
+        "requests_per_call": n_requests,
+        "peak_mb": peak / 1_048_576,
+    }
+    print(
+        f"{name:>36} {json.dumps(params):<24} "
+        f"p50={result['p50_s'] * 1000:9.2f}ms "
+        f"req/call={n_requests:7.1f} peak={result['peak_mb']:8.2f}MB",
+        file=sys.stderr,
+    )
+    return result
+
+
+def _payload(megabytes: float) -> dict:
+    """A copy of ``meyers_tri`` with ``paid_loss`` samples sized so the
+    JSON body is roughly ``megabytes`` large."""
+    data = meyers_tri.to_dict()
+    cells = [cell for slice_ in data["slices"] for cell in slice_["cells"]]
+    # A sample is ~20 bytes as JSON text, e.g. "1234567.8901234567, ".
+    n_samples = max(1, int(megabytes * 1_048_576 / 20 / len(cells)))
+    for i, cell in enumerate(cells):
+        base = float(cell["values"]["paid_loss"])
+        cell["values"]["paid_loss"] = [
+            base + (i * 31 + j) % 997 / 7.0 for j in range(n_samples)
+        ]
+    return data
+
+
+def _seed(server: LocalAnalyticsServer, client, n: int) -> None:
+    """Grow the server to ``n`` triangles and ``n`` development models."""
+    small = {"slices": [meyers_tri.to_dict()["slices"][0] | {"cells": []}]}
+    existing = client.triangle.list(limit=1)["count"]
+    for i in range(existing, n):
+        client.triangle.create(name=f"bench_triangle_{i}", data=small)
+        client.development_model.create(
+            triangle=f"bench_triangle_{i}",
+            name=f"bench_model_{i}",
+            model_type="ChainLadder",
+        )
+
+
+def run(counts: list[int], payload_mb: list[float], repeat: int) -> list[dict]:
+    results = []
+    with LocalAnalyticsServer() as server:
+        client = server.client(asynchronous=True)
+        data = meyers_tri.to_dict()
+        results.append(
+            _measure(
+                server,
+                "triangle.create",
+                lambda: client.triangle.create(
+                    name="bench_meyers", data=data, overwrite=True
+                ),
+                repeat,
+            )
+        )
+
+        for n in counts:
+            _seed(server, client, n)
+            last = f"bench_triangle_{n - 1}"
+            results.append(
+                _measure(
+                    server,
+                    "triangle.list",
+                    lambda: client.triangle.list(limit=n),
+                    repeat,
+                    objects=n,
+                )
+            )
+            results.append(
+                _measure(
+                    server,
+                    "triangle._get_details_from_id_name",
+                    lambda: client.triangle._get_details_from_id_name(name=last),
+                    repeat,
+                    objects=n,
+                )
+            )
+            results.append(
+                _measure(
+                    server,
+                    "triangle.get",
+                    lambda: client.triangle.get(name=last),
+                    repeat,
+                    objects=n,
+                )
+            )
+            results.append(
+                _measure(
+                    server,
+                    "development_model.get",
+                    lambda: client.development_model.get(name=f"bench_model_{n - 1}"),
+                    repeat,
+                    objects=n,
+                )
+            )
+
+    for mb in payload_mb:
+        with LocalAnalyticsServer() as server:
+            client = server.client()
+            triangle = client.triangle.create(name="bench_payload", data=_payload(mb))
+            del triangle
+            gc.collect()
+            results.append(
+                _measure(
+                    server,
+                    "triangle.get[payload]",
+                    lambda: client.triangle.get(name="bench_payload"),
+                    max(1, repeat // 5) if mb >= 100 else repeat,
+                    megabytes=mb,
+                )
+            )
+
+    task_duration = 0.25
+    with LocalAnalyticsServer(task_duration=task_duration) as server:
+        client = server.client()
+        client.triangle.create(name="bench_meyers", data=meyers_tri)
+
+        def fit():
+            client.development_model.create(
+                triangle="bench_meyers",
+                name="bench_polling",
+                model_type="ChainLadder",
+                overwrite=True,
+            )
+
+        result = _measure(
+            server, "polling[fit]", fit, max(1, repeat // 2), task_s=task_duration
+        )
+        result["overhead_s"] = result["p50_s"] - task_duration
+        results.append(result)
+
+    return results
+
+
+def _key(result: dict) -> str:
+    return result["name"] + json.dumps(result["params"], sort_keys=True)
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """Describe every metric in ``current`` that regressed relative to
+    ``baseline`` by more than ``threshold``."""
+    before = {_key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = before.get(_key(result))
+        if old is None:
+            continue
+        for metric in METRICS:
+            if old[metric] > 0 and result[metric] > old[metric] * (1 + threshold):
+                change = result[metric] / old[metric] - 1
+                regressions.append(
+                    f"{result['name']} {json.dumps(result['params'])} {metric}: "
+                    f"{old[metric]:.4g} -> {result[metric]:.4g} ({change:+.0%})"
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run")
+    run_parser.add_argument("--output", type=Path, default=RESULTS)
+    run_parser.add_argument("--repeat", type=int, default=20)
+    run_parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000])
+    run_parser.add_argument(
+        "--payload-mb", type=float, nargs="+", default=[1.0, 10.0, 100.0]
+    )
+    compare_parser = commands.add_parser("compare")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        output = {
+            "version": __version__,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": run(args.counts, args.payload_mb, args.repeat),
+        }
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(output, indent=2) + "\n")
+        return
+
+    regressions = compare(
+        json.loads(args.baseline.read_text()),
+        json.loads(args.current.read_text()),
+        args.threshold,
+    )
+    for regression in regressions:
+        print(regression)
+    if regressions:
+        sys.exit(1)
+    print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Import-time benchmark for ledger_analytics.
+
+Runs each import scenario in a fresh interpreter with ``python -X importtime``
+and records the median cumulative import cost of the package, excluding
+interpreter start-up. Results are keyed by package version so the cost can
+be tracked across releases:
+
+    python benchmarks/import_time.py                # print results
+    python benchmarks/import_time.py --save         # record this version
+    python benchmarks/import_time.py --compare      # compare with the last saved version
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+RESULTS = Path(__file__).parent / "results" / "import_time.json"
+
+SCENARIOS = {
+    "package": "import ledger_analytics",
+    "client": "from ledger_analytics import AnalyticsClient",
+    "triangle": "from ledger_analytics import Triangle",
+    "models": "from ledger_analytics import ChainLadder",
+}
+
+
+def _import_times(statement: str) -> dict[str, tuple[int, int]]:
+    """Top-level ``(self, cumulative)`` microseconds per module for ``statement``."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if not name.startswith("  "):
+            times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def measure(statement: str, repeat: int = 7) -> dict[str, float]:
+    baseline = set(_import_times("pass"))
+    totals = []
+    for _ in range(repeat):
+        times = _import_times(statement)
+        totals.append(
+            sum(cum for name, (_, cum) in times.items() if name not in baseline)
+        )
+    return {"median_us": statistics.median(totals), "min_us": min(totals)}
+
+
+def run(repeat: int) -> dict[str, dict[str, float]]:
+    return {name: measure(stmt, repeat) for name, stmt in SCENARIOS.items()}
+
+
+def _version() -> str:
+    from ledger_analytics.__about__ import __version__
+
+    return __version__
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--save", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--results", type=Path, default=RESULTS)
+    args = parser.parse_args()
+
+    history = json.loads(args.results.read_text()) if args.results.exists() else {}
+    version = _version()
+    results = run(args.repeat)
+
+    previous_version = next((v for v in reversed(list(history)) if v != version), None)
+    for name, result in results.items():
+        line = f"{name:>10}: {result['median_us'] / 1000:8.1f}ms"
+        if args.compare and previous_version is not None:
+            before = history[previous_version].get(name)
+            if before:
+                change = result["median_us"] / before["median_us"] - 1
+                line += f"  ({change:+.0%} vs {previous_version})"
+        print(line)
+
+    if args.save:
+        history[version] = results
+        args.results.parent.mkdir(parents=True, exist_ok=True)
+        args.results.write_text(json.dumps(history, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,65 @@
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 from .__about__ import __version__
-from .api import AnalyticsClient
-from .autofit import AutofitControl
-from .cashflow import CashflowModel
-from .development import GMCL, ChainLadder, ManualATA, MeyersCRC, TraditionalChainLadder
-from .forecast import AR1, SSM, TraditionalGCC
-from .interface import CashflowInterface, ModelInterface, TriangleInterface
-from .model import DevelopmentModel, ForecastModel, TailModel
-from .requester import Requester
-from .tail import ClassicalPowerTransformTail, GeneralizedBondy, Sherman
-from .triangle import Triangle
+
+_LAZY_IMPORTS = {
+    "AnalyticsClient": ".api",
+    "AutofitControl": ".autofit",
+    "WarmStart": ".autofit",
+    "CashflowModel": ".cashflow",
+    "GMCL": ".development",
+    "ChainLadder": ".development",
+    "ManualATA": ".development",
+    "MeyersCRC": ".development",
+    "TraditionalChainLadder": ".development",
+    "AR1": ".forecast",
+    "SSM": ".forecast",
+    "TraditionalGCC": ".forecast",
+    "CashflowInterface": ".interface",
+    "ModelInterface": ".interface",
+    "TriangleInterface": ".interface",
+    "DevelopmentModel": ".model",
+    "ForecastModel": ".model",
+    "TailModel": ".model",
+    "Requester": ".requester",
+    "ClassicalPowerTransformTail": ".tail",
+    "GeneralizedBondy": ".tail",
+    "Sherman": ".tail",
+    "Triangle": ".triangle",
+}
+
+__all__ = ["__version__", *_LAZY_IMPORTS]
+
+
+def __getattr__(name: str):
+    """Import public classes on first access to keep ``import ledger_analytics`` cheap."""
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_LAZY_IMPORTS})
+
+
+if TYPE_CHECKING:
+    from .api import AnalyticsClient
+    from .autofit import AutofitControl, WarmStart
+    from .cashflow import CashflowModel
+    from .development import (
+        GMCL,
+        ChainLadder,
+        ManualATA,
+        MeyersCRC,
+        TraditionalChainLadder,
+    )
+    from .forecast import AR1, SSM, TraditionalGCC
+    from .interface import CashflowInterface, ModelInterface, TriangleInterface
+    from .model import DevelopmentModel, ForecastModel, TailModel
+    from .requester import Requester
+    from .tail import ClassicalPowerTransformTail, GeneralizedBondy, Sherman
+    from .triangle import Triangle
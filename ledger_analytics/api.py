@@ -1,11 +1,24 @@
 from __future__ import annotations
 
 import os
+import threading
 from abc import ABC
 from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Iterable, TypeVar
 
+from .breaker import CircuitBreaker
+from .codec import Compression, JSONCodec
+from .fit_cache import FitCache
 from .interface import CashflowInterface, ModelInterface, TriangleInterface
-from .requester import Requester
+from .journal import ResumedTask, TaskJournal, get_journal, resume
+from .progress import Reporter
+from .requester import Requester, _fork_resets
+from .throttle import Throttle
+from .tuning import TuningStore
+
+if TYPE_CHECKING:
+    from .callbacks import CallbackListener
 
 DEFAULT_HOST = "https://api.korra.com/analytics/"
 EnvConfig = namedtuple("EnvConfig", ["host", "api_key"])
@@ -25,12 +38,48 @@ ENVIRONMENTS = {
 }
 ENV = ENVIRONMENTS[os.getenv("LEDGER_ANALYTICS_ENV", "PROD").upper()]
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Marks the client's pool threads, so nested ``submit`` and ``map`` calls
+# run inline rather than waiting on a pool they're occupying.
+_pool_thread = threading.local()
+
+
+def _mark_pool_thread() -> None:
+    _pool_thread.active = True
+
 
 class BaseClient(ABC):
+    """Common client state: the requester and a managed thread pool.
+
+    Clients are thread-safe: one client, and the interfaces and handles it
+    returns, can be shared by many threads. ``submit`` and ``map`` run work
+    on the client's own thread pool, which is shut down by ``close`` or on
+    leaving a ``with`` block.
+
+    Clients can also be pickled, e.g. for ``ProcessPoolExecutor`` workers,
+    and are safe to use in forked children. Each process gets its own
+    thread pool, and only the parent uses the callback listener (see
+    ``Requester``).
+    """
+
     def __init__(
         self,
         api_key: str | None = None,
         asynchronous: bool = False,
+        codec: JSONCodec | str | None = None,
+        compression: Compression | None = None,
+        reporter: Reporter | str | None = None,
+        retain_responses: bool = False,
+        callbacks: CallbackListener | None = None,
+        journal: TaskJournal | str | os.PathLike | None = None,
+        fit_cache: FitCache | bool | str | os.PathLike | None = None,
+        tuning_store: TuningStore | str | os.PathLike | None = None,
+        throttle: Throttle | bool | None = None,
+        circuit_breaker: CircuitBreaker | bool | None = None,
+        cell_deltas: bool = False,
+        max_workers: int | None = None,
     ) -> None:
         if api_key is None:
             api_key = ENV.api_key
@@ -39,17 +88,146 @@ class BaseClient(ABC):
                     "Must pass in a valid `api_key` or set the `LEDGER_ANALYTICS_API_KEY` environment variable."
                 )
 
-        self._requester = Requester(api_key)
+        self._requester = Requester(
+            api_key,
+            codec=codec,
+            compression=compression,
+            reporter=reporter,
+            retain_responses=retain_responses,
+            callbacks=callbacks,
+            journal=journal,
+            fit_cache=fit_cache,
+            tuning_store=tuning_store,
+            throttle=throttle,
+            circuit_breaker=circuit_breaker,
+            cell_deltas=cell_deltas,
+        )
 
         self.host = ENV.host
 
         self.asynchronous = asynchronous
 
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._pool: ThreadPoolExecutor | None = None
+        self._interfaces: dict[tuple, Any] = {}
+        _fork_resets.add(self)
+
+    reporter = property(lambda self: self._requester.reporter)
+    callbacks = property(lambda self: self._requester.callbacks)
+    journal = property(lambda self: self._requester.journal)
+    fit_cache = property(lambda self: self._requester.fit_cache)
+    tuning_store = property(lambda self: self._requester.tuning_store)
+    throttle = property(lambda self: self._requester.throttle)
+    circuit_breaker = property(lambda self: self._requester.circuit_breaker)
+    cell_deltas = property(lambda self: self._requester.cell_deltas)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        for key in ("_lock", "_pool", "_interfaces"):
+            del state[key]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._pool = None
+        self._interfaces = {}
+        _fork_resets.add(self)
+
+    def _reset_after_fork(self) -> None:
+        # The parent's pool threads don't exist in the child.
+        self.__setstate__(self.__getstate__())
+
+    def _interface(self, name: str, factory: Callable[[], T]) -> T:
+        """The interface ``name`` for the current host, requester and mode,
+        built once and shared by all threads."""
+        key = (name, self.host, self._requester, self.asynchronous)
+        interface = self._interfaces.get(key)
+        if interface is None:
+            with self._lock:
+                interface = self._interfaces.setdefault(key, factory())
+        return interface
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        """The client's thread pool, started on first use with
+        ``max_workers`` threads."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="ledger-analytics",
+                    initializer=_mark_pool_thread,
+                )
+            return self._pool
+
+    def submit(self, fn: Callable[..., R], *args, **kwargs) -> Future[R]:
+        """Run ``fn(*args, **kwargs)`` on the client's thread pool.
+
+        ..  code:: python
+
+            future = client.submit(client.triangle.get, name="meyers")
+            triangle = future.result()
+        """
+        if getattr(_pool_thread, "active", False):
+            future = Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as exc:
+                future.set_exception(exc)
+            return future
+        return self.pool.submit(fn, *args, **kwargs)
+
+    def map(
+        self,
+        fn: Callable[[T], R],
+        items: Iterable[T],
+        max_workers: int | None = None,
+    ) -> list[R]:
+        """Apply ``fn`` to every item on the client's thread pool, with at
+        most ``max_workers`` calls running at once, and return the results
+        in order. The first exception raised is re-raised, and calls that
+        haven't started yet are cancelled.
+
+        ..  code:: python
+
+            triangles = client.map(
+                lambda name: client.triangle.get(name=name), names, max_workers=16
+            )
+        """
+        limit = threading.BoundedSemaphore(max_workers) if max_workers else None
+
+        def call(item: T) -> R:
+            try:
+                return fn(item)
+            finally:
+                if limit is not None:
+                    limit.release()
+
+        futures = []
+        try:
+            for item in items:
+                if limit is not None:
+                    limit.acquire()
+                futures.append(self.submit(call, item))
+            return [future.result() for future in futures]
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def close(self) -> None:
+        """Shut down the client's thread pool, waiting for running work."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
     def __enter__(self) -> BaseClient:
         return self
 
     def __exit__(self, type, value, traceback):
-        pass
+        self.close()
 
 
 class AnalyticsClient(BaseClient):
@@ -57,33 +235,107 @@ class AnalyticsClient(BaseClient):
         self,
         api_key: str | None = None,
         asynchronous: bool = False,
+        codec: JSONCodec | str | None = None,
+        compression: Compression | None = None,
+        reporter: Reporter | str | None = None,
+        retain_responses: bool = False,
+        callbacks: CallbackListener | None = None,
+        journal: TaskJournal | str | os.PathLike | None = None,
+        fit_cache: FitCache | bool | str | os.PathLike | None = None,
+        tuning_store: TuningStore | str | os.PathLike | None = None,
+        throttle: Throttle | bool | None = None,
+        circuit_breaker: CircuitBreaker | bool | None = None,
+        cell_deltas: bool = False,
+        max_workers: int | None = None,
     ):
-        super().__init__(api_key=api_key, asynchronous=asynchronous)
+        super().__init__(
+            api_key=api_key,
+            asynchronous=asynchronous,
+            codec=codec,
+            compression=compression,
+            reporter=reporter,
+            retain_responses=retain_responses,
+            callbacks=callbacks,
+            journal=journal,
+            fit_cache=fit_cache,
+            tuning_store=tuning_store,
+            throttle=throttle,
+            circuit_breaker=circuit_breaker,
+            cell_deltas=cell_deltas,
+            max_workers=max_workers,
+        )
 
     triangle = property(
-        lambda self: TriangleInterface(self.host, self._requester, self.asynchronous)
+        lambda self: self._interface(
+            "triangle",
+            lambda: TriangleInterface(self.host, self._requester, self.asynchronous),
+        )
     )
     development_model = property(
-        lambda self: ModelInterface(
-            "development_model", self.host, self._requester, self.asynchronous
+        lambda self: self._interface(
+            "development_model",
+            lambda: ModelInterface(
+                "development_model", self.host, self._requester, self.asynchronous
+            ),
         )
     )
     tail_model = property(
-        lambda self: ModelInterface(
-            "tail_model", self.host, self._requester, self.asynchronous
+        lambda self: self._interface(
+            "tail_model",
+            lambda: ModelInterface(
+                "tail_model", self.host, self._requester, self.asynchronous
+            ),
         )
     )
     forecast_model = property(
-        lambda self: ModelInterface(
-            "forecast_model", self.host, self._requester, self.asynchronous
+        lambda self: self._interface(
+            "forecast_model",
+            lambda: ModelInterface(
+                "forecast_model", self.host, self._requester, self.asynchronous
+            ),
         )
     )
     cashflow_model = property(
-        lambda self: CashflowInterface(
-            "cashflow_model", self.host, self._requester, self.asynchronous
+        lambda self: self._interface(
+            "cashflow_model",
+            lambda: CashflowInterface(
+                "cashflow_model", self.host, self._requester, self.asynchronous
+            ),
         )
     )
 
+    def resume(
+        self,
+        journal: TaskJournal | str | os.PathLike | None = None,
+        timeout: int = 300,
+        include_finished: bool = False,
+    ) -> list[ResumedTask]:
+        """Reattach to the fits and predictions recorded in a task journal
+        and collect their results, without resubmitting anything.
+
+        Args:
+            journal: the journal to resume. Defaults to the client's journal.
+            timeout: the total seconds to wait for unfinished tasks.
+            include_finished: also return tasks the journal already records
+                as finished.
+
+        Returns:
+            A ``ResumedTask`` for each task, with its ``kind`` (``"fit"`` or
+            ``"predict"``), ``status`` (``None`` if it's still running),
+            model handle and ``result``: the model for a successful fit, or
+            the predicted triangle for a successful prediction.
+        """
+        journal = get_journal(journal) or self.journal
+        if journal is None:
+            raise ValueError("No journal to resume: pass one or set `journal`.")
+        return resume(
+            self.host,
+            self._requester,
+            journal,
+            timeout=timeout,
+            include_finished=include_finished,
+        )
+
     def test_endpoint(self) -> str:
         self._requester.get(self.host + "triangle")
         return "Endpoint working!"
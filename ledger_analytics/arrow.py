@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from .config import JSONDict
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+    from bermuda import Triangle as BermudaTriangle
+
+    from .triangle import Triangle
+
+DEFAULT_BATCH_ROWS = 1_048_576
+
+COLUMNS = [
+    "triangle_name",
+    "program_name",
+    "period_start",
+    "period_end",
+    "evaluation_date",
+    "field",
+    "sample",
+    "value",
+]
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError(
+            "Columnar export requires `pyarrow`. Install it with "
+            "`pip install 'ledger-analytics[arrow]'`."
+        ) from exc
+    return pa, pq
+
+
+def arrow_schema(float32: bool = False) -> pa.Schema:
+    """The long-format schema used for all triangle exports.
+
+    Each row is a single sample of a single field in a single cell.
+    Scalar (non-stochastic) values have ``sample == 0``. The triangle name,
+    program name and field columns are dictionary encoded.
+
+    Args:
+        float32: downcast the ``value`` column to 32-bit floats.
+    """
+    pa, _ = _import_pyarrow()
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema(
+        [
+            ("triangle_name", dictionary),
+            ("program_name", dictionary),
+            ("period_start", pa.date32()),
+            ("period_end", pa.date32()),
+            ("evaluation_date", pa.date32()),
+            ("field", dictionary),
+            ("sample", pa.int32()),
+            ("value", pa.float32() if float32 else pa.float64()),
+        ]
+    )
+
+
+class _BatchBuilder:
+    """Accumulates cell values column-wise and emits bounded record batches."""
+
+    def __init__(self, schema: pa.Schema, batch_rows: int) -> None:
+        self._schema = schema
+        self._batch_rows = batch_rows
+        self._value_type = (
+            np.float32 if schema.field("value").type.bit_width == 32 else np.float64
+        )
+        self._reset()
+
+    def _reset(self) -> None:
+        self._n_rows = 0
+        self._dictionaries = {"triangle_name": {}, "program_name": {}, "field": {}}
+        self._indices = {key: [] for key in self._dictionaries}
+        self._dates = {"period_start": [], "period_end": [], "evaluation_date": []}
+        self._samples = []
+        self._values = []
+
+    def _index(self, column: str, value: str | None, n: int) -> None:
+        if value is None:
+            self._indices[column].append(np.full(n, -1, dtype=np.int32))
+            return
+        index = self._dictionaries[column].setdefault(
+            value, len(self._dictionaries[column])
+        )
+        self._indices[column].append(np.full(n, index, dtype=np.int32))
+
+    def add(
+        self,
+        triangle_name: str | None,
+        program_name: str | None,
+        cell: JSONDict,
+    ) -> Iterator[pa.RecordBatch]:
+        for field, value in cell["values"].items():
+            values = np.asarray(
+                np.nan if value is None else value, dtype=self._value_type
+            ).ravel()
+            n = len(values)
+            self._index("triangle_name", triangle_name, n)
+            self._index("program_name", program_name, n)
+            self._index("field", field, n)
+            for column, dates in self._dates.items():
+                dates.append(np.full(n, cell[column], dtype="datetime64[D]"))
+            self._samples.append(np.arange(n, dtype=np.int32))
+            self._values.append(values)
+            self._n_rows += n
+            if self._n_rows >= self._batch_rows:
+                yield self.flush()
+
+    def flush(self) -> pa.RecordBatch:
+        pa, _ = _import_pyarrow()
+        columns = {}
+        for column, dictionary in self._dictionaries.items():
+            indices = np.concatenate(self._indices[column] or [np.empty(0, np.int32)])
+            columns[column] = pa.DictionaryArray.from_arrays(
+                pa.array(indices, mask=indices < 0),
+                pa.array(list(dictionary), type=pa.string()),
+            )
+        for column, dates in self._dates.items():
+            columns[column] = pa.array(
+                np.concatenate(dates or [np.empty(0, "datetime64[D]")]),
+                type=pa.date32(),
+            )
+        columns["sample"] = pa.array(
+            np.concatenate(self._samples or [np.empty(0, np.int32)])
+        )
+        columns["value"] = pa.array(
+            np.concatenate(self._values or [np.empty(0, self._value_type)])
+        )
+        batch = pa.RecordBatch.from_arrays(
+            [columns[name] for name in COLUMNS], schema=self._schema
+        )
+        self._reset()
+        return batch
+
+    @property
+    def n_rows(self) -> int:
+        return self._n_rows
+
+
+def _is_triangle(obj: Any) -> bool:
+    return isinstance(obj, dict) or any(
+        hasattr(obj, attr) for attr in ("to_dict", "to_bermuda")
+    )
+
+
+def _named_data(
+    triangle: Triangle | BermudaTriangle | JSONDict,
+) -> tuple[str | None, JSONDict]:
+    if isinstance(triangle, dict):
+        return None, triangle
+    if hasattr(triangle, "to_bermuda"):
+        return triangle.name, triangle.data
+    return None, triangle.to_dict()
+
+
+def iter_record_batches(
+    triangles: Triangle | BermudaTriangle | JSONDict | Iterable[Any],
+    float32: bool = False,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+) -> Iterator[pa.RecordBatch]:
+    """Stream triangles as Arrow record batches of at most ``batch_rows`` rows.
+
+    ``triangles`` can be a single triangle or any iterable of triangles,
+    including a generator that fetches each triangle on demand, in which case
+    only one triangle and one batch are held in memory at a time.
+
+    Args:
+        triangles: ledger ``Triangle`` handles, ``bermuda`` triangles or
+            triangle dictionaries.
+        float32: downcast the ``value`` column to 32-bit floats.
+        batch_rows: the approximate maximum number of rows per batch.
+    """
+    if _is_triangle(triangles):
+        triangles = [triangles]
+
+    builder = _BatchBuilder(arrow_schema(float32), batch_rows)
+    for triangle in triangles:
+        triangle_name, data = _named_data(triangle)
+        for slice_ in data.get("slices", []):
+            program_name = slice_.get("details", {}).get("program_name")
+            for cell in slice_["cells"]:
+                yield from builder.add(triangle_name, program_name, cell)
+    if builder.n_rows:
+        yield builder.flush()
+
+
+def to_arrow(
+    triangles: Triangle | BermudaTriangle | JSONDict | Iterable[Any],
+    float32: bool = False,
+) -> pa.Table:
+    """Convert one or more triangles to a single long-format Arrow table.
+
+    See :func:`arrow_schema` for the table layout.
+    """
+    pa, _ = _import_pyarrow()
+    schema = arrow_schema(float32)
+    return pa.Table.from_batches(
+        iter_record_batches(triangles, float32=float32), schema=schema
+    ).unify_dictionaries()
+
+
+def write_parquet(
+    triangles: Triangle | BermudaTriangle | JSONDict | Iterable[Any],
+    path: str,
+    float32: bool = False,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    compression: str = "zstd",
+) -> int:
+    """Stream one or more triangles to a Parquet file.
+
+    Batches are written as they are produced, so memory use is bounded
+    by ``batch_rows`` rather than by the total number of samples.
+
+    Args:
+        triangles: see :func:`iter_record_batches`.
+        path: the output file path.
+        float32: downcast the ``value`` column to 32-bit floats.
+        batch_rows: the approximate maximum number of rows per row group.
+        compression: the Parquet compression codec.
+
+    Returns:
+        The number of rows written.
+    """
+    _, pq = _import_pyarrow()
+    schema = arrow_schema(float32)
+    n_rows = 0
+    with pq.ParquetWriter(path, schema, compression=compression) as writer:
+        for batch in iter_record_batches(
+            triangles, float32=float32, batch_rows=batch_rows
+        ):
+            writer.write_batch(batch)
+            n_rows += batch.num_rows
+    return n_rows
@@ -1,6 +1,7 @@
 import json
+from typing import Literal
 
-from .config import ValidationConfig
+from .config import JSONDict, ValidationConfig
 
 
 class AutofitControl(ValidationConfig):
@@ -40,6 +41,12 @@ class AutofitControl(ValidationConfig):
         ebfmi_threshold: the threshold value of the EBFMI diagnostic.
         min_ess: the minimum effective sample size required.
         max_rhat: the maximum Rhat diagnostic.
+        max_wall_time_seconds: the wall-clock budget for the whole autofit
+            procedure. When it runs out, the best run so far is returned.
+            Defaults to ``None`` for no limit.
+        target_ess_per_second: stop autofitting once the diagnostics pass and
+            the minimum effective sample size per second of sampling reaches
+            this value. Defaults to ``None``.
     """
 
     samples_per_chain: int = 2500
@@ -56,3 +63,63 @@ class AutofitControl(ValidationConfig):
     ebfmi_threshold: float = 0.2
     min_ess: int = 1000
     max_rhat: float = 1.05
+    max_wall_time_seconds: float | None = None
+    target_ess_per_second: float | None = None
+
+
+# Budget fields that are only sent to the server when set.
+BUDGET_FIELDS = ("max_wall_time_seconds", "target_ess_per_second")
+
+
+def autofit_override(autofit: JSONDict | None) -> JSONDict:
+    """Validate autofit parameters and fill in their defaults, leaving out
+    unset budget fields."""
+    return {
+        key: value
+        for key, value in AutofitControl(**(autofit or {})).__dict__.items()
+        if value is not None or key not in BUDGET_FIELDS
+    }
+
+
+class WarmStart(ValidationConfig):
+    """Warm-start parameters for refitting an MCMC model.
+
+    A warm start initializes sampling from a previous fit of the same model
+    type, typically on the same triangle before it gained a diagonal, so
+    the new run needs far less warmup and autofit escalation. Users usually
+    set it with ``warm_start_from`` rather than directly:
+
+    ..  code:: python
+
+        client.development_model.create(
+            triangle="meyers_2024Q4",
+            name="meyers_2024Q4_chain_ladder",
+            model_type="ChainLadder",
+            warm_start_from="meyers_2024Q3_chain_ladder",
+        )
+
+    Attributes:
+        model_id: the ID of the previously fit model.
+        step_size: reuse the previous fit's adapted HMC step size.
+        mass_matrix: reuse the previous fit's adapted mass matrix.
+        inits: initialize chains at draws from the previous posterior.
+    """
+
+    model_id: str
+    step_size: bool = True
+    mass_matrix: bool = True
+    inits: bool = True
+
+
+class AutofitConfig(ValidationConfig):
+    """The config fields shared by models fit with the autofit procedure.
+
+    Attributes:
+        warm_start: a ``WarmStart`` from a previous fit. See "Warm starts"
+            in the autofit User Guide.
+        autofit: ``"auto"`` to tune ``autofit_override`` from past fits. See
+            "Tuned settings" in the autofit User Guide.
+    """
+
+    warm_start: dict[str, str | bool] | None = None
+    autofit: Literal["auto"] | None = None
@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import datetime
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Sequence
+
+from .delta import cell_key
+from .interface import ModelInterface, TriangleInterface, _is_bermuda_triangle
+from .report import Report
+
+if TYPE_CHECKING:
+    import numpy as np
+    from bermuda import Triangle as BermudaTriangle
+
+    from .api import AnalyticsClient
+    from .config import JSONDict
+
+logger = logging.getLogger(__name__)
+
+REPORT_FIELDS = (
+    "eval_date",
+    "holdout_date",
+    "status",
+    "n_cells",
+    "crps",
+    "scaled_crps",
+    "fit_seconds",
+)
+
+
+def crps(samples: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """The continuous ranked probability score of each row of ``samples``
+    (cells by samples) against ``actual``, using the sorted-sample form
+    ``E|X - y| - E|X - X'| / 2``. Lower is better."""
+    import numpy as np
+
+    samples = np.sort(samples, axis=1)
+    m = samples.shape[1]
+    error = np.abs(samples - actual[:, None]).mean(axis=1)
+    weights = 2 * np.arange(1, m + 1) - m - 1
+    spread = (samples * weights).sum(axis=1) / (m * m)
+    return error - spread
+
+
+def coverage(samples: np.ndarray, actual: np.ndarray, level: float) -> np.ndarray:
+    """Whether each ``actual`` falls in the central ``level`` interval of
+    its row of ``samples``."""
+    import numpy as np
+
+    lower, upper = np.quantile(samples, [(1 - level) / 2, (1 + level) / 2], axis=1)
+    return (lower <= actual) & (actual <= upper)
+
+
+def score(
+    prediction: JSONDict,
+    holdout: JSONDict,
+    field: str,
+    levels: Sequence[float] = (0.5, 0.9),
+) -> JSONDict:
+    """Score predicted samples of ``field`` against held-out values, over
+    the cells present in both. Cells are grouped by sample count so each
+    group is scored as one array."""
+    import numpy as np
+
+    actuals = {
+        cell_key(cell): cell["values"][field]
+        for slice_ in holdout["slices"]
+        for cell in slice_["cells"]
+        if field in cell["values"]
+    }
+    groups: dict[int, tuple[list, list]] = {}
+    for slice_ in prediction["slices"]:
+        for cell in slice_["cells"]:
+            actual = actuals.get(cell_key(cell))
+            samples = cell["values"].get(field)
+            if actual is None or samples is None:
+                continue
+            samples = np.atleast_1d(np.asarray(samples, dtype=float))
+            rows, values = groups.setdefault(len(samples), ([], []))
+            rows.append(samples)
+            values.append(float(actual))
+
+    crps_values, covered, actual_values = [], {level: [] for level in levels}, []
+    for rows, values in groups.values():
+        samples, actual = np.stack(rows), np.asarray(values)
+        crps_values.append(crps(samples, actual))
+        actual_values.append(actual)
+        for level in levels:
+            covered[level].append(coverage(samples, actual, level))
+
+    n_cells = sum(len(values) for _, values in groups.values())
+    result = {"n_cells": n_cells, "crps": None, "scaled_crps": None}
+    result |= {f"coverage_{level:g}": None for level in levels}
+    if n_cells:
+        mean_crps = float(np.concatenate(crps_values).mean())
+        scale = float(np.abs(np.concatenate(actual_values)).mean())
+        result["crps"] = mean_crps
+        result["scaled_crps"] = mean_crps / scale if scale else None
+        for level in levels:
+            result[f"coverage_{level:g}"] = float(np.concatenate(covered[level]).mean())
+    return result
+
+
+def _target(holdout: JSONDict) -> JSONDict:
+    """The held-out cells to predict, without their losses."""
+    return {
+        "slices": [
+            slice_
+            | {
+                "cells": [
+                    cell
+                    | {
+                        "values": {
+                            k: v
+                            for k, v in cell["values"].items()
+                            if not k.endswith("_loss")
+                        }
+                    }
+                    for cell in slice_["cells"]
+                ]
+            }
+            for slice_ in holdout["slices"]
+        ]
+    }
+
+
+def _split(
+    data: JSONDict, eval_date: str, holdout_date: str
+) -> tuple[JSONDict, JSONDict]:
+    """The cells evaluated up to ``eval_date``, and those at ``holdout_date``."""
+    train = {"slices": []}
+    holdout = {"slices": []}
+    for slice_ in data["slices"]:
+        cells = slice_["cells"]
+        train["slices"].append(
+            slice_ | {"cells": [c for c in cells if c["evaluation_date"] <= eval_date]}
+        )
+        holdout["slices"].append(
+            slice_
+            | {"cells": [c for c in cells if c["evaluation_date"] == holdout_date]}
+        )
+    return train, holdout
+
+
+class BacktestReport(Report):
+    """The results of a backtest, one row per evaluation date.
+
+    Attributes:
+        rows: a dict per evaluation date with the ``eval_date`` fit to, the
+            ``holdout_date`` predicted, the ``status``, the number of scored
+            cells, the mean ``crps`` and ``scaled_crps`` (CRPS divided by the
+            mean absolute actual), the ``coverage_{level}`` of each interval
+            level and the ``fit_seconds``.
+    """
+
+
+def backtest(
+    client: AnalyticsClient,
+    triangle: JSONDict | BermudaTriangle,
+    model_type: str,
+    eval_dates: Sequence[datetime.date | str] | None = None,
+    model_class: str = "development_model",
+    config: JSONDict | None = None,
+    predict_config: JSONDict | None = None,
+    field: str = "paid_loss",
+    levels: Sequence[float] = (0.5, 0.9),
+    max_workers: int = 4,
+    name: str = "backtest",
+    cleanup: bool = True,
+    timeout: int = 300,
+) -> BacktestReport:
+    """Backtest a model by clipping a triangle at past evaluation dates,
+    fitting to each clipped triangle, predicting and scoring the next,
+    held-out diagonal.
+
+    The clipped triangles are generated locally, and up to ``max_workers``
+    of them are uploaded, fit and predicted concurrently. Predictions are
+    scored with CRPS and central interval coverage on their samples of
+    ``field``, predicted onto a target triangle of the held-out cells.
+
+    ..  code:: python
+
+        report = backtest(client, meyers_tri, "ChainLadder", max_workers=8)
+        print(report)
+
+    Args:
+        client: the client to fit with. Fits always wait for their results.
+        triangle: the full triangle.
+        model_type: the model type to backtest, e.g. ``"ChainLadder"``.
+        eval_dates: the evaluation dates to clip at. Each must have a later
+            evaluation date to hold out. Defaults to the four evaluation
+            dates before the latest.
+        model_class: the client's model interface, e.g. ``"tail_model"``.
+        config: the model config.
+        predict_config: the predict config.
+        field: the field to score, e.g. ``"reported_loss"``.
+        levels: the central interval levels whose coverage is reported.
+        max_workers: the maximum number of concurrent fits.
+        name: a prefix for the names of the uploaded triangles and models.
+        cleanup: delete the uploaded triangles, models and predictions, even
+            if a fit or prediction fails. Failed deletions are logged.
+        timeout: the timeout of each fit and prediction.
+    """
+    data = triangle.to_dict() if _is_bermuda_triangle(triangle) else triangle
+    evaluations = sorted(
+        {cell["evaluation_date"] for s in data["slices"] for cell in s["cells"]}
+    )
+    if eval_dates is None:
+        eval_dates = evaluations[-5:-1]
+    eval_dates = [str(date) for date in eval_dates]
+    for date in eval_dates:
+        if date >= evaluations[-1]:
+            raise ValueError(f"No held-out diagonal after evaluation date {date}.")
+
+    triangles = TriangleInterface(client.host, client._requester)
+    models = ModelInterface(model_class, client.host, client._requester)
+
+    def run(eval_date: str) -> JSONDict:
+        holdout_date = next(date for date in evaluations if date > eval_date)
+        train, holdout = _split(data, eval_date, holdout_date)
+        run_name = f"{name}_{model_type}_{eval_date}"
+        row = {"eval_date": eval_date, "holdout_date": holdout_date}
+        created: list[tuple[str, Callable[[], Any]]] = []
+        try:
+            uploaded = triangles.create(name=run_name, data=train, overwrite=True)
+            created.append((f"triangle '{run_name}'", uploaded.delete))
+            target = triangles.create(
+                name=f"{run_name}_target", data=_target(holdout), overwrite=True
+            )
+            created.append((f"triangle '{target.name}'", target.delete))
+            # Registered before the fit so a model whose fit fails is deleted too.
+            created.append(
+                (f"model '{run_name}'", lambda: models.delete(name=run_name))
+            )
+            start = time.perf_counter()
+            model = models.create(
+                triangle=uploaded,
+                name=run_name,
+                model_type=model_type,
+                overwrite=True,
+                config=config,
+                timeout=timeout,
+            )
+            row["fit_seconds"] = time.perf_counter() - start
+            prediction_name = f"{run_name}_prediction"
+            created.append(
+                (
+                    f"triangle '{prediction_name}'",
+                    lambda: triangles.delete(name=prediction_name),
+                )
+            )
+            prediction = model.predict(
+                uploaded,
+                config=predict_config,
+                target_triangle=target,
+                prediction_name=prediction_name,
+                overwrite=True,
+                timeout=timeout,
+            )
+            row |= {"status": "success"} | score(
+                prediction.data, holdout, field, levels
+            )
+        except (ValueError, TimeoutError, OSError) as exc:
+            logger.warning(f"Backtest at {eval_date} failed: {exc}")
+            row["status"] = f"failed: {exc}"
+        finally:
+            if cleanup:
+                for description, delete in reversed(created):
+                    try:
+                        delete()
+                    except (ValueError, OSError) as exc:
+                        logger.warning(f"Couldn't delete {description}: {exc}")
+        return row
+
+    with client.reporter.batch(
+        len(eval_dates), f"Backtesting {model_type}"
+    ) as progress:
+
+        def tracked(eval_date: str) -> JSONDict:
+            row = run(eval_date)
+            progress.advance()
+            return row
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            rows = list(pool.map(tracked, eval_dates))
+
+    columns = [*REPORT_FIELDS, *(f"coverage_{level:g}" for level in levels)]
+    return BacktestReport(
+        [{column: row.get(column) for column in columns} for row in rows]
+    )
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Literal
+from urllib.parse import urlsplit
+
+import requests
+
+if TYPE_CHECKING:
+    from .config import JSONDict
+
+logger = logging.getLogger(__name__)
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F-]{16,})$")
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of sending a request while its circuit is open."""
+
+
+def endpoint_template(url: str) -> str:
+    """The URL's host and path with ID segments replaced by ``{id}``, so
+    requests to the same endpoint for different objects share a circuit."""
+    parts = urlsplit(url)
+    path = "/".join(
+        "{id}" if _ID_SEGMENT.match(segment) else segment
+        for segment in parts.path.split("/")
+    )
+    return parts.netloc + path
+
+
+class _Circuit:
+    def __init__(self, breaker: CircuitBreaker, key: str) -> None:
+        self._breaker = breaker
+        self.key = key
+        self.state: CircuitState = "closed"
+        self.opened_at: float | None = None
+        self.outcomes: deque[tuple[float, bool]] = deque()
+        self.trials = 0
+        # Counts state changes, so outcomes of requests let through before
+        # the latest one can be told apart.
+        self.generation = 0
+
+    def allow(self) -> tuple[int, bool]:
+        """Let a request through, returning the circuit's generation and
+        whether the request is a half-open trial, to pass to ``record``."""
+        breaker = self._breaker
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < breaker.open_seconds:
+                raise CircuitOpenError(f"Circuit for {self.key} is open.")
+            self._transition("half_open")
+        if self.state == "half_open":
+            if self.trials >= breaker.half_open_requests:
+                raise CircuitOpenError(f"Circuit for {self.key} is half-open.")
+            self.trials += 1
+            return self.generation, True
+        return self.generation, False
+
+    def record(self, token: tuple[int, bool], failed: bool) -> None:
+        generation, trial = token
+        # Requests let through in an earlier state say nothing about the
+        # current one, e.g. a slow request sent while the circuit was still
+        # closed mustn't count as a half-open trial.
+        if generation != self.generation:
+            return
+        if trial:
+            self.trials -= 1
+            self._transition("open" if failed else "closed")
+            return
+        now = time.monotonic()
+        self.outcomes.append((now, failed))
+        while (
+            self.outcomes and self.outcomes[0][0] < now - self._breaker.window_seconds
+        ):
+            self.outcomes.popleft()
+        if (
+            self.state == "closed"
+            and len(self.outcomes) >= self._breaker.min_requests
+            and self.failure_rate >= self._breaker.failure_rate
+        ):
+            self._transition("open")
+
+    @property
+    def failure_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return sum(failed for _, failed in self.outcomes) / len(self.outcomes)
+
+    def _transition(self, state: CircuitState) -> None:
+        if state == self.state:
+            if state == "open":
+                self.opened_at = time.monotonic()
+            return
+        log = logger.warning if state == "open" else logger.info
+        log(f"Circuit for {self.key} is now {state.replace('_', '-')}.")
+        self.state = state
+        self.generation += 1
+        self.trials = 0
+        if state == "open":
+            self.opened_at = time.monotonic()
+        elif state == "closed":
+            self.opened_at = None
+            self.outcomes.clear()
+
+
+class CircuitBreaker:
+    """Stops sending requests to a failing host or endpoint.
+
+    Each circuit tracks the outcomes of its requests over the last
+    ``window_seconds``. Once it has seen ``min_requests`` and at least
+    ``failure_rate`` of them failed (server errors, connection errors and
+    timeouts), it opens: requests fail fast with ``CircuitOpenError``
+    instead of waiting out the incident. After ``open_seconds`` it's
+    half-open and lets ``half_open_requests`` trial requests through. A
+    successful trial closes it, and a failed one opens it again.
+
+    ..  code:: python
+
+        client = AnalyticsClient(circuit_breaker=CircuitBreaker(failure_rate=0.5))
+        ...
+        client.circuit_breaker.states()
+
+    Attributes:
+        failure_rate: the fraction of failed requests that opens a circuit.
+        min_requests: the requests a circuit must see before it can open.
+        window_seconds: how far back a circuit's failure rate looks.
+        open_seconds: how long a circuit stays open before a trial request.
+        half_open_requests: the concurrent trial requests of a half-open
+            circuit.
+        per_endpoint: keep a circuit per endpoint (see ``endpoint_template``)
+            rather than per host.
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        min_requests: int = 10,
+        window_seconds: float = 30.0,
+        open_seconds: float = 30.0,
+        half_open_requests: int = 1,
+        per_endpoint: bool = False,
+    ) -> None:
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_requests = half_open_requests
+        self.per_endpoint = per_endpoint
+        self._circuits: dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> JSONDict:
+        state = self.__dict__.copy()
+        del state["_lock"], state["_circuits"]
+        return state
+
+    def __setstate__(self, state: JSONDict) -> None:
+        self.__dict__.update(state)
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def key(self, url: str) -> str:
+        """The circuit a URL belongs to."""
+        return endpoint_template(url) if self.per_endpoint else urlsplit(url).netloc
+
+    def state(self, url: str) -> CircuitState:
+        """The state of the circuit a URL belongs to."""
+        with self._lock:
+            circuit = self._circuits.get(self.key(url))
+            return "closed" if circuit is None else circuit.state
+
+    def states(self) -> dict[str, JSONDict]:
+        """The ``state``, ``failure_rate`` and number of recent ``requests``
+        of every circuit, for monitoring."""
+        with self._lock:
+            return {
+                key: {
+                    "state": circuit.state,
+                    "failure_rate": circuit.failure_rate,
+                    "requests": len(circuit.outcomes),
+                }
+                for key, circuit in self._circuits.items()
+            }
+
+    def reset(self) -> None:
+        """Close every circuit."""
+        with self._lock:
+            self._circuits.clear()
+
+    def call(
+        self, url: str, request: Callable[[], requests.Response]
+    ) -> requests.Response:
+        """Send a request through the circuit for ``url``, or raise
+        ``CircuitOpenError`` if it's open. ``request`` may also raise an
+        ``HTTPError`` holding the response."""
+        key = self.key(url)
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                circuit = self._circuits[key] = _Circuit(self, key)
+            token = circuit.allow()
+        failed = True
+        try:
+            response = request()
+            failed = response.status_code >= 500
+            return response
+        except requests.HTTPError as exc:
+            failed = exc.response is None or exc.response.status_code >= 500
+            raise
+        finally:
+            with self._lock:
+                circuit.record(token, failed)
+
+
+def get_circuit_breaker(
+    circuit_breaker: CircuitBreaker | bool | None,
+) -> CircuitBreaker | None:
+    """Resolve a circuit breaker from a breaker, or ``True`` for the
+    defaults."""
+    if circuit_breaker is None or circuit_breaker is False:
+        return None
+    if circuit_breaker is True:
+        return CircuitBreaker()
+    return circuit_breaker
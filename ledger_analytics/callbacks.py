@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import json
+import logging
+import secrets
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from .config import JSONDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FALLBACK_INTERVAL = 30.0
+MAX_UNCLAIMED = 10_000
+
+
+class CallbackListener:
+    """An embedded HTTP listener for push-based task completion.
+
+    When a client is created with a listener, fit and predict requests
+    include a ``callback_url`` and the service posts the finished task to
+    it, so waiting for a task makes no requests while idle and returns as
+    soon as the notification arrives. If no callback arrives within
+    ``fallback_interval`` seconds, the client polls the task once and keeps
+    waiting, so a lost notification only delays completion.
+
+    ..  code:: python
+
+        listener = CallbackListener(public_url="https://my-tunnel.example.com")
+        with AnalyticsClient(callbacks=listener) as client:
+            model = client.development_model.create(...)
+
+    Attributes:
+        address: the interface to listen on.
+        port: the port to listen on. ``0`` picks a free port.
+        public_url: the externally reachable base URL of the listener, if the
+            service can't reach ``address`` directly (e.g. behind a tunnel).
+        fallback_interval: seconds to wait for a callback before polling.
+    """
+
+    def __init__(
+        self,
+        address: str = "127.0.0.1",
+        port: int = 0,
+        public_url: str | None = None,
+        fallback_interval: float = DEFAULT_FALLBACK_INTERVAL,
+    ) -> None:
+        self.public_url = public_url
+        self.fallback_interval = fallback_interval
+        self._token = secrets.token_urlsafe(16)
+        self._lock = threading.Lock()
+        self._events: dict[str, threading.Event] = {}
+        self._tasks: OrderedDict[str, JSONDict] = OrderedDict()
+        self._httpd = ThreadingHTTPServer((address, port), _handler_for(self))
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """The callback URL sent to the service."""
+        if self.public_url is not None:
+            base = self.public_url.rstrip("/")
+        else:
+            address, port = self._httpd.server_address[:2]
+            base = f"http://{address}:{port}"
+        return f"{base}/callbacks/{self._token}"
+
+    def start(self) -> CallbackListener:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever, name="task-callbacks", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> CallbackListener:
+        return self.start()
+
+    def __exit__(self, type, value, traceback):
+        self.stop()
+
+    def notify(self, task: JSONDict) -> None:
+        """Record a finished task and wake anything waiting on it."""
+        task_id = task.get("id")
+        if task_id is None:
+            return
+        with self._lock:
+            self._tasks[task_id] = task
+            while len(self._tasks) > MAX_UNCLAIMED:
+                self._tasks.popitem(last=False)
+            event = self._events.get(task_id)
+        if event is not None:
+            event.set()
+
+    def wait(self, task_id: str, timeout: float | None = None) -> JSONDict | None:
+        """Wait up to ``timeout`` seconds for a task's callback. Returns the
+        task, or ``None`` if no callback arrived in time."""
+        with self._lock:
+            task = self._tasks.pop(task_id, None)
+            if task is not None:
+                return task
+            event = self._events.setdefault(task_id, threading.Event())
+        event.wait(timeout)
+        with self._lock:
+            self._events.pop(task_id, None)
+            return self._tasks.pop(task_id, None)
+
+    def wait_or_poll(
+        self, task_id: str, poll: Callable[[], JSONDict], timeout: float
+    ) -> JSONDict:
+        """The task's next known state: its callback if one arrives within
+        ``timeout`` seconds (at most ``fallback_interval``), otherwise the
+        result of ``poll``."""
+        task = self.wait(task_id, max(0.0, min(timeout, self.fallback_interval)))
+        return task if task is not None else poll()
+
+
+def _handler_for(listener: CallbackListener) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            if self.path.rstrip("/") != f"/callbacks/{listener._token}":
+                return self._respond(404)
+            try:
+                listener.notify(json.loads(raw))
+            except (ValueError, AttributeError):
+                return self._respond(400)
+            self._respond(204)
+
+        def _respond(self, status: int) -> None:
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return Handler
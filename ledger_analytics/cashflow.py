@@ -1,18 +1,15 @@
 from __future__ import annotations
 
-import time
 from typing import Dict
 
-from requests import Response
-
 from .config import JSONDict, ValidationConfig
-from .console import RichConsole
-from .interface import CashflowInterface, TriangleInterface
+from .interface import CashflowInterface, ModelInterface
+from .model import ModelHandle
 from .requester import Requester
 from .triangle import Triangle
 
 
-class CashflowModel(CashflowInterface):
+class CashflowModel(ModelHandle, CashflowInterface):
     def __init__(
         self,
         id: str,
@@ -23,49 +20,58 @@ class CashflowModel(CashflowInterface):
         endpoint: str,
         requester: Requester,
         asynchronous: bool = False,
+        dev_model_id: str | None = None,
+        tail_model_id: str | None = None,
     ) -> None:
-        super().__init__(model_class, endpoint, requester, asynchronous)
+        super().__init__(id, name, model_class, endpoint, requester, asynchronous)
 
-        self._endpoint = endpoint
-        self._id = id
-        self._name = name
         self._dev_model_name = dev_model_name
         self._tail_model_name = tail_model_name
-        self._model_class = model_class
-        self._fit_response: Response | None = None
-        self._predict_response: Response | None = None
-        self._get_response: Response | None = None
-        self._captured_stdout: str = ""
-
-    id = property(lambda self: self._id)
-    name = property(lambda self: self._name)
-    dev_model_name = property(lambda self: self._dev_model_name)
-    tail_model_name = property(lambda self: self._tail_model_name)
-    model_class = property(lambda self: self._model_class)
-    endpoint = property(lambda self: self._endpoint)
-    fit_response = property(lambda self: self._fit_response)
-    predict_response = property(lambda self: self._predict_response)
-    get_response = property(lambda self: self._get_response)
-    delete_response = property(lambda self: self._delete_response)
-    captured_stdout = property(lambda self: self._captured_stdout)
+        self._dev_model_id = dev_model_id
+        self._tail_model_id = tail_model_id
+
+    @property
+    def dev_model_name(self) -> str:
+        if self._dev_model_name is None:
+            self._dev_model_name = self._get_model_name(
+                "development-model", self._dev_model_id
+            )
+        return self._dev_model_name
+
+    @property
+    def tail_model_name(self) -> str:
+        if self._tail_model_name is None:
+            self._tail_model_name = self._get_model_name(
+                "tail-model", self._tail_model_id
+            )
+        return self._tail_model_name
+
+    def _get_model_name(self, model_class_slug: str, id: str) -> str:
+        """A related model's name, looked up in its model listing rather
+        than by downloading the model's full details."""
+        interface = ModelInterface(
+            model_class_slug.replace("-", "_"), self._api_host, self._requester
+        )
+        return interface._get_details_from_id_name(model_id=id)["name"]
 
     @classmethod
     def get(
         cls,
         id: str,
         name: str,
-        dev_model_name: str,
-        tail_model_name: str,
+        dev_model_name: str | None,
+        tail_model_name: str | None,
         model_class: str,
         endpoint: str,
         requester: Requester,
         asynchronous: bool = False,
+        dev_model_id: str | None = None,
+        tail_model_id: str | None = None,
+        load: bool = True,
     ) -> CashflowModel:
-        console = RichConsole()
-        with console.status("Retrieving...", spinner="bouncingBar") as _:
-            console.log(f"Getting model '{name}' with ID '{id}'")
-            get_response = requester.get(endpoint, stream=True)
-
+        """Construct a model handle. With ``load=False`` no request is made
+        and the model details are only downloaded when ``get_response`` is
+        first accessed or ``load`` is called."""
         self = cls(
             id,
             name,
@@ -75,11 +81,46 @@ class CashflowModel(CashflowInterface):
             endpoint,
             requester,
             asynchronous,
+            dev_model_id=dev_model_id,
+            tail_model_id=tail_model_id,
         )
-        self._get_response = get_response
-        self._captured_stdout += console.get_stdout()
+        if load:
+            self.load()
         return self
 
+    @classmethod
+    def _from_journal(
+        cls, entry: JSONDict, host: str, requester: Requester
+    ) -> CashflowModel:
+        """Rebuild an asynchronous handle from a journal entry without
+        making any requests."""
+        slug = entry["model_class"].replace("_", "-")
+        self = cls.get(
+            id=entry["model_id"],
+            name=entry["model_name"],
+            dev_model_name=entry["dev_model_name"],
+            tail_model_name=entry["tail_model_name"],
+            model_class=entry["model_class"],
+            endpoint=host + f"{slug}/{entry['model_id']}",
+            requester=requester,
+            asynchronous=True,
+            dev_model_id=entry["dev_model_id"],
+            tail_model_id=entry["tail_model_id"],
+            load=False,
+        )
+        self._predict_task_id = entry["task_id"]
+        self._prediction_id = entry["prediction_id"]
+        return self
+
+    def _journal_fields(self) -> JSONDict:
+        return {
+            "model_type": "CashflowModel",
+            "dev_model_name": self._dev_model_name,
+            "tail_model_name": self._tail_model_name,
+            "dev_model_id": self._dev_model_id,
+            "tail_model_id": self._tail_model_id,
+        }
+
     @classmethod
     def fit_from_interface(
         cls,
@@ -116,7 +157,7 @@ class CashflowModel(CashflowInterface):
             asynchronous=asynchronous,
         )
 
-        self._fit_response = fit_response
+        self._fit_response = self._retained(fit_response)
 
         return self
 
@@ -143,56 +184,7 @@ class CashflowModel(CashflowInterface):
         elif isinstance(initial_loss_triangle, str):
             config["predict_config"]["initial_loss_name"] = initial_loss_triangle
 
-        url = self.endpoint + "/predict"
-        self._predict_response = self._requester.post(url, data=config)
-
-        if self._asynchronous:
-            return self
-
-        task_id = self.predict_response.json()["modal_task"]["id"]
-        task_response = self._poll_remote_task(
-            task_id=task_id,
-            task_name=f"Predicting from model '{self.name}' on triangle '{triangle_name}'",
-            timeout=timeout,
-        )
-        if task_response.get("status") != "success":
-            raise ValueError(f"Task failed: {task_response['error']}")
-        triangle_id = self.predict_response.json()["predictions"]
-        triangle = TriangleInterface(
-            host=self.endpoint.replace(f"{self.model_class_slug}/{self.id}", ""),
-            requester=self._requester,
-        ).get(id=triangle_id)
-        return triangle
-
-    def delete(self) -> CashflowModel:
-        self._delete_response = self._requester.delete(self.endpoint)
-        return self
-
-    def _poll(self, task_id: str) -> JSONDict:
-        endpoint = self.endpoint.replace(
-            f"{self.model_class_slug}/{self.id}", f"tasks/{task_id}"
-        )
-        return self._requester.get(endpoint)
-
-    def _poll_remote_task(
-        self, task_id: str, task_name: str = "", timeout: int = 300
-    ) -> dict:
-        start = time.time()
-        status = ["CREATED"]
-        console = RichConsole()
-        with console.status("Working...", spinner="bouncingBar") as _:
-            while time.time() - start < timeout:
-                task = self._poll(task_id).json()
-                modal_status = (
-                    "FINISHED" if task["task_response"] is not None else "PENDING"
-                )
-                status.append(modal_status)
-                if status[-1] != status[-2]:
-                    console.log(f"{task_name}: {status[-1]}")
-                if status[-1].lower() == "finished":
-                    self._captured_stdout += console.get_stdout()
-                    return task["task_response"]
-            raise TimeoutError(f"Task '{task}' timed out")
+        return self._predict(config, triangle_name, timeout)
 
     class PredictConfig(ValidationConfig):
         """Cashflow model configuration class.
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import datetime
+import gzip
+import json
+import math
+from typing import Any, Literal
+
+import requests
+from urllib3.util.request import ACCEPT_ENCODING
+
+Compression = Literal["gzip", "zstd"]
+
+
+def _default(obj: Any) -> Any:
+    """Serialize objects the JSON libraries don't handle natively,
+    such as NumPy arrays and scalars, without importing NumPy."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if isinstance(obj, (datetime.date, datetime.datetime)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _check_finite(obj: Any) -> None:
+    """Raise a ``ValueError`` if ``obj`` holds a NaN or infinite float, which
+    JSON can't represent."""
+    if isinstance(obj, float):
+        if not math.isfinite(obj):
+            raise ValueError(f"Out of range float values are not JSON compliant: {obj}")
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            _check_finite(value)
+    elif isinstance(obj, (list, tuple)):
+        for value in obj:
+            _check_finite(value)
+    elif getattr(getattr(obj, "dtype", None), "kind", None) in ("f", "c"):
+        import numpy as np
+
+        if not np.isfinite(obj).all():
+            raise ValueError("Out of range float values are not JSON compliant.")
+
+
+class JSONCodec:
+    """Encodes request bodies and decodes response bodies using the
+    standard library ``json`` module. NaN and infinite values can't be
+    encoded, but are decoded if a response holds them."""
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, default=_default, allow_nan=False).encode()
+
+    def loads(self, content: bytes | str) -> Any:
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError as exc:
+            raise requests.exceptions.JSONDecodeError(
+                exc.msg, exc.doc, exc.pos
+            ) from exc
+
+
+class OrjsonCodec(JSONCodec):
+    """A faster codec backed by ``orjson``, which serializes NumPy
+    arrays natively. It behaves like ``JSONCodec`` on non-finite values:
+    they're rejected on upload rather than silently sent as ``null``, and
+    responses holding them fall back to the standard library decoder."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+        self._options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def __reduce__(self):
+        return (OrjsonCodec, ())
+
+    def dumps(self, obj: Any) -> bytes:
+        _check_finite(obj)
+        return self._orjson.dumps(obj, default=_default, option=self._options)
+
+    def loads(self, content: bytes | str) -> Any:
+        try:
+            return self._orjson.loads(content)
+        except self._orjson.JSONDecodeError:
+            # orjson rejects NaN and Infinity, which ``json`` accepts.
+            return super().loads(content)
+
+
+CODECS = {"json": JSONCodec, "orjson": OrjsonCodec}
+
+
+def get_codec(codec: JSONCodec | str | None = None) -> JSONCodec:
+    """Resolve a codec instance from a codec or codec name. ``None`` uses
+    the standard library ``json``; ``"orjson"`` is opt-in."""
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec is None:
+        return JSONCodec()
+    if codec not in CODECS:
+        raise ValueError(
+            f"Unrecognized JSON codec '{codec}'. Must be one of {list(CODECS)}."
+        )
+    return CODECS[codec]()
+
+
+def compress(content: bytes, encoding: Compression) -> bytes:
+    """Compress a request body with the given ``Content-Encoding``."""
+    if encoding == "gzip":
+        return gzip.compress(content, compresslevel=6)
+    if encoding == "zstd":
+        try:
+            import zstandard
+        except ImportError as exc:
+            raise ImportError(
+                "zstd compression requires `zstandard`. Install it with "
+                "`pip install 'ledger-analytics[fast]'`."
+            ) from exc
+        return zstandard.ZstdCompressor(level=3).compress(content)
+    raise ValueError(f"Unrecognized compression '{encoding}'.")
+
+
+def decompress(content: bytes, encoding: str | None) -> bytes:
+    """Decompress a body sent with the given ``Content-Encoding``."""
+    if not encoding or encoding == "identity":
+        return content
+    if encoding == "gzip":
+        return gzip.decompress(content)
+    if encoding == "zstd":
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompressobj().decompress(content)
+    raise ValueError(f"Unrecognized content encoding '{encoding}'.")
+
+
+# The response encodings urllib3 can decode while streaming: gzip and
+# deflate always, plus zstd and br when their libraries are installed.
+ACCEPTED_ENCODINGS = ACCEPT_ENCODING.replace(",", ", ")
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .fit_cache import content_hash
+
+if TYPE_CHECKING:
+    from .config import JSONDict
+
+# {slice key: {cell key: cell hash}}
+CellHashes = dict[str, dict[str, str]]
+
+
+def slice_key(slice_: JSONDict) -> str:
+    """Identifies a slice by its details, i.e. everything but its cells."""
+    return content_hash({k: v for k, v in slice_.items() if k != "cells"})
+
+
+def cell_key(cell: JSONDict) -> str:
+    """Identifies a cell within a slice by its period and evaluation date."""
+    return f"{cell['period_start']}/{cell['period_end']}/{cell['evaluation_date']}"
+
+
+def cell_hashes(data: JSONDict) -> CellHashes:
+    """Hash every cell of triangle data. A cell's hash changes if any of
+    its values change."""
+    return {
+        slice_key(slice_): {
+            cell_key(cell): content_hash(cell) for cell in slice_["cells"]
+        }
+        for slice_ in data["slices"]
+    }
+
+
+def diff_cells(data: JSONDict, hashes: CellHashes) -> tuple[list[JSONDict], bool]:
+    """The cells of ``data`` that are new or changed relative to a copy
+    with cell ``hashes``, as slices holding only those cells.
+
+    Returns the delta slices, and whether applying them makes the copy
+    identical to ``data``. It doesn't if the copy has cells or slices that
+    ``data`` lacks, since deltas only add or replace cells.
+    """
+    delta = []
+    complete = set(hashes) <= {slice_key(slice_) for slice_ in data["slices"]}
+    for slice_ in data["slices"]:
+        key = slice_key(slice_)
+        existing = hashes.get(key, {})
+        cells = [
+            cell
+            for cell in slice_["cells"]
+            if existing.get(cell_key(cell)) != content_hash(cell)
+        ]
+        if cells or key not in hashes:
+            delta.append(slice_ | {"cells": cells})
+        if not set(existing) <= {cell_key(cell) for cell in slice_["cells"]}:
+            complete = False
+    return delta, complete
+
+
+def apply_delta(data: JSONDict, delta: list[JSONDict]) -> JSONDict:
+    """Add or replace the cells of ``delta`` slices in triangle data."""
+    slices = {slice_key(slice_): slice_ for slice_ in data["slices"]}
+    for delta_slice in delta:
+        key = slice_key(delta_slice)
+        if key not in slices:
+            slices[key] = delta_slice | {"cells": []}
+        cells = {cell_key(cell): cell for cell in slices[key]["cells"]}
+        cells.update((cell_key(cell), cell) for cell in delta_slice["cells"])
+        slices[key] = slices[key] | {"cells": [cells[k] for k in sorted(cells)]}
+    return {**data, "slices": list(slices.values())}
@@ -1,6 +1,7 @@
 from enum import Enum
 from typing import Literal
 
+from .autofit import AutofitConfig
 from .config import LossFamily, ValidationConfig
 from .model import DevelopmentModel
 
@@ -42,7 +43,7 @@ class ChainLadder(DevelopmentModel):
         sigma_intercept__scale: float = 3.0
         sigma_noise__sigma_scale: float = 0.5
 
-    class Config(ValidationConfig):
+    class Config(AutofitConfig):
         """ChainLadder model configuration class.
 
         Attributes:
@@ -138,7 +139,7 @@ class TraditionalChainLadder(DevelopmentModel):
         ata__loc: float | list[float] = 0.0
         ata__scale: float | list[float] = 1e6
 
-    class Config(ValidationConfig):
+    class Config(AutofitConfig):
         """TraditionalChainLadder model configuration class.
 
         Attributes:
@@ -278,7 +279,7 @@ class MeyersCRC(DevelopmentModel):
         sigma_intercept__scale: float = 3.0
         sigma_slope__scale: float = 1.0
 
-    class Config(ValidationConfig):
+    class Config(AutofitConfig):
         """MeyersCRC model configuration class.
 
         Attributes:
@@ -370,7 +371,7 @@ class GMCL(DevelopmentModel):
         sigma_intercept__scale: float = 3.0
         sigma_noise__sigma_scale: float = 0.5
 
-    class Config(ValidationConfig):
+    class Config(AutofitConfig):
         """GMCL model configuration class.
 
         Attributes:
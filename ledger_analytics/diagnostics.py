@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable
+
+from .report import Report
+
+if TYPE_CHECKING:
+    from .api import BaseClient
+    from .config import JSONDict
+    from .model import LedgerModel
+
+ATTEMPT_FIELDS = (
+    "chains",
+    "samples_per_chain",
+    "warmup_per_chain",
+    "adapt_delta",
+    "max_treedepth",
+    "min_ess",
+    "max_rhat",
+    "divergence_rate",
+    "treedepth_rate",
+    "min_ebfmi",
+)
+
+
+class FitDiagnostics:
+    """Timing and sampler efficiency metrics of a finished fit, parsed from
+    the autofit report in its task response.
+
+    Sampler settings and diagnostics describe the final autofit attempt,
+    i.e. the run that was kept. Fields the service didn't report are ``None``.
+
+    Attributes:
+        status: the fit task status, e.g. ``"success"``.
+        attempts: the number of autofit runs, so ``attempts - 1`` escalations.
+        wall_time_seconds: the total time spent across all attempts.
+        max_wall_time_seconds: the wall-clock budget the fit was given.
+        budget_exhausted: whether the budget ran out before the diagnostics
+            passed.
+        chain_seconds: the sampling time of each chain.
+        ess_per_second: ``min_ess`` per second of sampling, taking the
+            slowest chain's time as the sampling time.
+        chains, samples_per_chain, warmup_per_chain, adapt_delta,
+            max_treedepth: the sampler settings.
+        min_ess, max_rhat, divergence_rate, treedepth_rate, min_ebfmi: the
+            convergence and efficiency diagnostics.
+    """
+
+    def __init__(self, task_response: JSONDict) -> None:
+        autofit = task_response.get("autofit") or {}
+        attempts = autofit.get("attempts") or []
+        final = attempts[-1] if attempts else {}
+
+        self.status: str | None = task_response.get("status")
+        self.attempts: int = len(attempts)
+        self.wall_time_seconds: float | None = autofit.get("wall_time_seconds")
+        self.max_wall_time_seconds: float | None = autofit.get("max_wall_time_seconds")
+        self.budget_exhausted: bool = autofit.get("budget_exhausted", False)
+        self.chain_seconds: list[float] = final.get("chain_seconds") or []
+        for field in ATTEMPT_FIELDS:
+            setattr(self, field, final.get(field))
+
+        sampling_seconds = max(self.chain_seconds, default=0)
+        self.ess_per_second: float | None = (
+            self.min_ess / sampling_seconds
+            if self.min_ess is not None and sampling_seconds > 0
+            else None
+        )
+
+    def to_dict(self) -> JSONDict:
+        return dict(vars(self))
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={v!r}" for k, v in vars(self).items())
+        return f"FitDiagnostics({fields})"
+
+
+def diagnostics_report(
+    models: Iterable[LedgerModel],
+    client: BaseClient | None = None,
+    max_workers: int = 8,
+) -> Report:
+    """A report with one flat row per model of its ``fit_diagnostics``, for
+    analysis across many fits. ``chain_seconds`` is summarized by its
+    maximum. Use ``to_csv`` to save it.
+
+    Models whose fit task response isn't known yet are polled once: on the
+    ``client``'s thread pool, up to ``max_workers`` at a time, if given, and
+    otherwise one at a time. Unfinished fits are left out.
+    """
+    models = list(models)
+    if client is None:
+        diagnostics = [model.fit_diagnostics for model in models]
+    else:
+        diagnostics = client.map(
+            lambda model: model.fit_diagnostics, models, max_workers=max_workers
+        )
+
+    rows = []
+    for model, fit_diagnostics in zip(models, diagnostics):
+        if fit_diagnostics is None:
+            continue
+        row = fit_diagnostics.to_dict()
+        row["max_chain_seconds"] = max(row.pop("chain_seconds"), default=None)
+        rows.append(
+            {
+                "model_id": model.id,
+                "model_name": model.name,
+                "model_type": model.model_type,
+                **row,
+            }
+        )
+    return Report(rows)
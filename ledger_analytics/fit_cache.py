@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .codec import _default
+
+if TYPE_CHECKING:
+    from .config import JSONDict
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(obj: Any) -> str:
+    """A SHA-256 hash of the canonical JSON form of ``obj``, with sorted
+    keys and NumPy values and dates encoded as by the request codecs."""
+    canonical = json.dumps(obj, sort_keys=True, separators=(",", ":"), default=_default)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def fit_key(triangle_fingerprint: str, model_type: str, model_config: JSONDict) -> str:
+    """The content address of a fit: the triangle data, model type and
+    fully defaulted model config. An omitted ``autofit_override`` is
+    treated as the ``AutofitControl`` defaults it stands for."""
+    if "autofit_override" in model_config and model_config["autofit_override"] is None:
+        from .autofit import autofit_override
+
+        model_config = model_config | {"autofit_override": autofit_override(None)}
+    return content_hash(
+        {
+            "triangle": triangle_fingerprint,
+            "model_type": model_type,
+            "model_config": model_config,
+        }
+    )
+
+
+class FitCache:
+    """A content-addressed cache of fitted models.
+
+    With a cache, ``ModelInterface.create`` first looks for a model of the
+    same name already fit to identical triangle data with the same model
+    type and config, and returns it instead of launching a new fit, unless
+    ``overwrite=True``. Cached models that have since been deleted or whose
+    fit failed are evicted and refit. Triangles given by name are matched by
+    their server cell hashes if the client uses cell deltas, and otherwise
+    by their ID, so their data is never downloaded just to look up a fit.
+
+    Attributes:
+        path: an optional JSON Lines file that persists the cache across
+            processes. It's only ever appended to.
+    """
+
+    def __init__(self, path: str | os.PathLike | None = None) -> None:
+        self.path = Path(path) if path is not None else None
+        self._lock = threading.Lock()
+        self._entries: dict[str, JSONDict] = {}
+        if self.path is not None and self.path.exists():
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping malformed line in {self.path}.")
+                        continue
+                    if entry.get("model_id") is None:
+                        self._entries.pop(entry["key"], None)
+                    else:
+                        self._entries[entry["key"]] = entry
+
+    def __getstate__(self) -> JSONDict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: JSONDict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> JSONDict | None:
+        return self._entries.get(key)
+
+    def put(self, key: str, model_class: str, model_id: str, model_name: str) -> None:
+        self._write(
+            {
+                "key": key,
+                "model_class": model_class,
+                "model_id": model_id,
+                "model_name": model_name,
+            }
+        )
+
+    def discard(self, key: str) -> None:
+        if key in self._entries:
+            self._write({"key": key, "model_id": None})
+
+    def _write(self, entry: JSONDict) -> None:
+        with self._lock:
+            if entry["model_id"] is None:
+                self._entries.pop(entry["key"], None)
+            else:
+                self._entries[entry["key"]] = entry
+            if self.path is not None:
+                with open(self.path, "a") as f:
+                    f.write(json.dumps(entry) + "\n")
+
+
+def get_fit_cache(
+    fit_cache: FitCache | bool | str | os.PathLike | None,
+) -> FitCache | None:
+    """Resolve a fit cache from a cache, ``True`` for an in-memory cache,
+    or a path for a persistent one."""
+    if fit_cache is None or fit_cache is False:
+        return None
+    if fit_cache is True:
+        return FitCache()
+    if isinstance(fit_cache, FitCache):
+        return fit_cache
+    return FitCache(fit_cache)
@@ -1,6 +1,7 @@
 from enum import Enum
 from typing import Literal
 
+from .autofit import AutofitConfig
 from .config import LossFamily, ValidationConfig
 from .model import ForecastModel
 
@@ -38,7 +39,7 @@ class AR1(ForecastModel):
         target_lr__loc: float = -0.5
         target_lr__scale: float = 1.0
 
-    class Config(ValidationConfig):
+    class Config(AutofitConfig):
         """AR1 model configuration class.
 
         Attributes:
@@ -126,7 +127,7 @@ class SSM(ForecastModel):
         eta__latent_mean_loc: float = -0.5
         eta__latent_mean_scale: float = 1.0
 
-    class Config(ValidationConfig):
+    class Config(AutofitConfig):
         """SSM model configuration class.
 
         Attributes:
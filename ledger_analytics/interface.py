@@ -1,15 +1,30 @@
 from __future__ import annotations
 
 import logging
+import sys
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-from bermuda import Triangle as BermudaTriangle
+import requests
 
-from .config import JSONDict
 from .requester import Requester
 
+if TYPE_CHECKING:
+    from bermuda import Triangle as BermudaTriangle
+
+    from .config import JSONDict
+    from .model import LedgerModel
+
 logger = logging.getLogger(__name__)
 
 
+def _is_bermuda_triangle(obj) -> bool:
+    """Checks for a bermuda triangle without importing bermuda. If bermuda
+    hasn't been imported yet, ``obj`` can't be one of its triangles."""
+    bermuda = sys.modules.get("bermuda")
+    return bermuda is not None and isinstance(obj, bermuda.Triangle)
+
+
 def to_snake_case(x: str) -> str:
     uppers = [s.isupper() if i > 0 else False for i, s in enumerate(x)]
     snake = ["_" + s.lower() if upper else s for upper, s in zip(uppers, x.lower())]
@@ -18,19 +33,29 @@ def to_snake_case(x: str) -> str:
 
 class Registry(type):
     REGISTRY = {}
+    MODULES: tuple[str, ...] = ()
 
     def __new__(cls, name, bases, attrs):
         new_cls = type.__new__(cls, name, bases, attrs)
         cls.REGISTRY[to_snake_case(new_cls.__name__)] = new_cls
         return new_cls
 
+    @classmethod
+    def lookup(cls, key: str):
+        """Get a registered class, importing the modules that define
+        this registry's classes the first time they're needed."""
+        if key not in cls.REGISTRY:
+            for module in cls.MODULES:
+                import_module(module, __package__)
+        return cls.REGISTRY[key]
+
 
 class TriangleRegistry(Registry):
-    pass
+    MODULES = (".triangle",)
 
 
 class ModelRegistry(Registry):
-    pass
+    MODULES = (".development", ".tail", ".forecast", ".cashflow")
 
 
 class TriangleInterface(metaclass=TriangleRegistry):
@@ -51,7 +76,7 @@ class TriangleInterface(metaclass=TriangleRegistry):
     def create(
         self, name: str, data: JSONDict | BermudaTriangle, overwrite: bool = False
     ):
-        if isinstance(data, BermudaTriangle):
+        if _is_bermuda_triangle(data):
             data = data.to_dict()
 
         config = {
@@ -65,19 +90,20 @@ class TriangleInterface(metaclass=TriangleRegistry):
         logger.info(f"Created triangle '{name}' with ID {id}.")
 
         endpoint = self.endpoint + f"/{id}"
-        triangle = TriangleRegistry.REGISTRY["triangle"](
+        triangle = TriangleRegistry.lookup("triangle")(
             id,
             name,
             data,
             endpoint,
             self._requester,
         )
-        triangle._post_response = post_response
+        if self._requester.retain_responses:
+            triangle._post_response = post_response
         return triangle
 
     def get(self, name: str | None = None, id: str | None = None):
         obj = self._get_details_from_id_name(name, id)
-        return TriangleRegistry.REGISTRY["triangle"].get(
+        return TriangleRegistry.lookup("triangle").get(
             obj["id"],
             obj["name"],
             self.endpoint + f"/{obj['id']}",
@@ -94,7 +120,7 @@ class TriangleInterface(metaclass=TriangleRegistry):
         except ValueError:
             return self.create(name=name, data=data, overwrite=True)
         existing_data = triangle.data
-        data = data.to_dict() if isinstance(data, BermudaTriangle) else data
+        data = data.to_dict() if _is_bermuda_triangle(data) else data
         if existing_data != data:
             raise ValueError(
                 f"Triangle with name '{name}' already exists with different data. "
@@ -104,19 +130,73 @@ class TriangleInterface(metaclass=TriangleRegistry):
     def get_or_update(self, name: str, data: JSONDict | BermudaTriangle):
         """
         Gets a triangle if it exists with the same data, otherwise creates a new one. Will
-        overwrite an existing triangle with different data.
+        update an existing triangle with different data, uploading only the changed cells
+        (see ``update``).
         """
         try:
-            triangle = self.get(name=name)
+            return self.update(name=name, data=data)
         except ValueError:
             return self.create(name=name, data=data, overwrite=True)
-        data = data.to_dict() if isinstance(data, BermudaTriangle) else data
-        existing_data = triangle.data
-        if existing_data == data:
-            return triangle
-        else:
+
+    def update(self, name: str, data: JSONDict | BermudaTriangle):
+        """Update an existing triangle to match ``data``.
+
+        If the client was created with ``cell_deltas=True``, the server
+        copy's cell hashes are compared with ``data``'s and only new or
+        changed cells, such as a new evaluation diagonal, are uploaded, so
+        the bytes sent scale with the size of the change rather than the
+        triangle. If the server copy has cells or slices that ``data``
+        lacks, the whole triangle is re-uploaded instead. Otherwise, the
+        server copy is downloaded and the triangle is only re-uploaded if it
+        differs.
+        """
+        from .delta import diff_cells
+
+        data = data.to_dict() if _is_bermuda_triangle(data) else data
+        obj = self._get_details_from_id_name(name=name)
+        endpoint = self.endpoint + f"/{obj['id']}"
+        if not self._requester.cell_deltas:
+            triangle = self.get(id=obj["id"])
+            if triangle.data == data:
+                return triangle
             return self.create(name=name, data=data, overwrite=True)
 
+        delta, complete = diff_cells(data, self._cell_hashes(obj["id"]))
+        if not complete:
+            return self.create(name=name, data=data, overwrite=True)
+        if delta:
+            n_cells = sum(len(slice_["cells"]) for slice_ in delta)
+            self._requester.post(endpoint + "/cells", data={"slices": delta})
+            logger.info(f"Updated {n_cells} cells of triangle '{name}'.")
+        return TriangleRegistry.lookup("triangle")(
+            obj["id"],
+            name,
+            data,
+            endpoint,
+            self._requester,
+        )
+
+    def _cell_hashes(self, id: str) -> JSONDict:
+        """The server copy's cell hashes (see ``Requester.cell_deltas``)."""
+        return self._requester.get(self.endpoint + f"/{id}/cells").json()["slices"]
+
+    def _fingerprint(self, name: str) -> tuple[str, int | None]:
+        """A fingerprint of an uploaded triangle's contents and its number
+        of cells, without downloading its data.
+
+        With cell deltas, it's ``Triangle.fingerprint`` built from the server
+        copy's cell hashes. Otherwise it's derived from the triangle's ID,
+        which changes whenever its data does since triangles are only ever
+        replaced, and the number of cells is unknown.
+        """
+        from .fit_cache import content_hash
+
+        obj = self._get_details_from_id_name(name=name)
+        if not self._requester.cell_deltas:
+            return content_hash({"triangle_id": obj["id"]}), None
+        hashes = self._cell_hashes(obj["id"])
+        return content_hash(hashes), sum(len(cells) for cells in hashes.values())
+
     def delete(self, name: str | None = None, id: str | None = None) -> None:
         triangle = self.get(name, id)
         triangle.delete()
@@ -154,6 +234,7 @@ class ModelInterface(metaclass=ModelRegistry):
         asynchronous: bool = False,
     ) -> None:
         self._model_class = model_class
+        self._host = host
         self._endpoint = host + self.model_class_slug
         self._requester = requester
         self._asynchronous = asynchronous
@@ -169,9 +250,50 @@ class ModelInterface(metaclass=ModelRegistry):
         overwrite: bool = False,
         config: JSONDict | None = None,
         timeout: int = 300,
+        warm_start_from: str | LedgerModel | None = None,
     ):
+        """Fit a new model. If the client has a fit cache and a model named
+        ``name`` was already fit to the same triangle data with the same model
+        type and config, that model is returned instead. ``overwrite=True``
+        always refits.
+
+        ``warm_start_from`` takes a previously fit model of the same type,
+        or its name, and starts sampling from its posterior (see
+        ``WarmStart``). It's shorthand for the ``warm_start`` config field.
+
+        With ``autofit="auto"`` in the config, the autofit settings come from
+        the client's tuning store (see ``TuningStore``), and the diagnostics
+        of synchronous fits are added to it.
+        """
         triangle_name = triangle if isinstance(triangle, str) else triangle.name
-        return ModelRegistry.REGISTRY[to_snake_case(model_type)].fit_from_interface(
+        model_cls = ModelRegistry.lookup(to_snake_case(model_type))
+        if warm_start_from is not None:
+            config = self._warm_start_config(
+                model_cls, model_type, config, warm_start_from
+            )
+        fit_cache = self._requester.fit_cache
+        n_cells = None
+        if not isinstance(triangle, str):
+            n_cells = sum(len(slice_["cells"]) for slice_ in triangle.data["slices"])
+        if fit_cache is not None:
+            if isinstance(triangle, str):
+                triangles = TriangleInterface(self._host, self._requester)
+                fingerprint, n_cells = triangles._fingerprint(triangle)
+            else:
+                fingerprint = triangle.fingerprint
+        auto = (config or {}).get("autofit") == "auto"
+        if auto:
+            config = self._tuned_config(model_type, config, n_cells)
+        if fit_cache is not None:
+            from .fit_cache import fit_key
+
+            key = fit_key(fingerprint, model_type, model_cls._model_config(config))
+            model = None if overwrite else self._cached_fit(key, name)
+            if model is not None:
+                logger.info(f"Reusing model '{name}' fit to identical inputs.")
+                return model
+
+        model = model_cls.fit_from_interface(
             triangle_name,
             name,
             model_type,
@@ -183,12 +305,92 @@ class ModelInterface(metaclass=ModelRegistry):
             asynchronous=self._asynchronous,
             timeout=timeout,
         )
+        if fit_cache is not None:
+            fit_cache.put(key, self.model_class, model.id, model.name)
+        if auto and not self._asynchronous and self._requester.tuning_store is not None:
+            self._requester.tuning_store.add([model], n_cells=n_cells)
+        return model
 
-    def get(self, name: str | None = None, id: str | None = None):
+    def _tuned_config(
+        self, model_type: str, config: JSONDict, n_cells: int | None
+    ) -> JSONDict:
+        """Replace ``autofit="auto"`` with settings recommended by the tuning
+        store. Explicit ``autofit_override`` values take precedence."""
+        from .autofit import AutofitControl
+
+        config = {k: v for k, v in config.items() if k != "autofit"}
+        override = config.get("autofit_override") or {}
+        thresholds = AutofitControl(**override)
+        store = self._requester.tuning_store
+        recommended = None
+        if store is not None:
+            recommended = store.recommend(
+                model_type,
+                line_of_business=config.get("line_of_business"),
+                n_cells=n_cells,
+                min_ess=thresholds.min_ess,
+                max_rhat=thresholds.max_rhat,
+            )
+        if recommended is None:
+            logger.info(f"No tuning history for {model_type}, using autofit defaults.")
+            return config
+        config["autofit_override"] = recommended | override
+        return config
+
+    def _warm_start_config(
+        self,
+        model_cls: type,
+        model_type: str,
+        config: JSONDict | None,
+        warm_start_from: str | LedgerModel,
+    ) -> JSONDict:
+        if "warm_start" not in model_cls.Config.model_fields:
+            raise ValueError(f"{model_type} models don't support warm starts.")
+        if isinstance(warm_start_from, str):
+            warm_start_from = self.get(name=warm_start_from, load=False)
+        if warm_start_from.model_type != model_type:
+            raise ValueError(
+                f"Can't warm start a {model_type} model from "
+                f"{warm_start_from.model_type} model '{warm_start_from.name}'."
+            )
+        config = dict(config or {})
+        config["warm_start"] = (config.get("warm_start") or {}) | {
+            "model_id": warm_start_from.id
+        }
+        return config
+
+    def _cached_fit(self, key: str, name: str):
+        """The cached model for a fit key, if it's named ``name``, still
+        exists and its fit hasn't failed. Stale entries are evicted."""
+        fit_cache = self._requester.fit_cache
+        entry = fit_cache.get(key)
+        if entry is None or entry["model_class"] != self.model_class:
+            return None
+        if entry["model_name"] != name:
+            logger.info(
+                f"Model '{entry['model_name']}' was fit to identical inputs, "
+                f"but fitting '{name}' as requested."
+            )
+            return None
+        try:
+            model = self.get(id=entry["model_id"], load=False)
+        except ValueError:
+            fit_cache.discard(key)
+            return None
+        task_response = model.poll().get("task_response")
+        if task_response is not None and task_response.get("status") != "success":
+            fit_cache.discard(key)
+            return None
+        return model
+
+    def get(self, name: str | None = None, id: str | None = None, load: bool = True):
+        """Get a model by name or ID. With ``load=False``, the returned handle
+        is built from the listing metadata alone and the full model details
+        are only downloaded on demand (see ``LedgerModel.load``)."""
         model_obj = self._get_details_from_id_name(name, id)
         endpoint = self.endpoint + f"/{model_obj['id']}"
         model_type = model_obj["modal_task_info"]["task_args"]["model_type"]
-        return ModelRegistry.REGISTRY[to_snake_case(model_type)].get(
+        return ModelRegistry.lookup(to_snake_case(model_type)).get(
             model_obj["id"],
             model_obj["name"],
             model_type,
@@ -197,6 +399,8 @@ class ModelInterface(metaclass=ModelRegistry):
             endpoint,
             self._requester,
             self._asynchronous,
+            load=load,
+            fit_task_id=model_obj["modal_task_info"].get("id"),
         )
 
     def get_or_update(
@@ -220,9 +424,7 @@ class ModelInterface(metaclass=ModelRegistry):
                 timeout=timeout,
                 overwrite=True,
             )
-        existing_triangle_name = (
-            model.get_response.json().get("triangle", {"name": None}).get("name")
-        )
+        existing_triangle_name = model.triangle_name
         if not self.check_config_consistency(config, model.config):
             return self.create(
                 triangle=triangle,
@@ -265,9 +467,7 @@ class ModelInterface(metaclass=ModelRegistry):
                 timeout=timeout,
                 overwrite=True,
             )
-        existing_triangle_name = (
-            model.get_response.json().get("triangle", {"name": None}).get("name")
-        )
+        existing_triangle_name = model.triangle_name
         # Check config consistency (model.config will have defaults inserted so we can't
         # just compare the dicts)
         if not self.check_config_consistency(config, model.config):
@@ -318,7 +518,7 @@ class ModelInterface(metaclass=ModelRegistry):
         id: str | None = None,
         overwrite: bool = False,
     ):
-        model = self.get(name, id)
+        model = self.get(name, id, load=False)
         return model.predict(
             triangle,
             config=config,
@@ -329,11 +529,11 @@ class ModelInterface(metaclass=ModelRegistry):
         )
 
     def terminate(self, name: str | None = None, id: str | None = None):
-        model = self.get(name, id)
+        model = self.get(name, id, load=False)
         return model.terminate()
 
     def delete(self, name: str | None = None, id: str | None = None) -> None:
-        model = self.get(name, id)
+        model = self.get(name, id, load=False)
         return model.delete()
 
     def list(self, limit: int = 25) -> list[JSONDict]:
@@ -394,7 +594,7 @@ class CashflowInterface(metaclass=ModelRegistry):
     ):
         dev_model_name = dev_model if isinstance(dev_model, str) else dev_model.name
         tail_model_name = tail_model if isinstance(tail_model, str) else tail_model.name
-        return ModelRegistry.REGISTRY["cashflow_model"].fit_from_interface(
+        return ModelRegistry.lookup("cashflow_model").fit_from_interface(
             name=name,
             dev_model_name=dev_model_name,
             tail_model_name=tail_model_name,
@@ -404,18 +604,19 @@ class CashflowInterface(metaclass=ModelRegistry):
             asynchronous=self._asynchronous,
         )
 
-    def get(self, name: str | None = None, id: str | None = None):
+    def get(self, name: str | None = None, id: str | None = None, load: bool = False):
+        """Get a cashflow model by name or ID. Unless ``load=True``, the full
+        model details are only downloaded on demand."""
         model_obj = self._get_details_from_id_name(name, id)
         endpoint = self.endpoint + f"/{model_obj['id']}"
-        dev_interface = ModelInterface(
-            "development-model", self._host, self._requester, self._asynchronous
+        # The development and tail model names are only looked up in their
+        # model listings if they're not in this listing's metadata and are
+        # accessed on the returned model.
+        dev_model_id, dev_model_name = self._related_model(
+            model_obj, "development_model"
         )
-        dev_model_name = dev_interface.get(id=model_obj["development_model"]).name
-        tail_interface = ModelInterface(
-            "tail-model", self._host, self._requester, self._asynchronous
-        )
-        tail_model_name = tail_interface.get(id=model_obj["tail_model"]).name
-        return ModelRegistry.REGISTRY["cashflow_model"].get(
+        tail_model_id, tail_model_name = self._related_model(model_obj, "tail_model")
+        return ModelRegistry.lookup("cashflow_model").get(
             id=model_obj["id"],
             name=model_obj["name"],
             dev_model_name=dev_model_name,
@@ -424,8 +625,20 @@ class CashflowInterface(metaclass=ModelRegistry):
             endpoint=endpoint,
             requester=self._requester,
             asynchronous=self._asynchronous,
+            dev_model_id=dev_model_id,
+            tail_model_id=tail_model_id,
+            load=load,
         )
 
+    @staticmethod
+    def _related_model(model_obj: JSONDict, key: str) -> tuple[str | None, str | None]:
+        """The ID and, if present, the name of a related model in a
+        cashflow model's metadata."""
+        related = model_obj.get(key)
+        if isinstance(related, dict):
+            return related.get("id"), related.get("name")
+        return related, model_obj.get(f"{key}_name")
+
     def predict(
         self,
         triangle: str | Triangle,
@@ -436,7 +649,7 @@ class CashflowInterface(metaclass=ModelRegistry):
         id: str | None = None,
         overwrite: bool = False,
     ):
-        model = self.get(name, id)
+        model = self.get(name, id, load=False)
         return model.predict(
             triangle,
             config=config,
@@ -446,7 +659,7 @@ class CashflowInterface(metaclass=ModelRegistry):
         )
 
     def delete(self, name: str | None = None, id: str | None = None) -> None:
-        model = self.get(name, id)
+        model = self.get(name, id, load=False)
         return model.delete()
 
     def list(self, limit: int = 25) -> list[JSONDict]:
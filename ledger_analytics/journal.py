@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    from .config import JSONDict
+    from .requester import Requester
+
+logger = logging.getLogger(__name__)
+
+TaskKind = Literal["fit", "predict"]
+ResumedTask = namedtuple(
+    "ResumedTask", ["kind", "task_id", "status", "model", "result", "entry"]
+)
+
+
+class TaskJournal:
+    """An append-only JSON Lines journal of submitted fits and predictions.
+
+    Every submission is written and flushed to disk before control returns
+    to the caller, so if a batch process dies the journal still lists each
+    task's ID along with what's needed to rebuild its model handle. Pass
+    the same journal to ``AnalyticsClient.resume`` to reattach to the tasks
+    and collect their results without resubmitting anything.
+
+    ..  code:: python
+
+        client = AnalyticsClient(asynchronous=True, journal="fits.jsonl")
+        for name in names:
+            client.development_model.create(...)
+
+        # ...after a crash, in a new process:
+        for task in AnalyticsClient().resume("fits.jsonl"):
+            print(task.kind, task.status, task.result)
+
+    Attributes:
+        path: the journal file. It's created if it doesn't exist, and is
+            only ever appended to.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> JSONDict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: JSONDict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def record(self, event: str, **fields) -> None:
+        """Append an event to the journal and flush it to disk."""
+        line = json.dumps({"event": event, "time": time.time(), **fields})
+        with self._lock, open(self.path, "a") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def submitted(self, kind: TaskKind, task_id: str, **fields) -> None:
+        self.record("submitted", kind=kind, task_id=task_id, **fields)
+
+    def finished(self, task_id: str, status: str) -> None:
+        self.record("finished", task_id=task_id, status=status)
+
+    def entries(self) -> list[JSONDict]:
+        """The submitted tasks in submission order, with the ``status`` of
+        each finished task or ``None`` if it hasn't been seen to finish."""
+        tasks: dict[str, JSONDict] = {}
+        if not self.path.exists():
+            return []
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # A partial line from a process that died mid-write.
+                    logger.warning(f"Skipping malformed line in {self.path}.")
+                    continue
+                if event["event"] == "submitted":
+                    tasks[event["task_id"]] = event | {"status": None}
+                elif event["event"] == "finished" and event["task_id"] in tasks:
+                    tasks[event["task_id"]]["status"] = event["status"]
+        return list(tasks.values())
+
+    def pending(self) -> list[JSONDict]:
+        return [entry for entry in self.entries() if entry["status"] is None]
+
+
+def get_journal(journal: TaskJournal | str | os.PathLike | None) -> TaskJournal | None:
+    if journal is None or isinstance(journal, TaskJournal):
+        return journal
+    return TaskJournal(journal)
+
+
+def resume(
+    host: str,
+    requester: Requester,
+    journal: TaskJournal,
+    timeout: int = 300,
+    include_finished: bool = False,
+) -> list[ResumedTask]:
+    """Reattach to the journal's tasks and collect their results. See
+    ``AnalyticsClient.resume``."""
+    from .interface import ModelRegistry, TriangleInterface, to_snake_case
+
+    entries = journal.entries() if include_finished else journal.pending()
+    models = []
+    # Check every task once first, so finished results are collected even
+    # if waiting on the others times out.
+    for entry in entries:
+        model_class = ModelRegistry.lookup(to_snake_case(entry["model_type"]))
+        model = model_class._from_journal(entry, host, requester)
+        if entry["status"] is None:
+            task_response = model._poll(entry["task_id"]).json()["task_response"]
+            if task_response is not None:
+                entry["status"] = task_response.get("status")
+                journal.finished(entry["task_id"], entry["status"])
+        models.append(model)
+
+    start = time.time()
+    triangles = TriangleInterface(host, requester)
+    resumed = []
+    for entry, model in zip(entries, models):
+        if entry["status"] is None:
+            try:
+                task_response = model._poll_remote_task(
+                    entry["task_id"],
+                    task_name=f"Resuming {entry['kind']} of model '{model.name}'",
+                    timeout=max(0, timeout - (time.time() - start)),
+                )
+                entry["status"] = task_response.get("status")
+            except TimeoutError:
+                pass
+            else:
+                if requester.journal is not journal:
+                    journal.finished(entry["task_id"], entry["status"])
+
+        result = None
+        if entry["status"] == "success":
+            if entry["kind"] == "fit":
+                result = model
+            else:
+                result = triangles.get(id=entry["prediction_id"])
+        resumed.append(
+            ResumedTask(
+                entry["kind"], entry["task_id"], entry["status"], model, result, entry
+            )
+        )
+    return resumed
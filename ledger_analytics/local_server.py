@@ -0,0 +1,576 @@
+from __future__ import annotations
+
+import json
+import logging
+import random
+import threading
+import time
+import urllib.request
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING, Any, Callable
+from urllib.parse import parse_qs, urlsplit
+
+from .codec import compress, decompress
+from .delta import apply_delta, cell_hashes
+
+if TYPE_CHECKING:
+    from .api import AnalyticsClient
+    from .config import JSONDict
+
+logger = logging.getLogger(__name__)
+
+MODEL_TYPES = {
+    "development-model": [
+        "ChainLadder",
+        "TraditionalChainLadder",
+        "ManualATA",
+        "MeyersCRC",
+        "GMCL",
+    ],
+    "tail-model": ["GeneralizedBondy", "Sherman", "ClassicalPowerTransformTail"],
+    "forecast-model": ["AR1", "SSM", "TraditionalGCC"],
+    "cashflow-model": ["CashflowModel"],
+}
+
+
+class LocalAnalyticsServer:
+    """An in-memory stand-in for the analytics API, for offline testing
+    and benchmarking.
+
+    The server emulates the triangle, triangle cell delta, model, predict,
+    terminate, task and pre-signed download endpoints over real sockets, so
+    the client's connection handling, retries and polling are exercised end
+    to end.
+    Fits and predictions don't run any models: tasks simply finish after
+    ``task_duration`` seconds and predictions are copies of the input triangle,
+    unless a ``predictor`` is given.
+    If a fit or predict request includes a ``callback_url``, the finished
+    task is also posted to it.
+
+    ..  code:: python
+
+        with LocalAnalyticsServer(latency=0.01, task_duration=0.5) as server:
+            client = server.client()
+            client.triangle.create(name="meyers", data=meyers_tri)
+
+    Attributes:
+        latency: seconds added to every response.
+        latency_jitter: upper bound of uniformly distributed extra latency.
+        failure_rate: probability that a request fails with ``failure_status``.
+        failure_status: the HTTP status of random and injected failures.
+        task_duration: seconds before a submitted fit or predict task finishes.
+        task_status: the ``status`` of finished tasks, e.g. ``"success"``
+            or ``"failure"``.
+        presign_above_bytes: triangles whose JSON is larger than this many
+            bytes are served through a pre-signed download URL. ``None``
+            always returns triangles inline.
+        compress_above_bytes: gzip or zstd compress response bodies larger
+            than this many bytes if the client accepts it. ``None`` never
+            compresses responses.
+        cell_deltas: serve the triangle cell delta endpoints. ``False``
+            emulates a server without them, which answers them with 404.
+        capacity: the number of requests handled at once. Requests beyond it
+            get a ``429 Too Many Requests`` response. ``None`` is unlimited.
+        predictor: a function from the input triangle data to the prediction
+            data, e.g. to return samples at future cells.
+        bytes_received: the total size of request bodies as sent, i.e.
+            before decompression.
+        bytes_sent: the total size of response bodies as sent.
+    """
+
+    def __init__(
+        self,
+        address: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        failure_status: int = 500,
+        task_duration: float = 0.0,
+        task_status: str = "success",
+        presign_above_bytes: int | None = None,
+        compress_above_bytes: int | None = None,
+        seed: int | None = None,
+        cell_deltas: bool = True,
+        capacity: int | None = None,
+        predictor: Callable[[JSONDict], JSONDict] | None = None,
+    ) -> None:
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.task_duration = task_duration
+        self.task_status = task_status
+        self.presign_above_bytes = presign_above_bytes
+        self.compress_above_bytes = compress_above_bytes
+        self.cell_deltas = cell_deltas
+        self.capacity = capacity
+        self._in_flight = 0
+        self.predictor = predictor
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._injected: deque[tuple[int, str | None]] = deque()
+        self.request_log: list[tuple[str, str]] = []
+        self.reset()
+        self._httpd = ThreadingHTTPServer((address, port), _handler_for(self))
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        address, port = self._httpd.server_address[:2]
+        return f"http://{address}:{port}/analytics/"
+
+    def start(self) -> LocalAnalyticsServer:
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="local-analytics", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Local analytics server listening on {self.url}")
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> LocalAnalyticsServer:
+        return self.start()
+
+    def __exit__(self, type, value, traceback):
+        self.stop()
+
+    def client(self, api_key: str = "local.key", **kwargs) -> AnalyticsClient:
+        """An ``AnalyticsClient`` pointed at this server. It uses the cell
+        delta endpoints if the server serves them."""
+        from .api import AnalyticsClient
+
+        kwargs.setdefault("cell_deltas", self.cell_deltas)
+        client = AnalyticsClient(api_key, **kwargs)
+        client.host = self.url
+        return client
+
+    def reset(self) -> None:
+        """Clear all stored objects, tasks and the request log."""
+        with self._lock:
+            self.triangles: dict[str, JSONDict] = {}
+            self.models: dict[str, dict[str, JSONDict]] = {
+                slug: {} for slug in MODEL_TYPES
+            }
+            self.tasks: dict[str, JSONDict] = {}
+            self.request_log.clear()
+            self._injected.clear()
+            self.bytes_received = 0
+            self.bytes_sent = 0
+
+    def inject_failures(
+        self, n: int = 1, status: int | None = None, path: str | None = None
+    ) -> None:
+        """Fail the next ``n`` requests whose path contains ``path``
+        (any path if ``None``) with ``status``."""
+        with self._lock:
+            for _ in range(n):
+                self._injected.append((status or self.failure_status, path))
+
+    @property
+    def request_count(self) -> int:
+        return len(self.request_log)
+
+    def _injected_failure(self, path: str) -> int | None:
+        with self._lock:
+            for i, (status, match) in enumerate(self._injected):
+                if match is None or match in path:
+                    del self._injected[i]
+                    return status
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            return self.failure_status
+        return None
+
+    def _delay(self) -> None:
+        delay = self.latency
+        if self.latency_jitter:
+            delay += self._random.uniform(0, self.latency_jitter)
+        if delay:
+            time.sleep(delay)
+
+    def handle(
+        self, method: str, path: str, params: JSONDict, body: JSONDict, auth: bool
+    ) -> tuple[int, Any]:
+        with self._lock:
+            self.request_log.append((method, path))
+            overloaded = self.capacity is not None and self._in_flight >= self.capacity
+            if not overloaded:
+                self._in_flight += 1
+        if overloaded:
+            return 429, {"detail": "Too many requests."}
+        try:
+            return self._handle(method, path, params, body, auth)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _handle(
+        self, method: str, path: str, params: JSONDict, body: JSONDict, auth: bool
+    ) -> tuple[int, Any]:
+        self._delay()
+
+        parts = path.strip("/").split("/")
+        if parts[0] == "analytics":
+            parts = parts[1:]
+        if parts[:1] == ["download"] and len(parts) == 2:
+            return self._download(parts[1])
+
+        if not auth:
+            return 403, {"detail": "Authentication credentials were not provided."}
+        status = self._injected_failure(path)
+        if status is not None:
+            return status, {"detail": "Injected failure."}
+
+        with self._lock:
+            return self._route(method, parts, params, body)
+
+    def _route(
+        self, method: str, parts: list[str], params: JSONDict, body: JSONDict
+    ) -> tuple[int, Any]:
+        resource, rest = parts[0] if parts else "", parts[1:]
+        if resource == "triangle":
+            return self._triangle(method, rest, params, body)
+        if resource == "tasks" and len(rest) == 1 and method == "GET":
+            return self._task(rest[0])
+        if resource.endswith("-type") and resource[: -len("-type")] in MODEL_TYPES:
+            names = MODEL_TYPES[resource[: -len("-type")]]
+            return 200, [{"name": name} for name in names]
+        if resource in MODEL_TYPES:
+            return self._model(resource, method, rest, params, body)
+        return 404, {"detail": "Not found."}
+
+    def _listing(self, objects: list[JSONDict], params: JSONDict) -> JSONDict:
+        limit = int(params.get("limit", 25))
+        return {
+            "count": len(objects),
+            "next": None,
+            "previous": None,
+            "results": objects[:limit],
+        }
+
+    def _triangle(
+        self, method: str, rest: list[str], params: JSONDict, body: JSONDict
+    ) -> tuple[int, Any]:
+        if not rest and method == "GET":
+            objects = [
+                {"id": tri["id"], "name": tri["name"]}
+                for tri in self.triangles.values()
+            ]
+            return 200, self._listing(objects, params)
+        if not rest and method == "POST":
+            name = body.get("triangle_name")
+            existing = self._find(self.triangles, name)
+            if existing is not None:
+                if not body.get("overwrite"):
+                    return 400, {"detail": f"Triangle '{name}' already exists."}
+                del self.triangles[existing["id"]]
+            triangle = self._add_triangle(name, body.get("triangle_data"))
+            return 201, {"id": triangle["id"], "name": name}
+        if len(rest) not in (1, 2) or rest[0] not in self.triangles:
+            return 404, {"detail": "Triangle not found."}
+        triangle = self.triangles[rest[0]]
+        if rest[1:] == ["cells"] and not self.cell_deltas:
+            return 404, {"detail": "Not found."}
+        if rest[1:] == ["cells"] and method == "GET":
+            return 200, {"id": triangle["id"], "slices": cell_hashes(triangle["data"])}
+        if rest[1:] == ["cells"] and method == "POST":
+            triangle["data"] = apply_delta(triangle["data"], body.get("slices", []))
+            return 200, {"id": triangle["id"], "name": triangle["name"]}
+        if len(rest) != 1:
+            return 404, {"detail": "Not found."}
+        if method == "DELETE":
+            del self.triangles[rest[0]]
+            return 204, None
+        if method == "GET":
+            size = len(json.dumps(triangle["data"]))
+            if self.presign_above_bytes is not None and size > self.presign_above_bytes:
+                return 200, {
+                    "id": triangle["id"],
+                    "triangle_name": triangle["name"],
+                    "url": self.url + f"download/{triangle['id']}",
+                    "triangle_size_bytes": size,
+                }
+            return 200, {
+                "id": triangle["id"],
+                "triangle_name": triangle["name"],
+                "triangle_data": triangle["data"],
+            }
+        return 405, {"detail": f"Method {method} not allowed."}
+
+    def _download(self, id: str) -> tuple[int, Any]:
+        from bermuda import Triangle as BermudaTriangle
+
+        with self._lock:
+            triangle = self.triangles.get(id)
+        if triangle is None:
+            return 404, {"detail": "Triangle not found."}
+        with NamedTemporaryFile(suffix=".trib") as f:
+            BermudaTriangle.from_dict(triangle["data"]).to_binary(f.name)
+            return 200, f.read()
+
+    def _model(
+        self,
+        slug: str,
+        method: str,
+        rest: list[str],
+        params: JSONDict,
+        body: JSONDict,
+    ) -> tuple[int, Any]:
+        models = self.models[slug]
+        if not rest and method == "GET":
+            return 200, self._listing(list(models.values()), params)
+        if not rest and method == "POST":
+            return self._create_model(slug, body)
+        if rest[0] not in models:
+            return 404, {"detail": "Model not found."}
+        model = models[rest[0]]
+        if len(rest) == 1 and method == "GET":
+            return 200, model
+        if len(rest) == 1 and method == "DELETE":
+            del models[rest[0]]
+            return 204, None
+        if rest[1:] == ["predict"] and method == "POST":
+            return self._predict(model, body)
+        if rest[1:] == ["terminate"] and method == "POST":
+            task = self.tasks.get(model["modal_task_info"]["id"])
+            if task is not None:
+                task["terminated"] = True
+            return 200, {"id": model["id"]}
+        return 405, {"detail": f"Method {method} not allowed."}
+
+    def _create_model(self, slug: str, body: JSONDict) -> tuple[int, Any]:
+        models = self.models[slug]
+        if slug == "cashflow-model":
+            name = body.get("name")
+            dev_model = self._find(
+                self.models["development-model"], body.get("development_model_name")
+            )
+            tail_model = self._find(
+                self.models["tail-model"], body.get("tail_model_name")
+            )
+            if dev_model is None or tail_model is None:
+                return 400, {"detail": "Development or tail model not found."}
+            extra = {
+                "development_model": dev_model["id"],
+                "tail_model": tail_model["id"],
+            }
+            task_args = {"model_type": "CashflowModel", "model_config": {}}
+        else:
+            name = body.get("model_name")
+            triangle = self._find(self.triangles, body.get("triangle_name"))
+            if triangle is None:
+                return 400, {
+                    "detail": f"Triangle '{body.get('triangle_name')}' not found."
+                }
+            extra = {"triangle": {"id": triangle["id"], "name": triangle["name"]}}
+            task_args = {
+                "model_type": body.get("model_type"),
+                "model_config": body.get("model_config") or {},
+            }
+
+        existing = self._find(models, name)
+        if existing is not None:
+            if not body.get("overwrite"):
+                return 400, {"detail": f"Model '{name}' already exists."}
+            del models[existing["id"]]
+
+        autofit = task_args["model_config"].get("autofit_override") or {}
+        task = self._add_task(body.get("callback_url"), autofit)
+        id = uuid.uuid4().hex
+        models[id] = {
+            "id": id,
+            "name": name,
+            **extra,
+            "modal_task_info": {"id": task["id"], "task_args": task_args},
+        }
+        return 201, {
+            "model": {"id": id, "name": name},
+            "modal_task": {"id": task["id"]},
+        }
+
+    def _predict(self, model: JSONDict, body: JSONDict) -> tuple[int, Any]:
+        triangle = self._find(self.triangles, body.get("triangle_name"))
+        if triangle is None:
+            return 400, {"detail": f"Triangle '{body.get('triangle_name')}' not found."}
+        name = body.get("prediction_name") or f"{model['name']}_{triangle['name']}"
+        existing = self._find(self.triangles, name)
+        if existing is not None:
+            if not body.get("overwrite"):
+                return 400, {"detail": f"Triangle '{name}' already exists."}
+            del self.triangles[existing["id"]]
+        data = triangle["data"]
+        if self.predictor is not None:
+            data = self.predictor(data)
+        prediction = self._add_triangle(name, data)
+        task = self._add_task(body.get("callback_url"))
+        return 201, {
+            "id": model["id"],
+            "modal_task": {"id": task["id"]},
+            "predictions": prediction["id"],
+        }
+
+    def _task(self, id: str) -> tuple[int, Any]:
+        task = self.tasks.get(id)
+        if task is None:
+            return 404, {"detail": "Task not found."}
+        if task["terminated"]:
+            status = "TERMINATED"
+            response = {"status": "terminated", "error": "Task was terminated."}
+        elif time.monotonic() - task["submitted"] < task["duration"]:
+            status, response = "PENDING", None
+        else:
+            status = "FINISHED"
+            response = {"status": task["status"]}
+            if task["status"] != "success":
+                response["error"] = "Task failed on the local server."
+            if task["autofit"] is not None:
+                response["autofit"] = task["autofit"]
+        return 200, {"id": id, "status": status, "task_response": response}
+
+    def _add_triangle(self, name: str, data: JSONDict) -> JSONDict:
+        id = uuid.uuid4().hex
+        self.triangles[id] = {"id": id, "name": name, "data": data}
+        return self.triangles[id]
+
+    def _add_task(
+        self, callback_url: str | None = None, autofit: JSONDict | None = None
+    ) -> JSONDict:
+        """Add a task. Fit tasks given ``autofit`` settings stop early if
+        their ``max_wall_time_seconds`` is shorter than ``task_duration``."""
+        id = uuid.uuid4().hex
+        duration = self.task_duration
+        report = None
+        if autofit is not None:
+            budget = autofit.get("max_wall_time_seconds")
+            exhausted = budget is not None and budget < duration
+            duration = budget if exhausted else duration
+            chains = autofit.get("chains", 4)
+            samples = autofit.get("samples_per_chain", 2500)
+            report = {
+                "wall_time_seconds": duration,
+                "max_wall_time_seconds": budget,
+                "budget_exhausted": exhausted,
+                "attempts": [
+                    {
+                        "chains": chains,
+                        "samples_per_chain": samples,
+                        "warmup_per_chain": autofit.get("warmup_per_chain")
+                        or samples // 2,
+                        "adapt_delta": autofit.get("adapt_delta", 0.8),
+                        "max_treedepth": autofit.get("max_treedepth", 10),
+                        "chain_seconds": [duration] * chains,
+                        "min_ess": chains * samples / 2,
+                        "max_rhat": 1.0,
+                        "divergence_rate": 0.0,
+                        "treedepth_rate": 0.0,
+                        "min_ebfmi": 1.0,
+                    }
+                ],
+            }
+        self.tasks[id] = {
+            "id": id,
+            "submitted": time.monotonic(),
+            "duration": duration,
+            "status": self.task_status,
+            "terminated": False,
+            "autofit": report,
+        }
+        if callback_url is not None:
+            timer = threading.Timer(duration, self._send_callback, (id, callback_url))
+            timer.daemon = True
+            timer.start()
+        return self.tasks[id]
+
+    def _send_callback(self, id: str, url: str) -> None:
+        with self._lock:
+            _, task = self._task(id)
+        request = urllib.request.Request(
+            url,
+            data=json.dumps(task).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            urllib.request.urlopen(request, timeout=10).close()
+        except OSError as exc:
+            logger.warning(f"Callback for task {id} to {url} failed: {exc}")
+
+    @staticmethod
+    def _find(objects: dict[str, JSONDict], name: str | None) -> JSONDict | None:
+        return next((obj for obj in objects.values() if obj["name"] == name), None)
+
+
+def _handler_for(server: LocalAnalyticsServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _dispatch(self, method: str) -> None:
+            url = urlsplit(self.path)
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            with server._lock:
+                server.bytes_received += len(raw)
+            try:
+                raw = decompress(raw, self.headers.get("Content-Encoding"))
+                body = json.loads(raw) if raw else {}
+            except ValueError:
+                self._respond(400, {"detail": "Request body is not valid JSON."})
+                return
+            auth = self.headers.get("Authorization", "").startswith("Api-Key ")
+            status, payload = server.handle(method, url.path, params, body, auth)
+            self._respond(status, payload)
+
+        def _respond(self, status: int, payload: Any) -> None:
+            if payload is None:
+                content, content_type = b"", "application/json"
+            elif isinstance(payload, bytes):
+                content, content_type = payload, "application/octet-stream"
+            else:
+                content, content_type = json.dumps(payload).encode(), "application/json"
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            encoding = self._encoding(len(content))
+            if encoding is not None:
+                content = compress(content, encoding)
+                self.send_header("Content-Encoding", encoding)
+            with server._lock:
+                server.bytes_sent += len(content)
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def _encoding(self, size: int) -> str | None:
+            if (
+                server.compress_above_bytes is None
+                or size < server.compress_above_bytes
+            ):
+                return None
+            accepted = {
+                encoding.strip()
+                for encoding in self.headers.get("Accept-Encoding", "").split(",")
+            }
+            return next((e for e in ("zstd", "gzip") if e in accepted), None)
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def do_DELETE(self):
+            self._dispatch("DELETE")
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return Handler
@@ -1,25 +1,37 @@
 from __future__ import annotations
 
+import threading
 import time
 
 from requests import Response
 from requests.exceptions import HTTPError
 
-from .autofit import AutofitControl
+from .autofit import WarmStart, autofit_override
 from .config import JSONDict
-from .console import RichConsole
+from .diagnostics import FitDiagnostics
 from .interface import ModelInterface, TriangleInterface
+from .progress import append_stdout
 from .requester import Requester
 from .triangle import Triangle
 
+# Responses a handle drops when pickled. Their parsed fields are kept.
+RESPONSE_FIELDS = (
+    "_fit_response",
+    "_predict_response",
+    "_get_response",
+    "_delete_response",
+)
+
+
+class ModelHandle:
+    """The state and task handling shared by fitted model handles: their
+    responses, prediction tasks, polling, journaling and captured output.
+    Mixed into an interface class, which provides ``model_class_slug``."""
 
-class LedgerModel(ModelInterface):
     def __init__(
         self,
         id: str,
         name: str,
-        model_type: str,
-        config: JSONDict | None,
         model_class: str,
         endpoint: str,
         requester: Requester,
@@ -30,26 +42,210 @@ class LedgerModel(ModelInterface):
         self._endpoint = endpoint
         self._id = id
         self._name = name
-        self._model_type = model_type
-        self._config = config
         self._model_class = model_class
         self._fit_response: Response | None = None
         self._predict_response: Response | None = None
         self._get_response: Response | None = None
+        self._delete_response: Response | None = None
+        self._predict_task_id: str | None = None
+        self._prediction_id: str | None = None
         self._captured_stdout: str = ""
+        self._stdout_lock = threading.Lock()
 
     id = property(lambda self: self._id)
     name = property(lambda self: self._name)
-    model_type = property(lambda self: self._model_type)
-    config = property(lambda self: self._config)
     model_class = property(lambda self: self._model_class)
     endpoint = property(lambda self: self._endpoint)
     fit_response = property(lambda self: self._fit_response)
     predict_response = property(lambda self: self._predict_response)
-    get_response = property(lambda self: self._get_response)
     delete_response = property(lambda self: self._delete_response)
+    predict_task_id = property(lambda self: self._predict_task_id)
+    prediction_id = property(lambda self: self._prediction_id)
     captured_stdout = property(lambda self: self._captured_stdout)
 
+    @property
+    def _api_host(self) -> str:
+        return self.endpoint.replace(f"{self.model_class_slug}/{self.id}", "")
+
+    def _capture(self, stdout: str) -> None:
+        with self._stdout_lock:
+            self._captured_stdout = append_stdout(self._captured_stdout, stdout)
+
+    def __getstate__(self) -> JSONDict:
+        """Pickle the handle without its responses, so it's cheap to send
+        to other processes."""
+        state = self.__dict__.copy()
+        for key in RESPONSE_FIELDS:
+            state[key] = None
+        del state["_stdout_lock"]
+        return state
+
+    def __setstate__(self, state: JSONDict) -> None:
+        self.__dict__.update(state)
+        self._stdout_lock = threading.Lock()
+
+    @property
+    def get_response(self) -> Response:
+        if self._get_response is not None:
+            return self._get_response
+        return self._load()
+
+    def load(self) -> ModelHandle:
+        """Download the full model details into ``get_response``."""
+        self._load()
+        return self
+
+    def _load(self) -> Response:
+        with self._requester.reporter.status("Retrieving...") as report:
+            report.log(f"Getting model '{self.name}' with ID '{self.id}'")
+            response = self._requester.get(self.endpoint, stream=True)
+        self._capture(report.stdout)
+        self._get_response = self._retained(response)
+        return response
+
+    def _retained(self, response: Response) -> Response | None:
+        """The response to keep on the handle under the requester's
+        retention policy. Parsed fields are always kept separately."""
+        return response if self._requester.retain_responses else None
+
+    def _journal_fields(self) -> JSONDict:
+        """The fields, besides the model's class, ID and name, needed to
+        rebuild the handle from a journal entry."""
+        return {}
+
+    def _journal(self, kind: str, task_id: str | None, **fields) -> None:
+        """Record a submitted task in the requester's journal, if any."""
+        journal = self._requester.journal
+        if journal is None or task_id is None:
+            return
+        journal.submitted(
+            kind,
+            task_id,
+            model_class=self.model_class,
+            model_id=self.id,
+            model_name=self.name,
+            **self._journal_fields(),
+            **fields,
+        )
+
+    def _predict(
+        self, config: JSONDict, triangle_name: str, timeout: int
+    ) -> Triangle | ModelHandle:
+        """Submit a prediction request, then return the handle if
+        asynchronous, or otherwise wait for and download the prediction."""
+        if self._requester.callbacks is not None:
+            config["callback_url"] = self._requester.callbacks.url
+
+        url = self.endpoint + "/predict"
+        predict_response = self._requester.post(url, data=config)
+        predict_body = predict_response.json()
+        self._predict_response = self._retained(predict_response)
+        self._predict_task_id = predict_body.get("modal_task", {}).get("id")
+        self._prediction_id = predict_body.get("predictions")
+        self._journal(
+            "predict",
+            self.predict_task_id,
+            triangle_name=triangle_name,
+            prediction_id=self.prediction_id,
+        )
+
+        if self._asynchronous:
+            return self
+
+        self._await(
+            self.predict_task_id,
+            f"Predicting from model '{self.name}' on triangle '{triangle_name}'",
+            timeout=timeout,
+        )
+        return TriangleInterface(host=self._api_host, requester=self._requester).get(
+            id=self.prediction_id
+        )
+
+    def wait(self, timeout: int = 300) -> JSONDict:
+        """Wait for the model's latest task to finish, e.g. after an
+        asynchronous ``create`` or ``predict``. Returns the task response."""
+        task_id, task_name = self._latest_task()
+        return self._await(task_id, task_name, timeout=timeout)
+
+    def _latest_task(self) -> tuple[str, str]:
+        """The ID and description of the task ``wait`` waits for."""
+        if self.predict_task_id is None:
+            raise ValueError(f"Model '{self.name}' has no task to wait for.")
+        return self.predict_task_id, f"Predicting from model '{self.name}'"
+
+    def delete(self) -> ModelHandle:
+        self._delete_response = self._requester.delete(self.endpoint)
+        return self
+
+    def _poll(self, task_id: str) -> JSONDict:
+        return self._requester.get(self._api_host + f"tasks/{task_id}")
+
+    def _await(self, task_id: str, task_name: str, timeout: int = 300) -> JSONDict:
+        """Wait for a task to finish, raising if it didn't succeed."""
+        task_response = self._poll_remote_task(task_id, task_name, timeout=timeout)
+        if task_response.get("status") != "success":
+            raise ValueError(f"Task failed: {task_response['error']}")
+        return task_response
+
+    def _poll_remote_task(
+        self, task_id: str, task_name: str = "", timeout: int = 300
+    ) -> dict:
+        start = time.time()
+        status = ["CREATED"]
+        task_response = None
+        callbacks = self._requester.callbacks
+        with self._requester.reporter.status("Working...") as report:
+            while time.time() - start < timeout:
+                if callbacks is None:
+                    task = self._poll(task_id).json()
+                else:
+                    task = callbacks.wait_or_poll(
+                        task_id,
+                        lambda: self._poll(task_id).json(),
+                        timeout=timeout - (time.time() - start),
+                    )
+                modal_status = (
+                    "FINISHED" if task["task_response"] is not None else "PENDING"
+                )
+                status.append(modal_status)
+                if status[-1] != status[-2]:
+                    report.log(f"{task_name}: {status[-1]}")
+                if status[-1].lower() == "finished":
+                    task_response = task["task_response"]
+                    break
+        if task_response is None:
+            raise TimeoutError(f"Task '{task_id}' timed out")
+        self._capture(report.stdout)
+        if self._requester.journal is not None:
+            self._requester.journal.finished(task_id, task_response.get("status"))
+        return task_response
+
+
+class LedgerModel(ModelHandle, ModelInterface):
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        model_type: str,
+        config: JSONDict | None,
+        model_class: str,
+        endpoint: str,
+        requester: Requester,
+        asynchronous: bool = False,
+    ) -> None:
+        super().__init__(id, name, model_class, endpoint, requester, asynchronous)
+
+        self._model_type = model_type
+        self._config = config
+        self._fit_task_id: str | None = None
+        self._triangle_name: str | None = None
+        self._fit_task_response: JSONDict | None = None
+        self._fit_diagnostics: FitDiagnostics | None = None
+
+    model_type = property(lambda self: self._model_type)
+    config = property(lambda self: self._config)
+    fit_task_id = property(lambda self: self._fit_task_id)
+
     @classmethod
     def get(
         cls,
@@ -61,12 +257,13 @@ class LedgerModel(ModelInterface):
         endpoint: str,
         requester: Requester,
         asynchronous: bool = False,
+        load: bool = True,
+        fit_task_id: str | None = None,
     ) -> LedgerModel:
-        console = RichConsole()
-        with console.status("Retrieving...", spinner="bouncingBar") as _:
-            console.log(f"Getting model '{name}' with ID '{id}'")
-            get_response = requester.get(endpoint, stream=True)
-
+        """Construct a model handle. With ``load=False`` no request is made
+        and the model details are only downloaded when ``get_response`` is
+        first accessed or ``load`` is called, which is all that's needed
+        to ``predict``, ``delete`` or ``terminate``."""
         self = cls(
             id,
             name,
@@ -77,10 +274,107 @@ class LedgerModel(ModelInterface):
             requester,
             asynchronous,
         )
-        self._get_response = get_response
-        self._captured_stdout += console.get_stdout()
+        self._fit_task_id = fit_task_id
+        if load:
+            self.load()
+        return self
+
+    @property
+    def triangle_name(self) -> str | None:
+        """The name of the triangle the model was fit to."""
+        if self._triangle_name is None:
+            self._load()
+        return self._triangle_name
+
+    @property
+    def fit_task_response(self) -> JSONDict | None:
+        """The response of the finished fit task, or ``None`` if the fit
+        hasn't finished. Polled at most once after the fit finishes."""
+        if self._fit_task_response is None and self.fit_task_id is not None:
+            self._fit_task_response = self.poll().get("task_response")
+        return self._fit_task_response
+
+    @property
+    def fit_diagnostics(self) -> FitDiagnostics | None:
+        """Timing and sampler efficiency metrics of the finished fit, or
+        ``None`` if the fit hasn't finished. Parsed once from the fit task
+        response."""
+        if self._fit_diagnostics is None and self.fit_task_response is not None:
+            self._fit_diagnostics = FitDiagnostics(self.fit_task_response)
+        return self._fit_diagnostics
+
+    @property
+    def budget_used(self) -> JSONDict | None:
+        """The wall-clock budget the fit's autofit procedure used: its
+        ``wall_time_seconds``, the ``max_wall_time_seconds`` it was given, and
+        whether the budget was exhausted (in which case the best run so far
+        was kept). ``None`` if the fit hasn't finished or the service didn't
+        report it."""
+        diagnostics = self.fit_diagnostics
+        if diagnostics is None or diagnostics.wall_time_seconds is None:
+            return None
+        return {
+            "wall_time_seconds": diagnostics.wall_time_seconds,
+            "max_wall_time_seconds": diagnostics.max_wall_time_seconds,
+            "budget_exhausted": diagnostics.budget_exhausted,
+        }
+
+    def _load(self) -> Response:
+        response = super()._load()
+        self._triangle_name = (
+            response.json().get("triangle", {"name": None}).get("name")
+        )
+        return response
+
+    def _journal_fields(self) -> JSONDict:
+        return {
+            "model_type": self.model_type,
+            "config": self.config,
+            "fit_task_id": self.fit_task_id,
+        }
+
+    @classmethod
+    def _from_journal(
+        cls, entry: JSONDict, host: str, requester: Requester
+    ) -> LedgerModel:
+        """Rebuild an asynchronous handle from a journal entry without
+        making any requests."""
+        slug = entry["model_class"].replace("_", "-")
+        self = cls.get(
+            entry["model_id"],
+            entry["model_name"],
+            entry["model_type"],
+            entry["config"],
+            entry["model_class"],
+            host + f"{slug}/{entry['model_id']}",
+            requester,
+            asynchronous=True,
+            load=False,
+            fit_task_id=entry["fit_task_id"],
+        )
+        self._triangle_name = entry.get("triangle_name")
+        if entry["kind"] == "predict":
+            self._predict_task_id = entry["task_id"]
+            self._prediction_id = entry["prediction_id"]
         return self
 
+    @classmethod
+    def _model_config(cls, config: JSONDict | None) -> JSONDict:
+        """Validate a model config and fill in its defaults."""
+        config = dict(config or {})
+        if "autofit_override" in config:
+            config["autofit_override"] = autofit_override(config["autofit_override"])
+        if config.get("warm_start") is not None:
+            config["warm_start"] = WarmStart(**config["warm_start"]).__dict__
+        model_config = cls.Config(**config).__dict__
+        # ``autofit="auto"`` is resolved client-side by ``ModelInterface.create``.
+        model_config.pop("autofit", None)
+        # Only send a warm start when there is one, so servers that predate
+        # warm starts accept every other fit.
+        if model_config.get("warm_start") is None:
+            model_config.pop("warm_start", None)
+        return model_config
+
     @classmethod
     def fit_from_interface(
         cls,
@@ -101,21 +395,19 @@ class LedgerModel(ModelInterface):
         `create` and `fit` API endpoints.
         """
 
-        config = config or {}
-
-        if "autofit_override" in config:
-            autofit = config["autofit_override"] or {}
-            config["autofit_override"] = AutofitControl(**autofit).__dict__
-
         config = {
             "triangle_name": triangle_name,
             "model_name": name,
             "overwrite": overwrite,
             "model_type": model_type,
-            "model_config": cls.Config(**config).__dict__,
+            "model_config": cls._model_config(config),
         }
-        fit_response = requester.post(endpoint, data=config)
-        id = fit_response.json()["model"]["id"]
+        post_data = config
+        if requester.callbacks is not None:
+            post_data = config | {"callback_url": requester.callbacks.url}
+        fit_response = requester.post(endpoint, data=post_data)
+        fit_body = fit_response.json()
+        id = fit_body["model"]["id"]
         self = cls(
             id=id,
             name=name,
@@ -127,19 +419,19 @@ class LedgerModel(ModelInterface):
             asynchronous=asynchronous,
         )
 
-        self._fit_response = fit_response
+        self._fit_response = self._retained(fit_response)
+        self._fit_task_id = fit_body.get("modal_task", {}).get("id")
+        self._triangle_name = triangle_name
+        self._journal("fit", self.fit_task_id, triangle_name=triangle_name)
 
         if asynchronous:
             return self
 
-        task_id = self.fit_response.json()["modal_task"]["id"]
-        task_response = self._poll_remote_task(
-            task_id,
-            task_name=f"Fitting model '{self.name}' on triangle '{triangle_name}'",
+        self._await(
+            self.fit_task_id,
+            f"Fitting model '{self.name}' on triangle '{triangle_name}'",
             timeout=timeout,
         )
-        if task_response.get("status") != "success":
-            raise ValueError(f"Task failed: {task_response['error']}")
         return self
 
     def predict(
@@ -165,30 +457,14 @@ class LedgerModel(ModelInterface):
         elif isinstance(target_triangle, str):
             config["predict_config"]["target_triangle"] = target_triangle
 
-        url = self.endpoint + "/predict"
-        self._predict_response = self._requester.post(url, data=config)
-
-        if self._asynchronous:
-            return self
+        return self._predict(config, triangle_name, timeout)
 
-        task_id = self.predict_response.json()["modal_task"]["id"]
-        task_response = self._poll_remote_task(
-            task_id=task_id,
-            task_name=f"Predicting from model '{self.name}' on triangle '{triangle_name}'",
-            timeout=timeout,
-        )
-        if task_response.get("status") != "success":
-            raise ValueError(f"Task failed: {task_response['error']}")
-        triangle_id = self.predict_response.json()["predictions"]
-        triangle = TriangleInterface(
-            host=self.endpoint.replace(f"{self.model_class_slug}/{self.id}", ""),
-            requester=self._requester,
-        ).get(id=triangle_id)
-        return triangle
-
-    def delete(self) -> LedgerModel:
-        self._delete_response = self._requester.delete(self.endpoint)
-        return self
+    def _latest_task(self) -> tuple[str, str]:
+        """The model's prediction task if one was submitted, otherwise its
+        fit task."""
+        if self.predict_task_id is None and self.fit_task_id is not None:
+            return self.fit_task_id, f"Fitting model '{self.name}'"
+        return super()._latest_task()
 
     def terminate(self) -> LedgerModel:
         status = self.poll().get("status")
@@ -196,54 +472,33 @@ class LedgerModel(ModelInterface):
         if status is None or status.lower() not in ["created", "pending"]:
             return self
 
-        console = RichConsole()
         timeout = 60
         start = time.time()
-        with console.status("Terminating...", spinner="bouncingBar") as _:
-            console.log(f"Terminating model {self.name} with ID {self.id}.")
+        with self._requester.reporter.status("Terminating...") as report:
+            report.log(f"Terminating model {self.name} with ID {self.id}.")
             while status.lower() != "terminated" and time.time() - start < timeout:
                 try:
                     self._requester.post(self.endpoint + "/terminate", data={})
                     status = self.poll().get("status")
                 except HTTPError:
                     continue
-                if status.lower() == "terminated":
-                    self._captured_stdout += console.get_stdout()
-                    return self
+        if status.lower() != "terminated":
             raise TimeoutError(f"Could not terminate within {timeout} seconds.")
+        self._capture(report.stdout)
+        return self
 
     def poll(self):
-        try:
-            task_id = self._fit_response.json()["modal_task"]["id"]
-            return self._poll(task_id).json()
-        except AttributeError:
+        if self.fit_task_id is None:
             return {}
-
-    def _poll(self, task_id: str) -> JSONDict:
-        endpoint = self.endpoint.replace(
-            f"{self.model_class_slug}/{self.id}", f"tasks/{task_id}"
-        )
-        return self._requester.get(endpoint)
+        return self._poll(self.fit_task_id).json()
 
     def _poll_remote_task(
         self, task_id: str, task_name: str = "", timeout: int = 300
     ) -> dict:
-        start = time.time()
-        status = ["CREATED"]
-        console = RichConsole()
-        with console.status("Working...", spinner="bouncingBar") as _:
-            while time.time() - start < timeout:
-                task = self._poll(task_id).json()
-                modal_status = (
-                    "FINISHED" if task["task_response"] is not None else "PENDING"
-                )
-                status.append(modal_status)
-                if status[-1] != status[-2]:
-                    console.log(f"{task_name}: {status[-1]}")
-                if status[-1].lower() == "finished":
-                    self._captured_stdout += console.get_stdout()
-                    return task["task_response"]
-            raise TimeoutError(f"Task '{task}' timed out")
+        task_response = super()._poll_remote_task(task_id, task_name, timeout)
+        if task_id == self.fit_task_id:
+            self._fit_task_response = task_response
+        return task_response
 
 
 class DevelopmentModel(LedgerModel):
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+
+def _rich_disabled() -> bool:
+    return os.getenv("DISABLE_RICH_CONSOLE", "false").lower() == "true"
+
+
+# The most captured output a handle keeps, in characters. Older output is
+# dropped first.
+MAX_CAPTURED_STDOUT = 64 * 1024
+
+
+def append_stdout(captured: str, stdout: str) -> str:
+    """Append captured output, keeping the last ``MAX_CAPTURED_STDOUT``
+    characters."""
+    if not stdout:
+        return captured
+    return (captured + stdout)[-MAX_CAPTURED_STDOUT:]
+
+
+class ReportScope:
+    """A single reported operation, such as getting a triangle or polling
+    a task. Messages logged here go to the reporter's backend, and
+    ``stdout`` holds any captured output once the scope has exited."""
+
+    def __init__(self, log: Callable[[str], None]) -> None:
+        self._log = log
+        self.stdout: str = ""
+
+    def log(self, message: str) -> None:
+        self._log(message)
+
+
+class BatchProgress:
+    """Aggregated progress of a batch of operations."""
+
+    def __init__(
+        self, total: int, on_advance: Callable[[int], None] | None = None
+    ) -> None:
+        self.total = total
+        self.completed = 0
+        self._on_advance = on_advance
+        self._lock = threading.Lock()
+
+    def advance(self, n: int = 1) -> None:
+        with self._lock:
+            self.completed += n
+            completed = self.completed
+        if self._on_advance is not None:
+            self._on_advance(completed)
+
+
+class Reporter:
+    """Progress reporting backend used by the client for status messages
+    and spinners. The base reporter is silent, which is the cheapest option
+    for headless batch workers.
+    """
+
+    name = "none"
+
+    @contextmanager
+    def status(self, message: str) -> Iterator[ReportScope]:
+        yield ReportScope(self.log)
+
+    def log(self, message: str) -> None:
+        pass
+
+    @contextmanager
+    def batch(self, total: int, description: str = "") -> Iterator[BatchProgress]:
+        """Report a batch of ``total`` operations as a single progress
+        display. Call ``advance`` on the yielded object as each completes."""
+        yield BatchProgress(total)
+
+
+class LoggingReporter(Reporter):
+    """Sends status messages to a standard library logger."""
+
+    name = "logging"
+
+    def __init__(
+        self, logger: logging.Logger | None = None, level: int = logging.INFO
+    ) -> None:
+        self.logger = logger or logging.getLogger("ledger_analytics")
+        self.level = level
+
+    def log(self, message: str) -> None:
+        self.logger.log(self.level, message)
+
+    @contextmanager
+    def batch(self, total: int, description: str = "") -> Iterator[BatchProgress]:
+        step = max(1, total // 20)
+
+        def on_advance(completed: int) -> None:
+            if completed % step == 0 or completed == total:
+                self.log(f"{description or 'Batch'}: {completed}/{total} complete")
+
+        yield BatchProgress(total, on_advance)
+
+
+class RichReporter(Reporter):
+    """Interactive reporting with Rich spinners and progress bars.
+
+    A single console is shared by all of a client's calls, and only one
+    live display runs at a time: concurrent calls, or calls made during a
+    ``batch``, don't start their own spinners. If the ``DISABLE_RICH_CONSOLE``
+    environment variable is ``"true"``, output is captured per call into
+    ``ReportScope.stdout`` instead of being printed, and handles keep up to
+    ``MAX_CAPTURED_STDOUT`` characters of it.
+    """
+
+    name = "rich"
+
+    def __init__(self) -> None:
+        self._console = None
+        self._lock = threading.Lock()
+        self._live = False
+        self._batch = False
+
+    def __getstate__(self) -> dict:
+        return {}
+
+    def __setstate__(self, state: dict) -> None:
+        # The console and live display belong to the original process.
+        self.__init__()
+
+    @property
+    def console(self):
+        if self._console is None:
+            from .console import RichConsole
+
+            self._console = RichConsole()
+        return self._console
+
+    def log(self, message: str) -> None:
+        if not self._batch:
+            self.console.log(message)
+
+    def _acquire_live(self) -> bool:
+        with self._lock:
+            if self._live:
+                return False
+            self._live = True
+            return True
+
+    def _release_live(self) -> None:
+        with self._lock:
+            self._live = False
+
+    @contextmanager
+    def status(self, message: str) -> Iterator[ReportScope]:
+        if _rich_disabled():
+            from .console import RichConsole
+
+            # Only calls that log anything need a capturing console.
+            consoles = []
+
+            def log(message: str) -> None:
+                if not consoles:
+                    consoles.append(RichConsole())
+                consoles[0].log(message)
+
+            scope = ReportScope(log)
+            yield scope
+            if consoles:
+                scope.stdout = consoles[0].get_stdout()
+            return
+
+        if not self._acquire_live():
+            yield ReportScope(self.log)
+            return
+        try:
+            with self.console.status(message, spinner="bouncingBar"):
+                yield ReportScope(self.log)
+        finally:
+            self._release_live()
+
+    @contextmanager
+    def batch(self, total: int, description: str = "") -> Iterator[BatchProgress]:
+        if _rich_disabled() or not self._acquire_live():
+            yield BatchProgress(total)
+            return
+
+        from rich.progress import Progress
+
+        self._batch = True
+        try:
+            with Progress(console=self.console, transient=False) as progress:
+                task = progress.add_task(description or "Working...", total=total)
+                yield BatchProgress(
+                    total,
+                    lambda completed: progress.update(task, completed=completed),
+                )
+        finally:
+            self._batch = False
+            self._release_live()
+
+
+REPORTERS = {"none": Reporter, "logging": LoggingReporter, "rich": RichReporter}
+
+
+def get_reporter(reporter: Reporter | str | None = None) -> Reporter:
+    """Resolve a reporter instance from a reporter or reporter name
+    (``"rich"``, ``"logging"`` or ``"none"``). ``None`` uses Rich."""
+    if isinstance(reporter, Reporter):
+        return reporter
+    reporter = reporter or "rich"
+    if reporter not in REPORTERS:
+        raise ValueError(
+            f"Unrecognized reporter '{reporter}'. Must be one of {list(REPORTERS)}."
+        )
+    return REPORTERS[reporter]()
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import csv
+import os
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .config import JSONDict
+
+
+class Report:
+    """A table of results with one dict per row. Printing it shows an
+    aligned text table.
+
+    Attributes:
+        rows: the rows, which all share the same columns.
+    """
+
+    def __init__(self, rows: list[JSONDict]) -> None:
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __str__(self) -> str:
+        columns = list(self.rows[0]) if self.rows else []
+        cells = [[_format(row.get(column)) for column in columns] for row in self.rows]
+        widths = [
+            max([len(column), *(len(row[i]) for row in cells)])
+            for i, column in enumerate(columns)
+        ]
+        lines = [
+            "  ".join(column.rjust(width) for column, width in zip(columns, widths)),
+            "  ".join("-" * width for width in widths),
+        ]
+        lines.extend(
+            "  ".join(value.rjust(width) for value, width in zip(row, widths))
+            for row in cells
+        )
+        return "\n".join(lines)
+
+    def to_csv(self, path: str | os.PathLike) -> None:
+        with open(path, "w", newline="") as f:
+            if self.rows:
+                writer = csv.DictWriter(f, fieldnames=list(self.rows[0]))
+                writer.writeheader()
+                writer.writerows(self.rows)
+
+
+def _format(value) -> str:
+    if isinstance(value, float):
+        return f"{value:.4g}"
+    return "" if value is None else str(value)
@@ -1,17 +1,64 @@
+from __future__ import annotations
+
+import copy
+import os
+import threading
+import weakref
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Hashable
+
 import requests
 
-from .config import HTTPMethods, JSONDict
+from .breaker import CircuitBreaker, get_circuit_breaker
+from .codec import ACCEPTED_ENCODINGS, Compression, JSONCodec, compress, get_codec
+from .fit_cache import FitCache, get_fit_cache
+from .journal import TaskJournal, get_journal
+from .progress import Reporter, get_reporter
+from .throttle import Throttle, get_throttle
+from .tuning import TuningStore, get_tuning_store
+
+if TYPE_CHECKING:
+    from .callbacks import CallbackListener
+    from .config import HTTPMethods, JSONDict
+
+
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 8 * 1024 * 1024
+DEFAULT_COMPRESS_ABOVE_BYTES = 1024 * 1024
+
+# Requesters and clients to reset in forked children, where their threads
+# no longer exist and their locks may have been held by other threads.
+_fork_resets: weakref.WeakSet = weakref.WeakSet()
+
+
+def _reset_after_fork() -> None:
+    for obj in list(_fork_resets):
+        obj._reset_after_fork()
 
 
-def _get_stream_chunks(**kwargs):
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _chunk_size(response: requests.Response) -> int:
+    """Aim for roughly 64 reads per body, within sensible bounds. Bodies
+    of unknown length (chunked transfer encoding) use 1MB chunks."""
+    length = response.headers.get("Content-Length")
+    if length is None:
+        return 1024 * 1024
+    return min(MAX_CHUNK_SIZE, max(MIN_CHUNK_SIZE, int(length) // 64))
+
+
+def _get_stream_chunks(session: requests.Session, **kwargs):
     """
     Downloads content in chunks to handle large files more efficiently.
+    Compressed responses are decompressed as they stream.
     """
-    with requests.get(**kwargs, stream=True) as response:
+    with session.get(**kwargs, stream=True) as response:
         response.raise_for_status()
 
         content = []
-        for chunk in response.iter_content(chunk_size=1024):
+        for chunk in response.iter_content(chunk_size=_chunk_size(response)):
             if chunk:
                 content.append(chunk)
 
@@ -19,12 +66,187 @@ def _get_stream_chunks(**kwargs):
         return response
 
 
+def _cache_json(response: requests.Response, codec: JSONCodec) -> None:
+    """Decode the response body at most once, sharing the parsed
+    result between all later ``response.json()`` calls. Once decoded, the
+    raw body is dropped so it isn't held alongside the parsed result."""
+    content = response.content
+    parsed = None
+    decoded = False
+    ref = weakref.ref(response)
+
+    def json(**kwargs):
+        nonlocal content, parsed, decoded
+        if not decoded:
+            parsed = codec.loads(content)
+            content, decoded = None, True
+            if (response := ref()) is not None:
+                response._content = None
+        return parsed
+
+    response.json = json
+
+
+def _copy_response(response: requests.Response) -> requests.Response:
+    """A copy of a response with its own copy of the parsed body, so
+    callers sharing one HTTP call can't see each other's changes."""
+    copied = copy.copy(response)
+    parsed = copy.deepcopy(response.json())
+    copied.json = lambda **kwargs: parsed
+    return copied
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.waiters = 0
+        self.results: list[Any] = []
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Coalesces concurrent identical calls: while a call for a key is in
+    flight, other callers with the same key wait for it and share its
+    result (or exception) instead of making their own.
+
+    If given, ``share`` makes each waiting caller's copy of the result,
+    while the caller that made the call gets the original.
+    """
+
+    def __init__(self, share: Callable[[Any], Any] | None = None) -> None:
+        self._share = share
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.results.pop()
+
+        try:
+            result = fn()
+            with self._lock:
+                del self._calls[key]
+            share = self._share or (lambda result: result)
+            # Copies are made before returning, while the result is unchanged.
+            call.results = [share(result) for _ in range(call.waiters)]
+        except BaseException as exc:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.error = exc
+            raise
+        finally:
+            call.done.set()
+        return result
+
+
 class Requester(object):
-    def __init__(self, api_key: str | None = None) -> None:
+    """Sends the client's HTTP requests and holds its client-wide settings.
+
+    Requesters can be pickled, e.g. to send a configured client to a
+    process pool: only the configuration is kept, and the unpickled copy
+    opens its own connections and polls for task results rather than using
+    a callback listener. After a ``fork``, the child's requester likewise
+    drops the parent's connections, listener and in-flight call state.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        codec: JSONCodec | str | None = None,
+        compression: Compression | None = None,
+        compress_above_bytes: int = DEFAULT_COMPRESS_ABOVE_BYTES,
+        single_flight: bool = True,
+        reporter: Reporter | str | None = None,
+        retain_responses: bool = False,
+        callbacks: CallbackListener | None = None,
+        journal: TaskJournal | str | os.PathLike | None = None,
+        fit_cache: FitCache | bool | str | os.PathLike | None = None,
+        tuning_store: TuningStore | str | os.PathLike | None = None,
+        throttle: Throttle | bool | None = None,
+        circuit_breaker: CircuitBreaker | bool | None = None,
+        cell_deltas: bool = False,
+    ) -> None:
         if api_key:
             self.headers = {"Authorization": f"Api-Key {api_key}"}
         else:
             self.headers = {}
+        self.headers["Accept-Encoding"] = ACCEPTED_ENCODINGS
+        self.codec = get_codec(codec)
+        self.compression = compression
+        self.compress_above_bytes = compress_above_bytes
+        self._single_flight = (
+            SingleFlight(share=_copy_response) if single_flight else None
+        )
+        # Keeps connections alive between requests. Sessions aren't shared
+        # between processes, since their sockets can't be.
+        self._session = requests.Session()
+        self.reporter = get_reporter(reporter)
+        # If True, triangle and model handles keep their full responses
+        # (e.g. ``get_response``) rather than only the parsed fields they
+        # need (IDs, names), which is mostly useful for debugging.
+        self.retain_responses = retain_responses
+        # If set, fits and predictions ask the service to post finished
+        # tasks to this listener, and tasks are only polled if no callback
+        # arrives in time.
+        self.callbacks = callbacks.start() if callbacks is not None else None
+        # If set, every submitted fit and prediction is recorded so a
+        # crashed batch run can be resumed.
+        self.journal = get_journal(journal)
+        # If set, fits of previously fit inputs reuse the existing model.
+        self.fit_cache = get_fit_cache(fit_cache)
+        # Fit diagnostics history used to resolve ``autofit="auto"``.
+        self.tuning_store = get_tuning_store(tuning_store)
+        # If set, requests are rate limited, run under an adaptive
+        # concurrency limit, and retried after overload responses.
+        self.throttle = get_throttle(throttle)
+        # If set, requests to a failing host or endpoint fail fast.
+        self.circuit_breaker = get_circuit_breaker(circuit_breaker)
+        # Whether the server has triangle cell hash endpoints: ``GET
+        # triangle/{id}/cells`` returning ``{"slices": cell_hashes(data)}``,
+        # hashed exactly as ``delta.cell_hashes`` does, and ``POST
+        # triangle/{id}/cells`` adding or replacing the posted cells. Only
+        # used if enabled, since servers without them answer 404.
+        self.cell_deltas = cell_deltas
+        _fork_resets.add(self)
+
+    def __getstate__(self) -> JSONDict:
+        state = self.__dict__.copy()
+        state["_single_flight"] = self._single_flight is not None
+        state["callbacks"] = None
+        del state["_session"]
+        return state
+
+    def __setstate__(self, state: JSONDict) -> None:
+        self.__dict__.update(state)
+        self._single_flight = (
+            SingleFlight(share=_copy_response) if state["_single_flight"] else None
+        )
+        self._session = requests.Session()
+        _fork_resets.add(self)
+
+    def _reset_after_fork(self) -> None:
+        self.__setstate__(self.__getstate__())
+        for obj in (
+            self.reporter,
+            self.journal,
+            self.fit_cache,
+            self.tuning_store,
+            self.throttle,
+            self.circuit_breaker,
+        ):
+            if obj is not None and hasattr(obj, "__setstate__"):
+                obj.__setstate__(obj.__getstate__())
 
     def post(self, url: str, data: JSONDict):
         return self._factory("post", url, data)
@@ -49,18 +271,56 @@ class Requester(object):
         stream: bool = False,
         params: JSONDict | None = None,
     ):
+        if method.lower() != "get" or self._single_flight is None:
+            return self._send(method, url, data, stream, params)
+        # Concurrent identical GETs share one HTTP call and its parsed body,
+        # each getting its own copy.
+        key = (url, tuple(sorted((params or {}).items())), stream, repr(data))
+        return self._single_flight.do(
+            key, lambda: self._send(method, url, data, stream, params)
+        )
+
+    def _send(
+        self,
+        method: HTTPMethods,
+        url: str,
+        data: JSONDict,
+        stream: bool = False,
+        params: JSONDict | None = None,
+    ):
+        session = self._session
         if method.lower() == "post":
-            request = requests.post
+            request = session.post
         elif method.lower() == "get":
-            request = _get_stream_chunks if stream else requests.get
+            request = partial(_get_stream_chunks, session) if stream else session.get
         elif method.lower() == "delete":
-            request = requests.delete
+            request = session.delete
         else:
             raise ValueError(f"Unrecognized HTTPMethod {method}.")
 
-        response = request(
-            url=url, json=data or {}, headers=self.headers, params=params
-        )
+        body = self.codec.dumps(data or {})
+        headers = self.headers | {"Content-Type": "application/json"}
+        if (
+            method.lower() == "post"
+            and self.compression is not None
+            and len(body) >= self.compress_above_bytes
+        ):
+            body = compress(body, self.compression)
+            headers["Content-Encoding"] = self.compression
+
+        def send() -> requests.Response:
+            return request(url=url, data=body, headers=headers, params=params)
+
+        def throttled() -> requests.Response:
+            if self.throttle is None:
+                return send()
+            return self.throttle.send(send, idempotent=method.lower() != "post")
+
+        if self.circuit_breaker is None:
+            response = throttled()
+        else:
+            response = self.circuit_breaker.call(url, throttled)
+        _cache_json(response, self.codec)
         self._catch_status(response)
         return response
 
@@ -75,17 +335,31 @@ class Requester(object):
             json_error = True
         match status:
             case 400:
-                raise requests.HTTPError(f"400: Bad request, {message}.")
+                raise requests.HTTPError(
+                    f"400: Bad request, {message}.", response=response
+                )
             case 404:
                 raise requests.HTTPError(
-                    f"404: Cannot find the given endpoint, {message}."
+                    f"404: Cannot find the given endpoint, {message}.",
+                    response=response,
                 )
             case 403:
                 raise requests.HTTPError(
-                    f"403: You do not have permissions to perform this action, {message}"
+                    f"403: You do not have permissions to perform this action, {message}",
+                    response=response,
+                )
+            case 429:
+                raise requests.HTTPError(
+                    f"429: Too many requests, {message}.", response=response
                 )
             case 500:
-                raise requests.HTTPError(f"500: Internal server error, {message}")
+                raise requests.HTTPError(
+                    f"500: Internal server error, {message}", response=response
+                )
+            case 502 | 503 | 504:
+                raise requests.HTTPError(
+                    f"{status}: Service unavailable, {message}", response=response
+                )
             case 200:
                 if json_error:
                     raise requests.HTTPError(
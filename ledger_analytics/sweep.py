@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+from .fit_cache import content_hash
+from .interface import ModelInterface, ModelRegistry, to_snake_case
+from .report import Report
+
+if TYPE_CHECKING:
+    from .api import AnalyticsClient
+    from .config import JSONDict
+    from .model import LedgerModel
+    from .triangle import Triangle
+
+logger = logging.getLogger(__name__)
+
+DIAGNOSTIC_FIELDS = (
+    "attempts",
+    "wall_time_seconds",
+    "ess_per_second",
+    "min_ess",
+    "max_rhat",
+)
+
+
+def expand_grid(
+    model_type: str,
+    grid: dict[str, Iterable[Any]],
+    config: JSONDict | None = None,
+) -> list[JSONDict]:
+    """Expand a grid of config values into every combination, on top of a
+    base ``config``. Each combination is validated against the model type's
+    ``Config``, and combinations that are identical once defaults are
+    filled in are only kept once.
+
+    ..  code:: python
+
+        expand_grid(
+            "ChainLadder",
+            {"recency_decay": [1.0, 0.9], "loss_family": ["Gamma", "Lognormal"]},
+        )
+    """
+    model_cls = ModelRegistry.lookup(to_snake_case(model_type))
+    configs, seen = [], set()
+    for values in itertools.product(*grid.values()):
+        combination = (config or {}) | dict(zip(grid, values))
+        key = content_hash(model_cls._model_config(combination))
+        if key not in seen:
+            seen.add(key)
+            configs.append(combination)
+    return configs
+
+
+class SweepReport(Report):
+    """The results of a configuration sweep, one row per distinct config.
+
+    Attributes:
+        rows: a dict per config with the ``run`` number, the ``model_name``,
+            the swept config values, the ``status`` (``"success"``,
+            ``"cancelled"`` or the failure), the ``score`` if scored and the
+            fit's ``attempts``, ``wall_time_seconds``, ``ess_per_second``,
+            ``min_ess`` and ``max_rhat``.
+    """
+
+    def best(self, column: str = "score", minimize: bool = True) -> JSONDict | None:
+        """The successful row with the lowest (or highest) ``column``."""
+        rows = [
+            row
+            for row in self.rows
+            if row["status"] == "success" and row.get(column) is not None
+        ]
+        if not rows:
+            return None
+        return (min if minimize else max)(rows, key=lambda row: row[column])
+
+
+def sweep(
+    client: AnalyticsClient,
+    triangle: str | Triangle,
+    model_type: str,
+    grid: dict[str, Iterable[Any]],
+    config: JSONDict | None = None,
+    model_class: str = "development_model",
+    score: Callable[[LedgerModel], float] | None = None,
+    stop: Callable[[JSONDict], bool] | None = None,
+    max_workers: int = 4,
+    name: str = "sweep",
+    timeout: int = 300,
+) -> SweepReport:
+    """Fit a model to a triangle with every config in a grid, up to
+    ``max_workers`` fits at a time.
+
+    The grid is expanded with ``expand_grid``, so invalid values fail before
+    anything is submitted and duplicate configs are fit once. Each finished
+    fit is scored with ``score``, if given, and its row is passed to
+    ``stop``. Once ``stop`` returns ``True``, fits that haven't started are
+    skipped and running fits are terminated, and their rows are marked
+    ``"cancelled"``.
+
+    ..  code:: python
+
+        report = sweep(
+            client,
+            "meyers",
+            "ChainLadder",
+            {"recency_decay": [1.0, 0.9, 0.8], "use_linear_noise": [False, True]},
+            score=lambda model: model.fit_diagnostics.wall_time_seconds,
+            stop=lambda row: row["max_rhat"] < 1.01,
+        )
+        print(report.best())
+
+    Args:
+        client: the client to fit with.
+        triangle: the triangle, or the name of an uploaded triangle.
+        model_type: the model type, e.g. ``"ChainLadder"``.
+        grid: the values of each config field to sweep over.
+        config: base config values shared by every fit.
+        model_class: the client's model interface, e.g. ``"tail_model"``.
+        score: a function from a fitted model to a score, lower being better.
+        stop: a function from a finished row to whether to stop the sweep.
+        max_workers: the maximum number of concurrent fits.
+        name: a prefix for the model names, which are ``{name}_{run}``.
+        timeout: the timeout of each fit.
+    """
+    configs = expand_grid(model_type, grid, config)
+    models = ModelInterface(
+        model_class, client.host, client._requester, asynchronous=True
+    )
+    stopped = threading.Event()
+    running: dict[int, LedgerModel] = {}
+
+    def base_row(i: int) -> JSONDict:
+        row = {"run": i, "model_name": f"{name}_{i}"}
+        return row | {field: configs[i].get(field) for field in grid}
+
+    def run(i: int, config: JSONDict) -> JSONDict:
+        row = base_row(i)
+        if stopped.is_set():
+            return row | {"status": "cancelled"}
+        try:
+            model = models.create(
+                triangle=triangle,
+                name=row["model_name"],
+                model_type=model_type,
+                overwrite=True,
+                config=config,
+                timeout=timeout,
+            )
+            running[i] = model
+            if stopped.is_set():
+                model.terminate()
+            model.wait(timeout)
+            row["status"] = "success"
+            if score is not None:
+                row["score"] = score(model)
+            diagnostics = model.fit_diagnostics
+            if diagnostics is not None:
+                row |= {
+                    field: getattr(diagnostics, field) for field in DIAGNOSTIC_FIELDS
+                }
+        except (ValueError, TimeoutError, OSError) as exc:
+            row["status"] = "cancelled" if stopped.is_set() else f"failed: {exc}"
+        finally:
+            running.pop(i, None)
+        return row
+
+    rows: dict[int, JSONDict] = {}
+    with client.reporter.batch(len(configs), f"Sweeping {model_type}") as progress:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(run, i, config): i for i, config in enumerate(configs)
+            }
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                row = rows[futures[future]] = future.result()
+                progress.advance()
+                if (
+                    stop is not None
+                    and row["status"] == "success"
+                    and not stopped.is_set()
+                    and stop(row)
+                ):
+                    logger.info(f"Stopping sweep after run {row['run']}.")
+                    stopped.set()
+                    for pending in futures:
+                        pending.cancel()
+                    for model in list(running.values()):
+                        try:
+                            model.terminate()
+                        except (TimeoutError, OSError) as exc:
+                            logger.warning(f"Couldn't terminate '{model.name}': {exc}")
+
+    columns = ["run", "model_name", *grid, "status"]
+    columns += ["score"] * (score is not None) + list(DIAGNOSTIC_FIELDS)
+    return SweepReport(
+        [
+            {
+                column: rows.get(i, base_row(i) | {"status": "cancelled"}).get(column)
+                for column in columns
+            }
+            for i in range(len(configs))
+        ]
+    )
@@ -2,6 +2,7 @@ from datetime import date
 from enum import Enum
 from typing import Literal
 
+from .autofit import AutofitConfig
 from .config import LossFamily, ValidationConfig
 from .model import TailModel
 
@@ -59,7 +60,7 @@ class GeneralizedBondy(TailModel):
         sigma_intercept__loc: float = 0.0
         sigma_intercept__scale: float = 3.0
 
-    class Config(ValidationConfig):
+    class Config(AutofitConfig):
         """GeneralizedBondy model configuration class.
 
         Attributes:
@@ -151,7 +152,7 @@ class Sherman(TailModel):
         sigma_intercept__loc: float = 0.0
         sigma_intercept__scale: float = 3.0
 
-    class Config(ValidationConfig):
+    class Config(AutofitConfig):
         """Sherman model configuration class.
 
         Attributes:
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Callable
+
+import requests
+
+if TYPE_CHECKING:
+    from .config import JSONDict
+
+logger = logging.getLogger(__name__)
+
+# Statuses that mean the service is overloaded and a request may succeed
+# after backing off.
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+# The subset that means the service rejected the request without processing
+# it. A gateway error can arrive after the service acted on the request, so
+# only these are retried for requests that aren't idempotent, like POSTs.
+REJECTED_STATUSES = frozenset({429, 503})
+
+
+class TokenBucket:
+    """Limits the rate of requests to ``rate`` per second on average, with
+    bursts of up to ``burst`` requests."""
+
+    def __init__(self, rate: float, burst: int | None = None) -> None:
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take a token, waiting for one if the bucket is empty."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed = now - self._updated
+                self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+
+class AdaptiveConcurrency:
+    """An additive-increase, multiplicative-decrease limit on the number of
+    requests in flight.
+
+    Each healthy response raises the limit by about one per round trip.
+    An overload response, or a latency over ``latency_tolerance`` times the
+    recent average, cuts it by ``backoff``, at most once per round trip so
+    one burst of errors counts once.
+    """
+
+    def __init__(
+        self,
+        initial: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff: float = 0.5,
+        latency_tolerance: float = 3.0,
+    ) -> None:
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self._in_flight = 0
+        self._latency: float | None = None
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    in_flight = property(lambda self: self._in_flight)
+
+    def acquire(self) -> None:
+        with self._condition:
+            while self._in_flight >= int(self.limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, latency: float | None, overloaded: bool) -> None:
+        """Release a slot, adapting the limit to the response: its
+        ``latency`` (``None`` if it failed) and whether it signalled an
+        overload."""
+        with self._condition:
+            self._in_flight -= 1
+            slow = (
+                latency is not None
+                and self._latency is not None
+                and latency > self.latency_tolerance * self._latency
+            )
+            if overloaded or slow:
+                now = time.monotonic()
+                if now - self._last_decrease > (self._latency or 0):
+                    self.limit = max(self.min_limit, self.limit * self.backoff)
+                    self._last_decrease = now
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            if latency is not None:
+                self._latency = (
+                    latency
+                    if self._latency is None
+                    else 0.9 * self._latency + 0.1 * latency
+                )
+            self._condition.notify_all()
+
+
+class Throttle:
+    """Client-wide rate limiting and adaptive concurrency for requests.
+
+    Requests wait for a token from an optional token bucket and for a slot
+    under an adaptive concurrency limit (see ``AdaptiveConcurrency``).
+    Responses with a ``RETRY_STATUSES`` status pause all requests for their
+    ``Retry-After`` time, or an exponential backoff with jitter, and are
+    then retried up to ``max_retries`` times. Requests that aren't
+    idempotent are only retried on ``REJECTED_STATUSES``. Together these keep batch
+    throughput near the service's capacity without manual tuning.
+
+    ..  code:: python
+
+        client = AnalyticsClient(throttle=Throttle(rate=20, max_concurrency=32))
+
+    Attributes:
+        rate: the maximum average requests per second. ``None`` is unlimited.
+        burst: the largest burst of requests allowed by ``rate``.
+        initial_concurrency, min_concurrency, max_concurrency: the starting
+            value and bounds of the concurrency limit.
+        max_retries: the retries of each request after an overload response.
+        backoff_seconds: the first backoff without ``Retry-After``, doubling
+            with each retry.
+        latency_tolerance: the latency increase over the recent average
+            treated as an overload.
+        retries: the number of requests retried so far.
+    """
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        burst: int | None = None,
+        initial_concurrency: int = 8,
+        min_concurrency: int = 1,
+        max_concurrency: int = 64,
+        max_retries: int = 3,
+        backoff_seconds: float = 0.5,
+        latency_tolerance: float = 3.0,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.initial_concurrency = initial_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.latency_tolerance = latency_tolerance
+        self._reset()
+
+    def _reset(self) -> None:
+        self._bucket = TokenBucket(self.rate, self.burst) if self.rate else None
+        self._concurrency = AdaptiveConcurrency(
+            self.initial_concurrency,
+            self.min_concurrency,
+            self.max_concurrency,
+            latency_tolerance=self.latency_tolerance,
+        )
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.retries = 0
+
+    def __getstate__(self) -> JSONDict:
+        state = self.__dict__.copy()
+        for key in ("_bucket", "_concurrency", "_paused_until", "_lock", "retries"):
+            del state[key]
+        return state
+
+    def __setstate__(self, state: JSONDict) -> None:
+        # Limits are learned afresh in each process.
+        self.__dict__.update(state)
+        self._reset()
+
+    @property
+    def concurrency_limit(self) -> int:
+        """The current limit on requests in flight."""
+        return int(self._concurrency.limit)
+
+    in_flight = property(lambda self: self._concurrency.in_flight)
+
+    def send(
+        self, request: Callable[[], requests.Response], idempotent: bool = True
+    ) -> requests.Response:
+        """Send a request under the throttle, retrying overload responses.
+        ``request`` may also raise an ``HTTPError`` holding the response.
+        Set ``idempotent=False`` for requests that mustn't be repeated if the
+        service may have processed them."""
+        retry_statuses = RETRY_STATUSES if idempotent else REJECTED_STATUSES
+        attempt = 0
+        while True:
+            self._wait()
+            response, error = None, None
+            try:
+                response = request()
+            except requests.HTTPError as exc:
+                if exc.response is None:
+                    raise
+                response, error = exc.response, exc
+            finally:
+                # Connection errors and timeouts count as overloads too.
+                status = response.status_code if response is not None else None
+                self._concurrency.release(
+                    response.elapsed.total_seconds() if response is not None else None,
+                    overloaded=status is None or status == 429 or status >= 500,
+                )
+            if status not in retry_statuses or attempt == self.max_retries:
+                if error is not None:
+                    raise error
+                return response
+            delay = _retry_after(response)
+            if delay is None:
+                delay = self.backoff_seconds * 2**attempt * random.uniform(0.5, 1.5)
+            logger.info(f"Got {status}, retrying in {delay:.2f}s.")
+            with self._lock:
+                self.retries += 1
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            attempt += 1
+
+    def _wait(self) -> None:
+        delay = self._paused_until - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        if self._bucket is not None:
+            self._bucket.acquire()
+        self._concurrency.acquire()
+
+
+def _retry_after(response: requests.Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def get_throttle(throttle: Throttle | bool | None) -> Throttle | None:
+    """Resolve a throttle from a throttle, or ``True`` for the defaults."""
+    if throttle is None or throttle is False:
+        return None
+    if throttle is True:
+        return Throttle()
+    return throttle
@@ -1,18 +1,20 @@
 from __future__ import annotations
 
 import logging
+import threading
 from tempfile import NamedTemporaryFile
-from typing import Optional
+from typing import TYPE_CHECKING
 
 import requests
-from bermuda import Triangle as BermudaTriangle
 from requests.exceptions import ChunkedEncodingError
 
-from .config import JSONDict
-from .console import RichConsole
 from .interface import TriangleInterface
+from .progress import append_stdout
 from .requester import Requester
 
+if TYPE_CHECKING:
+    from .config import JSONDict
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,25 +32,114 @@ class Triangle(TriangleInterface):
         self._id: str = id
         self._name: str = name
         self._data: JSONDict = data
+        self._fingerprint: str | None = None
         self._get_response: requests.Response | None = None
         self._delete_response: requests.Response | None = None
         self._captured_stdout: str = ""
+        self._stdout_lock = threading.Lock()
+        self._data_lock = threading.Lock()
 
     id = property(lambda self: self._id)
     name = property(lambda self: self._name)
-    data = property(lambda self: self._data)
     get_response = property(lambda self: self._get_response)
     delete_response = property(lambda self: self._delete_response)
     captured_stdout = property(lambda self: self._captured_stdout)
 
+    def _capture(self, stdout: str) -> None:
+        with self._stdout_lock:
+            self._captured_stdout = append_stdout(self._captured_stdout, stdout)
+
+    @property
+    def data(self) -> JSONDict:
+        """The triangle data. Unpickled handles download it on first access."""
+        if self._data is None:
+            with self._data_lock:
+                if self._data is None:
+                    data, _, stdout = self._download(
+                        self.id, self.name, self.endpoint, self._requester
+                    )
+                    self._capture(stdout)
+                    self._data = data
+        return self._data
+
+    def __getstate__(self) -> JSONDict:
+        """Pickle the handle without its data and responses, so it's cheap
+        to send to other processes. The fingerprint is kept."""
+        state = self.__dict__.copy()
+        for key in ("_data", "_get_response", "_delete_response"):
+            state[key] = None
+        state.pop("_post_response", None)
+        del state["_stdout_lock"], state["_data_lock"]
+        return state
+
+    def __setstate__(self, state: JSONDict) -> None:
+        self.__dict__.update(state)
+        self._stdout_lock = threading.Lock()
+        self._data_lock = threading.Lock()
+
+    @property
+    def fingerprint(self) -> str:
+        """A SHA-256 hash of the triangle's cell hashes, identical for
+        triangles with identical contents whatever their names. It's built
+        from cell hashes so it can also be computed from those the server
+        holds, without downloading the data."""
+        if self._fingerprint is None:
+            from .delta import cell_hashes
+            from .fit_cache import content_hash
+
+            self._fingerprint = content_hash(cell_hashes(self.data))
+        return self._fingerprint
+
     def to_bermuda(self):
+        from bermuda import Triangle as BermudaTriangle
+
         return BermudaTriangle.from_dict(self.data)
 
+    def to_arrow(self, float32: bool = False):
+        """Export the triangle as a long-format ``pyarrow.Table``.
+
+        See :func:`ledger_analytics.arrow.arrow_schema` for the columns.
+        """
+        from .arrow import to_arrow
+
+        return to_arrow(self, float32=float32)
+
+    def to_parquet(self, path: str, float32: bool = False, **kwargs) -> int:
+        """Stream the triangle to a Parquet file and return the rows written.
+
+        Keyword arguments are passed to :func:`ledger_analytics.arrow.write_parquet`.
+        """
+        from .arrow import write_parquet
+
+        return write_parquet(self, path, float32=float32, **kwargs)
+
     @classmethod
     def get(cls, id: str, name: str, endpoint: str, requester: Requester) -> Triangle:
-        console = RichConsole()
-        with console.status("Retrieving...", spinner="bouncingBar") as _:
-            console.log(f"Getting triangle '{name}' with ID '{id}'")
+        triangle_data, get_response, stdout = cls._download(
+            id, name, endpoint, requester
+        )
+        self = cls(
+            id,
+            name,
+            triangle_data,
+            endpoint,
+            requester,
+        )
+        if requester.retain_responses:
+            self._get_response = get_response
+        self._capture(stdout)
+        return self
+
+    @staticmethod
+    def _download(
+        id: str, name: str, endpoint: str, requester: Requester
+    ) -> tuple[JSONDict, requests.Response, str]:
+        """Download the triangle data, returning it with the response and
+        captured output."""
+        from bermuda import Triangle as BermudaTriangle
+
+        with requester.reporter.status("Retrieving...") as report:
+            report.log(f"Getting triangle '{name}' with ID '{id}'")
             get_response = None
             retries = 0
             max_retries = 5
@@ -57,13 +148,14 @@ class Triangle(TriangleInterface):
                 try:
                     retries += 1
                     get_response = requester.get(endpoint, stream=stream)
-                    if get_response.json().get("url") is not None:
-                        bytes = get_response.json().get("triangle_size_bytes")
+                    body = get_response.json()
+                    if body.get("url") is not None:
+                        bytes = body.get("triangle_size_bytes")
                         mb = 1_048_576
-                        console.log(
+                        report.log(
                             f"Retrieving triangle from pre-signed URL of size {bytes / mb:.02f}MB."
                         )
-                        url = get_response.json().get("url")
+                        url = body.get("url")
                         url_response = requests.get(url)
                         url_response.raise_for_status()
                         with NamedTemporaryFile(suffix=".trib") as f:
@@ -72,21 +164,12 @@ class Triangle(TriangleInterface):
                                 f.name
                             ).to_dict()
                     else:
-                        triangle_data = get_response.json().get("triangle_data")
+                        triangle_data = body.get("triangle_data")
                 except ChunkedEncodingError:
                     stream = True
                     continue
 
-        self = cls(
-            id,
-            name,
-            triangle_data,
-            endpoint,
-            requester,
-        )
-        self._get_response = get_response
-        self._captured_stdout += console.get_stdout()
-        return self
+        return triangle_data, get_response, report.stdout
 
     def delete(self) -> Triangle:
         self._delete_response = self._requester.delete(self.endpoint)
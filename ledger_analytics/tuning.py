@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable
+
+from .diagnostics import diagnostics_report
+
+if TYPE_CHECKING:
+    from .api import BaseClient
+    from .config import JSONDict
+    from .model import LedgerModel
+
+logger = logging.getLogger(__name__)
+
+TUNED_FIELDS = (
+    "chains",
+    "samples_per_chain",
+    "warmup_per_chain",
+    "adapt_delta",
+    "max_treedepth",
+)
+
+
+def size_bucket(n_cells: int | None) -> int | None:
+    """Triangles within a factor of two of each other share a bucket."""
+    return None if not n_cells else int(math.log2(n_cells))
+
+
+def _line_of_business(model: LedgerModel) -> str | None:
+    config = model.config or {}
+    return config.get("model_config", config).get("line_of_business")
+
+
+class TuningStore:
+    """A local store of fit diagnostics used to tune ``AutofitControl``.
+
+    Each record holds a fit's final sampler settings and diagnostics, keyed
+    by model type, line of business and triangle size. ``recommend`` picks
+    the cheapest settings that previously met the convergence thresholds
+    for similar fits, so new fits start where autofit ended up rather than
+    escalating to it again. Models created with ``autofit="auto"`` in their
+    config use the client's store.
+
+    ..  code:: python
+
+        client = AnalyticsClient(tuning_store="tuning.jsonl")
+        client.development_model.create(
+            triangle=triangle,
+            name="meyers_gmcl",
+            model_type="GMCL",
+            config={"autofit": "auto", "line_of_business": "PP"},
+        )
+
+    Attributes:
+        path: the JSON Lines file holding the records. ``None`` keeps them
+            in memory only.
+    """
+
+    def __init__(self, path: str | os.PathLike | None = None) -> None:
+        self.path = Path(path) if path is not None else None
+        self._lock = threading.Lock()
+        self._records: list[JSONDict] = []
+        if self.path is not None and self.path.exists():
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        self._records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping malformed line in {self.path}.")
+
+    def __getstate__(self) -> JSONDict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: JSONDict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def records(self) -> list[JSONDict]:
+        return list(self._records)
+
+    def add(
+        self,
+        models: Iterable[LedgerModel],
+        n_cells: int | None = None,
+        client: BaseClient | None = None,
+        max_workers: int = 8,
+    ) -> int:
+        """Record the diagnostics of finished fits and return the number of
+        records added. ``n_cells`` is the size of the triangles they were
+        fit to, if known. Unknown fit task responses are polled as in
+        ``diagnostics_report``."""
+        models = {model.id: model for model in models}
+        records = diagnostics_report(
+            models.values(), client=client, max_workers=max_workers
+        ).rows
+        for record in records:
+            record["line_of_business"] = _line_of_business(models[record["model_id"]])
+            record["n_cells"] = n_cells
+        with self._lock:
+            self._records.extend(records)
+            if self.path is not None:
+                with open(self.path, "a") as f:
+                    f.writelines(json.dumps(record) + "\n" for record in records)
+        return len(records)
+
+    def recommend(
+        self,
+        model_type: str,
+        line_of_business: str | None = None,
+        n_cells: int | None = None,
+        min_ess: float = 1000,
+        max_rhat: float = 1.05,
+    ) -> JSONDict | None:
+        """The cheapest ``autofit_override`` settings that met ``min_ess`` and
+        ``max_rhat`` within budget for this model type, preferring records
+        with the same line of business and triangle size. ``None`` if no
+        such fits have been recorded."""
+        passed = [
+            record
+            for record in self._records
+            if record["model_type"] == model_type
+            and record["status"] == "success"
+            and not record["budget_exhausted"]
+            and record["min_ess"] is not None
+            and record["min_ess"] >= min_ess
+            and (record["max_rhat"] or 0) <= max_rhat
+            and all(record.get(field) is not None for field in TUNED_FIELDS[:2])
+        ]
+        bucket = size_bucket(n_cells)
+        same_lob = [r for r in passed if r["line_of_business"] == line_of_business]
+        for group in (
+            [r for r in same_lob if size_bucket(r["n_cells"]) == bucket],
+            same_lob,
+            [r for r in passed if size_bucket(r["n_cells"]) == bucket],
+            passed,
+        ):
+            if group:
+                best = _cheapest(group)
+                return {
+                    field: best[field]
+                    for field in TUNED_FIELDS
+                    if best.get(field) is not None
+                }
+        return None
+
+
+def _cheapest(records: list[JSONDict]) -> JSONDict:
+    """The record whose final attempt used the least sampling compute. It's
+    measured in chain-seconds if every record was timed, or else in
+    iterations for all of them, so costs are always in the same unit."""
+    timed = all(record.get("max_chain_seconds") for record in records)
+    return min(records, key=lambda record: _cost(record, timed))
+
+
+def _cost(record: JSONDict, timed: bool = False) -> float:
+    """A fit's sampling compute, in chain-seconds if ``timed`` or else in
+    iterations."""
+    if timed:
+        return record["chains"] * record["max_chain_seconds"]
+    warmup = record.get("warmup_per_chain") or record["samples_per_chain"] // 2
+    return record["chains"] * (record["samples_per_chain"] + warmup)
+
+
+def get_tuning_store(
+    tuning_store: TuningStore | str | os.PathLike | None,
+) -> TuningStore | None:
+    if tuning_store is None or isinstance(tuning_store, TuningStore):
+        return tuning_store
+    return TuningStore(tuning_store)
@@ -0,0 +1,9 @@
+import pytest
+
+from ledger_analytics.local_server import LocalAnalyticsServer
+
+
+@pytest.fixture
+def server():
+    with LocalAnalyticsServer(task_duration=0.05) as server:
+        yield server
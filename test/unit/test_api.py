@@ -1,3 +1,10 @@
+import json
+import os
+import pickle
+import subprocess
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from test.unit.mock_requester import (
     ModelMockRequester,
     ModelMockRequesterAfterDeletion,
@@ -18,15 +25,30 @@ from ledger_analytics import (
     DevelopmentModel,
     ForecastModel,
     ModelInterface,
+    Requester,
     TailModel,
     TriangleInterface,
 )
 from ledger_analytics.api import ENV
+from ledger_analytics.callbacks import CallbackListener
 
 API_KEY = "abc.123"
 TEST_HOST = "http://test.com/analytics/"
 
 
+def test_ledger_analytics_lazy_imports():
+    heavy = ["bermuda", "rich", "pydantic"]
+    code = (
+        "import sys, ledger_analytics; "
+        "client = ledger_analytics.AnalyticsClient('abc.123'); "
+        f"print([m for m in {heavy} if m in sys.modules])"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "[]"
+
+
 def test_ledger_analytics_creation():
     assert isinstance(AnalyticsClient(API_KEY), AnalyticsClient)
 
@@ -66,7 +88,7 @@ def test_ledger_analytics_triangle_crud():
 def test_ledger_analytics_model_crud():
     client = AnalyticsClient(API_KEY, asynchronous=True)
     client.host = TEST_HOST
-    client._requester = ModelMockRequester(API_KEY)
+    client._requester = ModelMockRequester(API_KEY, retain_responses=True)
 
     development_model = client.development_model.create(
         triangle="test_meyers_triangle",
@@ -146,3 +168,112 @@ def test_ledger_analytics_model_configs():
             triangle="test_meyers_triangle",
             config={"foo": True},
         )
+
+
+@pytest.mark.parametrize("codec", ["json", "orjson"])
+def test_requester_codecs(codec):
+    pytest.importorskip(codec)
+    np = pytest.importorskip("numpy")
+    requester = Requester(API_KEY, codec=codec)
+    assert requester.codec.name == codec
+    body = {"values": np.arange(3), "scalar": np.float64(1.5), "keys": {0.5: 1.0}}
+    assert requester.codec.loads(requester.codec.dumps(body)) == {
+        "values": [0, 1, 2],
+        "scalar": 1.5,
+        "keys": {"0.5": 1.0},
+    }
+    with pytest.raises(requests.exceptions.JSONDecodeError):
+        requester.codec.loads(b"not json")
+
+
+def test_client_map(server):
+    with server.client() as client:
+        assert client.triangle is client.triangle
+        client.asynchronous = True
+        assert client.development_model._asynchronous
+        client.asynchronous = False
+
+        names = [f"test_triangle_{i}" for i in range(12)]
+        active, peak = 0, 0
+        lock = threading.Lock()
+
+        def upload(name):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            try:
+                return client.triangle.create(name=name, data=meyers_tri).name
+            finally:
+                with lock:
+                    active -= 1
+
+        assert client.map(upload, names, max_workers=3) == names
+        assert peak <= 3
+        assert client.triangle.list(limit=100)["count"] == 12
+
+        # Nested calls from pool threads run inline instead of deadlocking.
+        future = client.submit(lambda: client.map(len, names, max_workers=1))
+        assert future.result(timeout=10) == [len(name) for name in names]
+
+        with pytest.raises(requests.HTTPError):
+            client.map(upload, names[:2])
+    assert client._pool is None
+
+
+def _count_cells(triangle):
+    return sum(len(slice_["cells"]) for slice_ in triangle.data["slices"])
+
+
+def _list_triangles(client):
+    return client.triangle.list()["count"]
+
+
+def test_client_pickling(server, tmp_path):
+    listener = CallbackListener()
+    client = server.client(
+        callbacks=listener,
+        journal=tmp_path / "journal.jsonl",
+        fit_cache=True,
+        reporter="rich",
+    )
+    client.map(len, ["warm up the pool"])
+    triangle = client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+    model = client.development_model.create(
+        triangle=triangle, name="test_chain_ladder", model_type="ChainLadder"
+    )
+
+    copy = pickle.loads(pickle.dumps(client))
+    assert copy.host == client.host
+    assert copy.callbacks is None
+    assert copy.journal.path == client.journal.path
+    assert copy._pool is None
+    assert copy._requester._session is not client._requester._session
+    assert copy.triangle.list()["count"] == 1
+
+    # Handles are sent without their payloads, which are downloaded lazily.
+    payload = pickle.dumps(triangle)
+    assert len(payload) < len(json.dumps(triangle.data)) / 10
+    assert pickle.loads(payload).data == triangle.data
+    model_copy = pickle.loads(pickle.dumps(model))
+    assert model_copy.fit_response is None
+    assert model_copy.predict(triangle).name
+
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        assert (
+            list(pool.map(_count_cells, [triangle] * 2)) == [_count_cells(triangle)] * 2
+        )
+        assert pool.submit(_list_triangles, client).result() == 2
+
+    # Forked children get a fresh pool and session, and don't use the
+    # parent's listener.
+    if hasattr(os, "fork"):
+        session = client._requester._session
+        pid = os.fork()
+        if pid == 0:
+            ok = client.callbacks is None and client._pool is None
+            ok = ok and client._requester._session is not session
+            ok = ok and client.map(_list_triangles, [client]) == [2]
+            os._exit(0 if ok else 1)
+        assert os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1]) == 0
+    listener.stop()
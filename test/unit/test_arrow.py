@@ -0,0 +1,63 @@
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from bermuda import meyers_tri
+
+from ledger_analytics import Triangle
+from ledger_analytics.arrow import iter_record_batches, to_arrow, write_parquet
+
+N_SAMPLES = 10
+
+
+def _prediction_data():
+    data = meyers_tri.to_dict()
+    data["slices"][0]["details"] = {"program_name": "program_a"}
+    for cell in data["slices"][0]["cells"]:
+        cell["values"]["paid_loss"] = [cell["values"]["paid_loss"]] * N_SAMPLES
+    return data
+
+
+def _triangle(name, data):
+    return Triangle("abc", name, data, "http://test.com/triangle/abc", None)
+
+
+def test_triangle_to_arrow():
+    table = _triangle("test_meyers_triangle", meyers_tri.to_dict()).to_arrow()
+    n_cells = len(meyers_tri.cells)
+    n_fields = len(meyers_tri.fields)
+    assert table.num_rows == n_cells * n_fields
+    assert table.schema.field("value").type == pa.float64()
+    assert pa.types.is_dictionary(table.schema.field("program_name").type)
+    assert set(table.column("sample").to_pylist()) == {0}
+    assert table.column("triangle_name").unique().to_pylist() == [
+        "test_meyers_triangle"
+    ]
+
+
+def test_triangle_samples_to_arrow_float32():
+    table = to_arrow(_prediction_data(), float32=True)
+    n_cells = len(meyers_tri.cells)
+    assert table.num_rows == n_cells * (N_SAMPLES + 2)
+    assert table.schema.field("value").type == pa.float32()
+    assert table.column("program_name").unique().to_pylist() == ["program_a"]
+    paid = table.filter(pc.equal(table.column("field"), "paid_loss"))
+    assert max(paid.column("sample").to_pylist()) == N_SAMPLES - 1
+
+
+def test_record_batches_are_bounded():
+    batches = list(iter_record_batches(_prediction_data(), batch_rows=50))
+    assert len(batches) > 1
+    assert all(batch.num_rows < 50 + N_SAMPLES for batch in batches)
+
+
+def test_write_parquet_many_triangles(tmp_path):
+    triangles = (_triangle(f"tri_{i}", _prediction_data()) for i in range(3))
+    path = tmp_path / "predictions.parquet"
+    n_rows = write_parquet(triangles, str(path), batch_rows=100)
+    table = pq.read_table(path)
+    assert table.num_rows == n_rows
+    assert sorted(table.column("triangle_name").unique().to_pylist()) == [
+        "tri_0",
+        "tri_1",
+        "tri_2",
+    ]
@@ -0,0 +1,70 @@
+import pytest
+from bermuda import meyers_tri
+
+
+def test_warm_start(server):
+    client = server.client()
+    client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+    previous = client.development_model.create(
+        triangle="test_meyers_triangle",
+        name="test_chain_ladder",
+        model_type="ChainLadder",
+    )
+    model = client.development_model.create(
+        triangle="test_meyers_triangle",
+        name="test_chain_ladder_refit",
+        model_type="ChainLadder",
+        config={"warm_start": {"inits": False}},
+        warm_start_from="test_chain_ladder",
+    )
+    # Fits without a warm start don't send one.
+    task_args = server.models["development-model"][previous.id]["modal_task_info"]
+    assert "warm_start" not in task_args["task_args"]["model_config"]
+    task_args = server.models["development-model"][model.id]["modal_task_info"]
+    assert task_args["task_args"]["model_config"]["warm_start"] == {
+        "model_id": previous.id,
+        "step_size": True,
+        "mass_matrix": True,
+        "inits": False,
+    }
+
+    with pytest.raises(ValueError, match="Can't warm start"):
+        client.development_model.create(
+            triangle="test_meyers_triangle",
+            name="test_meyers_crc",
+            model_type="MeyersCRC",
+            warm_start_from=previous,
+        )
+    with pytest.raises(ValueError, match="don't support warm starts"):
+        client.development_model.create(
+            triangle="test_meyers_triangle",
+            name="test_manual_ata",
+            model_type="ManualATA",
+            warm_start_from=previous,
+        )
+
+
+def test_autofit_budget(server):
+    client = server.client()
+    client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+    model = client.development_model.create(
+        triangle="test_meyers_triangle",
+        name="test_chain_ladder",
+        model_type="ChainLadder",
+        config={"autofit_override": {"max_wall_time_seconds": 0.01}},
+    )
+    assert model.budget_used == {
+        "wall_time_seconds": 0.01,
+        "max_wall_time_seconds": 0.01,
+        "budget_exhausted": True,
+    }
+    # Unset budget fields aren't sent.
+    info = server.models["development-model"][model.id]["modal_task_info"]
+    autofit = info["task_args"]["model_config"]["autofit_override"]
+    assert autofit["max_wall_time_seconds"] == 0.01
+    assert "target_ess_per_second" not in autofit
+
+    n_requests = server.request_count
+    model = client.development_model.get(name="test_chain_ladder", load=False)
+    assert model.budget_used["budget_exhausted"]
+    assert server.request_count - n_requests == 3
@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+from bermuda import meyers_tri
+
+from ledger_analytics.backtest import _target, backtest, crps, score
+from ledger_analytics.local_server import LocalAnalyticsServer
+
+
+def test_backtest(tmp_path):
+    rng = np.random.default_rng(0)
+    full = meyers_tri.to_dict()
+    evaluations = sorted(
+        {cell["evaluation_date"] for cell in full["slices"][0]["cells"]}
+    )
+
+    def predictor(data):
+        latest = max(c["evaluation_date"] for c in data["slices"][0]["cells"])
+        future = evaluations[evaluations.index(latest) + 1]
+        cells = [
+            cell | {"values": {"paid_loss": (paid * rng.normal(1, 0.1, 200)).tolist()}}
+            for cell in full["slices"][0]["cells"]
+            if cell["evaluation_date"] == future
+            for paid in [cell["values"]["paid_loss"]]
+        ]
+        return {"slices": [data["slices"][0] | {"cells": cells}]}
+
+    with LocalAnalyticsServer(task_duration=0.05, predictor=predictor) as server:
+        client = server.client()
+        report = backtest(client, meyers_tri, "ChainLadder", max_workers=3)
+        # Each run uploads its clipped triangle and a target of held-out cells.
+        uploads = server.request_log.count(("POST", "/analytics/triangle"))
+        assert uploads == 2 * len(report.rows)
+        # Everything uploaded is cleaned up.
+        assert not server.triangles
+        assert not server.models["development-model"]
+
+    # Failed fits are cleaned up too.
+    with LocalAnalyticsServer(task_status="failure") as server:
+        failed = backtest(server.client(), meyers_tri, "ChainLadder", max_workers=2)
+        assert all(row["status"].startswith("failed") for row in failed.rows)
+        assert not server.triangles
+        assert not server.models["development-model"]
+
+    assert [row["eval_date"] for row in report.rows] == evaluations[-5:-1]
+    for row in report.rows:
+        assert row["status"] == "success"
+        assert row["n_cells"] > 0
+        assert 0 < row["scaled_crps"] < 0.1
+        assert 0.5 < row["coverage_0.9"] <= 1
+    assert "coverage_0.5" in str(report).splitlines()[0]
+
+    report.to_csv(tmp_path / "backtest.csv")
+    with open(tmp_path / "backtest.csv") as f:
+        assert len(f.readlines()) == 5
+
+    with pytest.raises(ValueError):
+        backtest(client, meyers_tri, "ChainLadder", eval_dates=[evaluations[-1]])
+
+
+def test_crps():
+    rng = np.random.default_rng(0)
+    # CRPS matches its definition, E|X - y| - E|X - X'| / 2.
+    samples, actual = rng.normal(size=(3, 50)), rng.normal(size=3)
+    expected = np.abs(samples - actual[:, None]).mean(axis=1) - 0.5 * np.abs(
+        samples[:, :, None] - samples[:, None, :]
+    ).mean(axis=(1, 2))
+    assert np.allclose(crps(samples, actual), expected)
+
+    # A point forecast's CRPS is its absolute error.
+    assert np.allclose(crps(np.full((2, 10), 3.0), np.array([1.0, 4.0])), [2, 1])
+
+
+def _cell(evaluation_date, **values):
+    return {
+        "period_start": "2000-01-01",
+        "period_end": "2000-12-31",
+        "evaluation_date": evaluation_date,
+        "values": values,
+    }
+
+
+def test_score():
+    holdout = {
+        "slices": [
+            {
+                "cells": [
+                    _cell("2001-12-31", paid_loss=10.0, earned_premium=50.0),
+                    _cell("2002-12-31", paid_loss=20.0),
+                ]
+            }
+        ]
+    }
+    prediction = {
+        "slices": [
+            {
+                "cells": [
+                    _cell("2001-12-31", paid_loss=list(np.linspace(5, 15, 101))),
+                    _cell("2003-12-31", paid_loss=[30.0]),
+                ]
+            }
+        ]
+    }
+    result = score(prediction, holdout, "paid_loss", levels=[0.5])
+    # Only cells present in both are scored.
+    assert result["n_cells"] == 1
+    assert result["coverage_0.5"] == 1.0
+    assert result["scaled_crps"] == pytest.approx(result["crps"] / 10)
+
+    empty = score({"slices": []}, holdout, "paid_loss", levels=[0.5])
+    assert empty == {"n_cells": 0, "crps": None, "scaled_crps": None} | {
+        "coverage_0.5": None
+    }
+
+    # Targets keep the held-out cells without their losses.
+    target = _target(holdout)
+    assert [cell["values"] for cell in target["slices"][0]["cells"]] == [
+        {"earned_premium": 50.0},
+        {},
+    ]
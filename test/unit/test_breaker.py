@@ -0,0 +1,175 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+from bermuda import meyers_tri
+
+from ledger_analytics.breaker import CircuitBreaker, CircuitOpenError, endpoint_template
+from ledger_analytics.local_server import LocalAnalyticsServer
+
+
+def test_circuit_breaker():
+    breaker = CircuitBreaker(min_requests=4, open_seconds=0.2, per_endpoint=True)
+    with LocalAnalyticsServer() as server:
+        client = server.client(circuit_breaker=breaker)
+        client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+        triangles = client.triangle.endpoint
+
+        # With the upload, 3 of 4 requests failed.
+        server.inject_failures(3, path="triangle")
+        for _ in range(3):
+            with pytest.raises(requests.HTTPError):
+                client.triangle.list()
+        count = server.request_count
+        with pytest.raises(CircuitOpenError):
+            client.triangle.list()
+        assert server.request_count == count
+        assert breaker.states()[breaker.key(triangles)] == {
+            "state": "open",
+            "failure_rate": 0.75,
+            "requests": 4,
+        }
+
+        # Other endpoints have their own circuits.
+        assert client.development_model.list()["count"] == 0
+        assert breaker.state(client.development_model.endpoint) == "closed"
+
+        # A failed trial reopens the circuit, and a successful one closes it.
+        time.sleep(0.25)
+        server.inject_failures(1, path="triangle")
+        with pytest.raises(requests.HTTPError):
+            client.triangle.list()
+        assert breaker.state(triangles) == "open"
+        time.sleep(0.25)
+        assert client.triangle.list()["count"] == 1
+        assert breaker.state(triangles) == "closed"
+
+    # During an outage, concurrent workers fail fast rather than each
+    # waiting on the host.
+    with LocalAnalyticsServer(latency=0.01, failure_rate=1.0) as server:
+        client = server.client(circuit_breaker=CircuitBreaker(min_requests=5))
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [
+                pool.submit(client.triangle.list, limit=i + 1) for i in range(40)
+            ]
+        errors = [future.exception() for future in futures]
+        assert all(isinstance(error, requests.RequestException) for error in errors)
+        assert sum(isinstance(error, CircuitOpenError) for error in errors) >= 25
+        assert server.request_count < 15
+
+
+URL = "http://test.com/analytics/triangle"
+
+
+def _response(status):
+    response = requests.Response()
+    response.status_code = status
+    return response
+
+
+def _raise(status):
+    def request():
+        raise requests.HTTPError(response=_response(status))
+
+    return request
+
+
+def test_circuit_breaker_transitions():
+    breaker = CircuitBreaker(failure_rate=0.5, min_requests=4, open_seconds=0.05)
+    for status in (200, 500, 404):
+        breaker.call(URL, lambda: _response(status))
+    # Client errors aren't failures, and too few requests were seen anyway.
+    assert breaker.state(URL) == "closed"
+
+    with pytest.raises(requests.HTTPError):
+        breaker.call(URL, _raise(503))
+    assert breaker.state(URL) == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.call(URL, lambda: _response(200))
+
+    # Once half-open, a single trial goes through at a time.
+    time.sleep(0.06)
+
+    def trial():
+        with pytest.raises(CircuitOpenError, match="half-open"):
+            breaker.call(URL, lambda: _response(200))
+        return _response(500)
+
+    breaker.call(URL, trial)
+    assert breaker.state(URL) == "open"
+
+    time.sleep(0.06)
+    breaker.call(URL, lambda: _response(200))
+    assert breaker.states()["test.com"] == {
+        "state": "closed",
+        "failure_rate": 0.0,
+        "requests": 0,
+    }
+
+
+def test_circuit_breaker_stale_outcomes():
+    breaker = CircuitBreaker(min_requests=1, open_seconds=0.05)
+    started = {name: threading.Event() for name in ("slow", "trial")}
+    finish = {name: threading.Event() for name in ("slow", "trial")}
+
+    def wait(name, status):
+        def request():
+            started[name].set()
+            finish[name].wait()
+            return _response(status)
+
+        return request
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        try:
+            slow = pool.submit(breaker.call, URL, wait("slow", 200))
+            started["slow"].wait()
+            breaker.call(URL, lambda: _response(500))
+            assert breaker.state(URL) == "open"
+
+            time.sleep(0.06)
+            trial = pool.submit(breaker.call, URL, wait("trial", 500))
+            started["trial"].wait()
+            # A request sent while the circuit was closed doesn't count as the
+            # trial, so the circuit stays half-open until the trial finishes.
+            finish["slow"].set()
+            slow.result()
+            assert breaker.state(URL) == "half_open"
+            with pytest.raises(CircuitOpenError, match="half-open"):
+                breaker.call(URL, lambda: _response(200))
+            finish["trial"].set()
+            trial.result()
+        finally:
+            for event in finish.values():
+                event.set()
+    assert breaker.state(URL) == "open"
+    assert breaker._circuits["test.com"].trials == 0
+
+
+def test_circuit_breaker_window():
+    breaker = CircuitBreaker(min_requests=2, window_seconds=0.05)
+    breaker.call(URL, lambda: _response(500))
+    time.sleep(0.06)
+    # The earlier failure has left the window.
+    breaker.call(URL, lambda: _response(500))
+    assert breaker.state(URL) == "closed"
+    breaker.call(URL, lambda: _response(200))
+    assert breaker.state(URL) == "open"
+
+    breaker.reset()
+    assert breaker.state(URL) == "closed"
+
+
+def test_endpoint_template():
+    assert (
+        endpoint_template(f"http://test.com/analytics/triangle/{'ab12' * 8}/cells")
+        == "test.com/analytics/triangle/{id}/cells"
+    )
+    assert (
+        endpoint_template("http://test.com/analytics/tasks/42?limit=1")
+        == "test.com/analytics/tasks/{id}"
+    )
+    breaker = CircuitBreaker(per_endpoint=True)
+    assert breaker.key(f"{URL}/1") == breaker.key(f"{URL}/2") != breaker.key(URL)
@@ -0,0 +1,43 @@
+from bermuda import meyers_tri
+
+from ledger_analytics import Triangle
+from ledger_analytics.callbacks import CallbackListener
+from ledger_analytics.local_server import LocalAnalyticsServer
+
+
+def test_task_callbacks():
+    with (
+        LocalAnalyticsServer(task_duration=0.2) as server,
+        CallbackListener(fallback_interval=60) as listener,
+    ):
+        client = server.client(callbacks=listener)
+        client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+        model = client.development_model.create(
+            triangle="test_meyers_triangle",
+            name="test_chain_ladder",
+            model_type="ChainLadder",
+        )
+        prediction = model.predict("test_meyers_triangle")
+        assert isinstance(prediction, Triangle)
+        assert not any(
+            path.startswith("/analytics/tasks") for _, path in server.request_log
+        )
+
+    # Without a callback, waiting falls back to polling.
+    with (
+        LocalAnalyticsServer(task_duration=0.2) as server,
+        CallbackListener(fallback_interval=0.05) as listener,
+    ):
+        client = server.client(asynchronous=True)
+        client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+        model = client.development_model.create(
+            triangle="test_meyers_triangle",
+            name="test_chain_ladder",
+            model_type="ChainLadder",
+        )
+        model._requester.callbacks = listener
+        assert model.wait()["status"] == "success"
+        n_polls = sum(
+            path.startswith("/analytics/tasks") for _, path in server.request_log
+        )
+        assert 1 <= n_polls <= 10
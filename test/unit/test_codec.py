@@ -0,0 +1,83 @@
+import datetime
+import json
+
+import numpy as np
+import pytest
+import requests
+from bermuda import meyers_tri
+
+from ledger_analytics.codec import JSONCodec, compress, decompress, get_codec
+from ledger_analytics.local_server import LocalAnalyticsServer
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_compressed_transfer(compression):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    data = meyers_tri.to_dict()
+    with LocalAnalyticsServer(compress_above_bytes=1024) as server:
+        client = server.client(compression=compression, retain_responses=True)
+        client._requester.compress_above_bytes = 1024
+        client.triangle.create(name="test_meyers_triangle", data=data)
+        assert server.bytes_received < len(client._requester.codec.dumps(data)) / 4
+
+        got = client.triangle.get(name="test_meyers_triangle")
+        assert got.get_response.headers["Content-Encoding"] in ("gzip", "zstd")
+        assert got.data == data
+
+
+@pytest.mark.parametrize("codec", ["json", "orjson"])
+def test_codec_round_trip(codec):
+    if codec == "orjson":
+        pytest.importorskip("orjson")
+    codec = get_codec(codec)
+    obj = {"values": np.arange(3), "date": datetime.date(2020, 1, 1), "x": 1.5}
+    assert codec.loads(codec.dumps(obj)) == {
+        "values": [0, 1, 2],
+        "date": "2020-01-01",
+        "x": 1.5,
+    }
+    with pytest.raises(requests.exceptions.JSONDecodeError):
+        codec.loads(b"{not json")
+
+
+@pytest.mark.parametrize("codec", ["json", "orjson"])
+def test_codec_non_finite_values(codec):
+    if codec == "orjson":
+        pytest.importorskip("orjson")
+    codec = get_codec(codec)
+    # Non-finite values are rejected rather than uploaded as null.
+    for value in (float("nan"), [1.0, float("inf")], np.array([1.0, np.nan])):
+        with pytest.raises(ValueError):
+            codec.dumps({"values": value})
+    # Responses holding them still decode.
+    parsed = codec.loads(b'{"a": NaN, "b": [Infinity, 1.5]}')
+    assert np.isnan(parsed["a"])
+    assert parsed["b"] == [float("inf"), 1.5]
+
+
+def test_get_codec():
+    codec = JSONCodec()
+    assert get_codec(codec) is codec
+    assert type(get_codec()) is JSONCodec
+    with pytest.raises(ValueError, match="Unrecognized JSON codec"):
+        get_codec("yaml")
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_compress_round_trip(compression):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    content = json.dumps(meyers_tri.to_dict()).encode()
+    compressed = compress(content, compression)
+    assert len(compressed) < len(content)
+    assert decompress(compressed, compression) == content
+
+
+def test_unknown_encodings():
+    assert decompress(b"body", None) == b"body"
+    assert decompress(b"body", "identity") == b"body"
+    with pytest.raises(ValueError):
+        compress(b"body", "br")
+    with pytest.raises(ValueError):
+        decompress(b"body", "br")
@@ -0,0 +1,102 @@
+import copy
+import json
+
+from bermuda import meyers_tri
+
+from ledger_analytics.delta import apply_delta, cell_hashes, diff_cells
+from ledger_analytics.local_server import LocalAnalyticsServer
+
+
+def test_incremental_update(server):
+    client = server.client()
+    data = meyers_tri.to_dict()
+    last = max(cell["evaluation_date"] for cell in data["slices"][0]["cells"])
+    history = {
+        "slices": [
+            slice_
+            | {"cells": [c for c in slice_["cells"] if c["evaluation_date"] < last]}
+            for slice_ in data["slices"]
+        ]
+    }
+    client.triangle.create(name="test_meyers_triangle", data=history)
+
+    received = server.bytes_received
+    triangle = client.triangle.get_or_update(
+        name="test_meyers_triangle", data=meyers_tri
+    )
+    delta_bytes = server.bytes_received - received
+    assert ("POST", f"/analytics/triangle/{triangle.id}/cells") in server.request_log
+    assert delta_bytes < len(json.dumps(data)) / 3
+    assert client.triangle.get(name="test_meyers_triangle").to_bermuda() == meyers_tri
+
+    # Nothing changed, so nothing is uploaded.
+    n_requests = server.request_count
+    client.triangle.update(name="test_meyers_triangle", data=meyers_tri)
+    assert all(method == "GET" for method, _ in server.request_log[n_requests:])
+
+    # Removing cells can't be expressed as a delta: the triangle is replaced.
+    client.triangle.update(name="test_meyers_triangle", data=history)
+    assert server.request_log[-1] == ("POST", "/analytics/triangle")
+
+
+def test_update_without_cell_deltas():
+    with LocalAnalyticsServer(cell_deltas=False) as server:
+        client = server.client()
+        client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+
+        # Unchanged data is compared, not re-uploaded.
+        n_requests = server.request_count
+        triangle = client.triangle.get_or_update(
+            name="test_meyers_triangle", data=meyers_tri
+        )
+        assert triangle.data == meyers_tri.to_dict()
+        assert all(method == "GET" for method, _ in server.request_log[n_requests:])
+
+        data = meyers_tri.to_dict()
+        data["slices"][0]["cells"] = data["slices"][0]["cells"][:-1]
+        client.triangle.get_or_update(name="test_meyers_triangle", data=data)
+        assert server.request_log[-1] == ("POST", "/analytics/triangle")
+        assert client.triangle.get(name="test_meyers_triangle").data == data
+        # The cell endpoints aren't probed.
+        assert not any(path.endswith("/cells") for _, path in server.request_log)
+
+    # Cell deltas are opt-in.
+    with LocalAnalyticsServer() as server:
+        client = server.client(cell_deltas=False)
+        assert not client.cell_deltas
+        client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+        client.triangle.update(name="test_meyers_triangle", data=meyers_tri)
+        assert not any(path.endswith("/cells") for _, path in server.request_log)
+
+
+def test_diff_cells():
+    data = meyers_tri.to_dict()
+    hashes = cell_hashes(data)
+    assert diff_cells(data, hashes) == ([], True)
+
+    changed = copy.deepcopy(data)
+    cell = changed["slices"][0]["cells"][3]
+    cell["values"]["paid_loss"] += 1
+    delta, complete = diff_cells(changed, hashes)
+    assert complete
+    assert [slice_["cells"] for slice_ in delta] == [[cell]]
+    assert cell_hashes(apply_delta(data, delta)) == cell_hashes(changed)
+
+    # A new slice is sent whole.
+    other = data["slices"][0] | {"currency": "EUR"}
+    extended = {"slices": [*data["slices"], other]}
+    delta, complete = diff_cells(extended, hashes)
+    assert complete
+    assert delta == [other]
+    assert cell_hashes(apply_delta(data, delta)) == cell_hashes(extended)
+
+
+def test_diff_cells_incomplete():
+    data = meyers_tri.to_dict()
+    hashes = cell_hashes(data)
+
+    # Deltas can't remove cells or slices.
+    fewer_cells = copy.deepcopy(data)
+    fewer_cells["slices"][0]["cells"].pop()
+    assert diff_cells(fewer_cells, hashes) == ([], False)
+    assert diff_cells({"slices": []}, hashes) == ([], False)
@@ -0,0 +1,37 @@
+import csv
+
+from bermuda import meyers_tri
+
+from ledger_analytics.diagnostics import diagnostics_report
+
+
+def test_fit_diagnostics(server, tmp_path):
+    client = server.client()
+    client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+    models = [
+        client.development_model.create(
+            triangle="test_meyers_triangle",
+            name=f"test_chain_ladder_{chains}",
+            model_type="ChainLadder",
+            config={"autofit_override": {"chains": chains}},
+        )
+        for chains in (2, 4)
+    ]
+    diagnostics = models[0].fit_diagnostics
+    assert diagnostics is models[0].fit_diagnostics
+    assert diagnostics.status == "success"
+    assert diagnostics.attempts == 1
+    assert diagnostics.chains == 2
+    assert diagnostics.ess_per_second == diagnostics.min_ess / 0.05
+
+    handles = [
+        client.development_model.get(name=model.name, load=False) for model in models
+    ]
+    report = diagnostics_report(handles, client=client)
+    assert [row["chains"] for row in report.rows] == [2, 4]
+    assert report.rows[1]["model_name"] == "test_chain_ladder_4"
+    assert diagnostics_report(handles).rows == report.rows
+
+    report.to_csv(tmp_path / "diagnostics.csv")
+    with open(tmp_path / "diagnostics.csv") as f:
+        assert len(list(csv.DictReader(f))) == 2
@@ -0,0 +1,115 @@
+from bermuda import meyers_tri
+
+from ledger_analytics.development import ChainLadder
+from ledger_analytics.fit_cache import FitCache, content_hash, fit_key
+from ledger_analytics.local_server import LocalAnalyticsServer
+
+
+def test_fit_cache(server, tmp_path):
+    client = server.client(fit_cache=tmp_path / "fits.jsonl")
+    triangle = client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+    copy = client.triangle.create(name="test_meyers_copy", data=meyers_tri)
+    model = client.development_model.create(
+        triangle=triangle, name="test_chain_ladder", model_type="ChainLadder"
+    )
+
+    def n_fits():
+        return sum(
+            request == ("POST", "/analytics/development-model")
+            for request in server.request_log
+        )
+
+    # Identical data under another triangle name, and explicit defaults.
+    reused = client.development_model.create(
+        triangle="test_meyers_copy",
+        name="test_chain_ladder",
+        model_type="ChainLadder",
+        config={"autofit_override": {}, "loss_family": "gamma"},
+    )
+    assert reused.id == model.id
+    assert n_fits() == 1
+    # The copy is fingerprinted from its cell hashes, not downloaded.
+    assert ("GET", f"/analytics/triangle/{copy.id}/cells") in server.request_log
+    assert ("GET", f"/analytics/triangle/{copy.id}") not in server.request_log
+
+    # Models are only reused under their own name, and overwriting refits.
+    other = client.development_model.create(
+        triangle=triangle, name="test_chain_ladder_2", model_type="ChainLadder"
+    )
+    assert other.name == "test_chain_ladder_2" and n_fits() == 2
+    refit = client.development_model.create(
+        triangle=triangle,
+        name="test_chain_ladder_2",
+        model_type="ChainLadder",
+        overwrite=True,
+    )
+    assert refit.id != other.id and n_fits() == 3
+
+    client.development_model.create(
+        triangle=triangle,
+        name="test_chain_ladder_3",
+        model_type="ChainLadder",
+        config={"loss_family": "Lognormal"},
+    )
+    assert n_fits() == 4
+
+    # The cache persists, and deleted models are refit.
+    client = server.client(fit_cache=tmp_path / "fits.jsonl")
+    client.development_model.delete(id=model.id)
+    refit = client.development_model.create(
+        triangle=triangle, name="test_chain_ladder", model_type="ChainLadder"
+    )
+    assert refit.id != model.id
+    assert n_fits() == 5
+
+
+def test_fit_cache_without_cell_deltas(tmp_path):
+    with LocalAnalyticsServer(task_duration=0.05, cell_deltas=False) as server:
+        client = server.client(fit_cache=tmp_path / "fits.jsonl")
+        triangle = client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+        for _ in range(2):
+            client.development_model.create(
+                triangle="test_meyers_triangle",
+                name="test_chain_ladder",
+                model_type="ChainLadder",
+            )
+        assert server.request_log.count(("POST", "/analytics/development-model")) == 1
+        # Named triangles are matched by ID, without downloading them.
+        assert ("GET", f"/analytics/triangle/{triangle.id}") not in server.request_log
+
+        # Replacing the triangle gives it a new ID, and so a new fingerprint.
+        fingerprint, n_cells = client.triangle._fingerprint("test_meyers_triangle")
+        assert n_cells is None
+        client.triangle.create(
+            name="test_meyers_triangle", data=meyers_tri, overwrite=True
+        )
+        assert client.triangle._fingerprint("test_meyers_triangle")[0] != fingerprint
+
+
+def test_fit_key():
+    config = ChainLadder._model_config({})
+    key = fit_key(content_hash({"a": 1}), "ChainLadder", config)
+    assert key == fit_key(content_hash({"a": 1}), "ChainLadder", dict(config))
+    # An omitted autofit_override stands for the defaults.
+    assert key == fit_key(
+        content_hash({"a": 1}),
+        "ChainLadder",
+        ChainLadder._model_config({"autofit_override": {}}),
+    )
+    assert key != fit_key(content_hash({"a": 2}), "ChainLadder", config)
+    assert key != fit_key(content_hash({"a": 1}), "GMCL", config)
+
+
+def test_fit_cache_persistence(tmp_path):
+    path = tmp_path / "fits.jsonl"
+    cache = FitCache(path)
+    cache.put("key_1", "development_model", "model_1", "name_1")
+    cache.put("key_2", "development_model", "model_2", "name_2")
+    cache.discard("key_1")
+    with open(path, "a") as f:
+        f.write('{"key": "key_3", "model_')
+
+    reloaded = FitCache(path)
+    assert len(reloaded) == 1
+    assert reloaded.get("key_1") is None
+    assert reloaded.get("key_2")["model_name"] == "name_2"
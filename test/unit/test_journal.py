@@ -0,0 +1,93 @@
+from bermuda import meyers_tri
+
+from ledger_analytics.journal import TaskJournal
+from ledger_analytics.local_server import LocalAnalyticsServer
+
+
+def test_resume_from_journal(tmp_path):
+    journal = tmp_path / "tasks.jsonl"
+    with LocalAnalyticsServer(task_duration=0.2) as server:
+        client = server.client(asynchronous=True, journal=journal)
+        client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+        dev = client.development_model.create(
+            triangle="test_meyers_triangle",
+            name="test_chain_ladder",
+            model_type="ChainLadder",
+        )
+        tail = client.tail_model.create(
+            triangle="test_meyers_triangle",
+            name="test_bondy",
+            model_type="GeneralizedBondy",
+        )
+        dev.predict("test_meyers_triangle", prediction_name="test_prediction")
+        cashflow = client.cashflow_model.create(dev, tail, name="test_cashflow")
+        cashflow.predict(
+            "test_meyers_triangle",
+            config={"min_reserve": {}},
+            prediction_name="test_cashflow_pred",
+        )
+        assert len(client.journal.pending()) == 4
+
+        # A new process: nothing is resubmitted.
+        n_posts = sum(method == "POST" for method, _ in server.request_log)
+        resumed = server.client().resume(journal)
+        assert sum(method == "POST" for method, _ in server.request_log) == n_posts
+        assert [(task.kind, task.status) for task in resumed] == [
+            ("fit", "success"),
+            ("fit", "success"),
+            ("predict", "success"),
+            ("predict", "success"),
+        ]
+        assert resumed[0].result.id == dev.id
+        assert resumed[2].result.name == "test_prediction"
+        assert resumed[3].result.name == "test_cashflow_pred"
+
+        assert server.client().resume(journal) == []
+        assert len(server.client().resume(journal, include_finished=True)) == 4
+
+
+def test_journal_entries(tmp_path):
+    journal = TaskJournal(tmp_path / "tasks.jsonl")
+    assert journal.entries() == []
+
+    journal.submitted("fit", "task_1", model_id="model_1")
+    journal.submitted("predict", "task_2", model_id="model_1")
+    journal.finished("task_2", "success")
+    # Finishing a task that was never submitted is ignored.
+    journal.finished("task_3", "success")
+    # A process died while writing a line.
+    with open(journal.path, "a") as f:
+        f.write('{"event": "submitted", "task_')
+
+    entries = journal.entries()
+    assert [(entry["task_id"], entry["status"]) for entry in entries] == [
+        ("task_1", None),
+        ("task_2", "success"),
+    ]
+    assert entries[0]["model_id"] == "model_1"
+    assert [entry["task_id"] for entry in journal.pending()] == ["task_1"]
+
+
+def test_resume_unfinished_and_failed_tasks(tmp_path):
+    journal = tmp_path / "tasks.jsonl"
+    with LocalAnalyticsServer(task_duration=60) as server:
+        client = server.client(asynchronous=True, journal=journal)
+        client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+        client.development_model.create(
+            triangle="test_meyers_triangle",
+            name="test_chain_ladder",
+            model_type="ChainLadder",
+        )
+
+        # Tasks still running when the timeout runs out stay pending.
+        [task] = server.client().resume(journal, timeout=0)
+        assert task.status is None and task.result is None
+        assert len(client.journal.pending()) == 1
+
+        # Failed tasks are recorded as finished, without a result.
+        for task in server.tasks.values():
+            task |= {"status": "failure", "duration": 0}
+        [task] = server.client().resume(journal)
+        assert task.status == "failure" and task.result is None
+        assert client.journal.pending() == []
+        assert server.client().resume(journal) == []
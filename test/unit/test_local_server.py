@@ -0,0 +1,96 @@
+import pytest
+import requests
+from bermuda import meyers_tri
+
+from ledger_analytics import DevelopmentModel, Triangle
+from ledger_analytics.local_server import LocalAnalyticsServer
+
+
+def test_local_server_triangle_crud(server):
+    client = server.client()
+    triangle = client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+    assert client.triangle.list()["count"] == 1
+
+    got = client.triangle.get(name="test_meyers_triangle")
+    assert isinstance(got, Triangle)
+    assert got.id == triangle.id
+    assert got.to_bermuda() == meyers_tri
+
+    with pytest.raises(requests.HTTPError):
+        client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+
+    client.triangle.delete(name="test_meyers_triangle")
+    with pytest.raises(ValueError):
+        client.triangle.get(name="test_meyers_triangle")
+
+
+def test_local_server_presigned_download():
+    with LocalAnalyticsServer(presign_above_bytes=1024) as server:
+        client = server.client(retain_responses=True)
+        client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+        got = client.triangle.get(name="test_meyers_triangle")
+        assert got.get_response.json()["url"].startswith(server.url)
+        assert got.to_bermuda() == meyers_tri
+
+
+def test_local_server_fit_predict(server):
+    client = server.client()
+    client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+    model = client.development_model.create(
+        triangle="test_meyers_triangle",
+        name="test_chain_ladder",
+        model_type="ChainLadder",
+    )
+    assert isinstance(model, DevelopmentModel)
+    assert client.development_model.get(name="test_chain_ladder").id == model.id
+
+    n_requests = server.request_count
+    handle = client.development_model.get(name="test_chain_ladder", load=False)
+    assert server.request_count - n_requests == 2
+    assert handle.get_response.json()["name"] == "test_chain_ladder"
+    assert server.request_count - n_requests == 3
+
+    prediction = model.predict(
+        "test_meyers_triangle", prediction_name="test_predictions"
+    )
+    assert prediction.name == "test_predictions"
+    assert prediction.to_bermuda() == meyers_tri
+
+    client.tail_model.create(
+        triangle="test_meyers_triangle",
+        name="test_bondy",
+        model_type="GeneralizedBondy",
+    )
+    cashflow = client.cashflow_model.create(
+        dev_model="test_chain_ladder", tail_model="test_bondy", name="test_cashflows"
+    )
+    # Related model names come from the model listings, and no model
+    # details are downloaded.
+    n_requests = len(server.request_log)
+    got = client.cashflow_model.get(id=cashflow.id)
+    assert got.dev_model_name == "test_chain_ladder"
+    assert got.tail_model_name == "test_bondy"
+    assert {path for _, path in server.request_log[n_requests:]} == {
+        "/analytics/cashflow-model",
+        "/analytics/development-model",
+        "/analytics/tail-model",
+    }
+
+
+def test_local_server_failures_and_termination():
+    with LocalAnalyticsServer(task_duration=60) as server:
+        client = server.client(asynchronous=True)
+        server.inject_failures(1, status=500, path="triangle")
+        with pytest.raises(requests.HTTPError):
+            client.triangle.list()
+        assert client.triangle.list()["count"] == 0
+
+        client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+        model = client.development_model.create(
+            triangle="test_meyers_triangle",
+            name="test_chain_ladder",
+            model_type="ChainLadder",
+        )
+        assert model.poll()["status"] == "PENDING"
+        model.terminate()
+        assert model.poll()["status"] == "TERMINATED"
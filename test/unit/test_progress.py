@@ -0,0 +1,46 @@
+import logging
+
+from bermuda import meyers_tri
+
+from ledger_analytics.progress import (
+    MAX_CAPTURED_STDOUT,
+    LoggingReporter,
+    append_stdout,
+)
+
+
+def test_reporters(server, monkeypatch, caplog):
+    monkeypatch.setenv("DISABLE_RICH_CONSOLE", "true")
+    client = server.client()
+    client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+    assert (
+        "Getting triangle"
+        in client.triangle.get(name="test_meyers_triangle").captured_stdout
+    )
+
+    silent = server.client(reporter="none")
+    assert silent.triangle.get(name="test_meyers_triangle").captured_stdout == ""
+
+    logged = server.client(reporter=LoggingReporter())
+    with caplog.at_level(logging.INFO, logger="ledger_analytics"):
+        logged.triangle.get(name="test_meyers_triangle")
+        with logged.reporter.batch(total=2, description="Batch") as progress:
+            progress.advance()
+            progress.advance()
+    assert "Getting triangle 'test_meyers_triangle'" in caplog.text
+    assert "Batch: 2/2 complete" in caplog.text
+    assert progress.completed == 2
+
+
+def test_captured_stdout_is_capped(server):
+    assert append_stdout("a", "") == "a"
+    assert append_stdout("a", "b") == "ab"
+    capped = append_stdout("x" * MAX_CAPTURED_STDOUT, "new")
+    assert len(capped) == MAX_CAPTURED_STDOUT
+    assert capped.endswith("xnew")
+
+    client = server.client()
+    triangle = client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+    for _ in range(3):
+        triangle._capture("x" * MAX_CAPTURED_STDOUT)
+    assert len(triangle.captured_stdout) == MAX_CAPTURED_STDOUT
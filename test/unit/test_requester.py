@@ -0,0 +1,53 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from bermuda import meyers_tri
+
+from ledger_analytics.local_server import LocalAnalyticsServer
+
+
+def test_concurrent_gets_are_coalesced():
+    with LocalAnalyticsServer(latency=0.2) as server:
+        client = server.client()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            listings = list(pool.map(lambda _: client.triangle.list(), range(8)))
+        assert server.request_count == 1
+        assert all(listing == listings[0] for listing in listings)
+
+        # Each caller gets its own copy of the shared body.
+        client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first, second = pool.map(
+                lambda _: client.triangle.get(name="test_meyers_triangle"), range(2)
+            )
+        assert server.request_log.count(("GET", f"/analytics/triangle/{first.id}")) == 1
+        assert first.data is not second.data
+        first.data["slices"].clear()
+        assert second.data["slices"]
+
+
+def test_responses_not_retained_by_default(server):
+    client = server.client()
+    triangle = client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+    assert client.triangle.get(name="test_meyers_triangle").get_response is None
+    model = client.development_model.create(
+        triangle=triangle, name="test_chain_ladder", model_type="ChainLadder"
+    )
+    assert model.fit_response is None
+    assert model.fit_task_id is not None
+
+    prediction = model.predict(triangle, prediction_name="test_predictions")
+    assert model.predict_response is None
+    assert prediction.id == model.prediction_id
+
+    got = client.development_model.get(name="test_chain_ladder", load=False)
+    assert got.fit_task_id == model.fit_task_id
+    assert got.triangle_name == "test_meyers_triangle"
+    assert got._get_response is None
+
+
+def test_requester_decodes_response_once():
+    with LocalAnalyticsServer() as server:
+        response = server.client()._requester.get(server.url + "triangle")
+        assert response.json() is response.json()
+        # The raw body is dropped once it's decoded.
+        assert response.content is None
@@ -0,0 +1,45 @@
+import pytest
+from bermuda import meyers_tri
+
+from ledger_analytics.sweep import expand_grid, sweep
+
+
+def test_sweep(server):
+    client = server.client()
+    client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+    grid = {"recency_decay": [1.0, 0.9], "loss_family": ["Gamma", "gamma"]}
+
+    # Family names are case-insensitive, so half of the grid is duplicated.
+    assert len(expand_grid("ChainLadder", grid)) == 2
+    with pytest.raises(ValueError):
+        expand_grid("ChainLadder", {"loss_family": ["Poisson"]})
+
+    report = sweep(
+        client,
+        "test_meyers_triangle",
+        "ChainLadder",
+        grid,
+        score=lambda model: model.config["model_config"]["recency_decay"],
+    )
+    assert len(server.models["development-model"]) == 2
+    assert [row["status"] for row in report.rows] == ["success"] * 2
+    assert report.best()["recency_decay"] == 0.9
+    assert report.rows[0]["min_ess"] == 5000
+    assert "ess_per_second" in str(report).splitlines()[0]
+
+    # Stopping after the first fit cancels the rest, though the other running
+    # fit may finish first.
+    server.task_duration = 0.5
+    report = sweep(
+        client,
+        "test_meyers_triangle",
+        "ChainLadder",
+        {"recency_decay": [1.0, 0.95, 0.9, 0.85, 0.8, 0.75]},
+        max_workers=2,
+        stop=lambda row: True,
+    )
+    statuses = [row["status"] for row in report.rows]
+    assert statuses.count("success") <= 2
+    assert statuses.count("cancelled") >= 4
+    assert any(task["terminated"] for task in server.tasks.values())
+    assert len(server.models["development-model"]) < 8
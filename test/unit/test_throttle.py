@@ -0,0 +1,129 @@
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+from bermuda import meyers_tri
+
+from ledger_analytics.local_server import LocalAnalyticsServer
+from ledger_analytics.throttle import AdaptiveConcurrency, Throttle, TokenBucket
+
+
+def test_throttle():
+    with LocalAnalyticsServer(latency=0.02, capacity=2) as server:
+        names = [f"test_triangle_{i}" for i in range(16)]
+
+        client = server.client()
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            # Distinct limits so single-flight doesn't merge the requests.
+            futures = [
+                pool.submit(client.triangle.list, limit=i + 1)
+                for i in range(len(names))
+            ]
+        errors = [future.exception() for future in futures]
+        assert any(isinstance(error, requests.HTTPError) for error in errors)
+        assert "429" in str(next(error for error in errors if error is not None))
+
+        throttle = Throttle(initial_concurrency=8, backoff_seconds=0.01, max_retries=8)
+        client = server.client(throttle=throttle)
+        with client:
+            uploaded = client.map(
+                lambda name: client.triangle.create(name=name, data=meyers_tri),
+                names,
+                max_workers=16,
+            )
+        assert len(uploaded) == len(names)
+        assert throttle.retries > 0
+        assert throttle.concurrency_limit < 8
+        assert throttle.in_flight == 0
+
+        # The limit recovers once responses are healthy again.
+        server.capacity = None
+        limit = throttle.concurrency_limit
+        for _ in range(50):
+            client.triangle.list()
+        assert throttle.concurrency_limit > limit
+
+        # Gateway errors are retried for GETs, but not for POSTs the service
+        # may have processed.
+        retries = throttle.retries
+        server.inject_failures(1, status=502)
+        client.triangle.list()
+        assert throttle.retries == retries + 1
+        server.inject_failures(1, status=502)
+        with pytest.raises(requests.HTTPError, match="502"):
+            client.triangle.create(name="test_triangle_502", data=meyers_tri)
+        assert throttle.retries == retries + 1
+        server.inject_failures(1, status=503)
+        client.triangle.create(name="test_triangle_503", data=meyers_tri)
+        assert throttle.retries == retries + 2
+
+        copy = pickle.loads(pickle.dumps(throttle))
+        assert copy.concurrency_limit == 8
+        assert copy.retries == 0
+
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=100, burst=1)
+    start = time.perf_counter()
+    for _ in range(11):
+        bucket.acquire()
+    assert time.perf_counter() - start >= 0.09
+
+
+def test_adaptive_concurrency_increase():
+    concurrency = AdaptiveConcurrency(initial=4, max_limit=5)
+    # About one more slot per round trip of healthy responses.
+    for _ in range(4):
+        concurrency.acquire()
+        concurrency.release(0.1, overloaded=False)
+    assert 4.9 < concurrency.limit < 5
+    for _ in range(20):
+        concurrency.acquire()
+        concurrency.release(0.1, overloaded=False)
+    assert concurrency.limit == 5
+    assert concurrency.in_flight == 0
+
+
+def test_adaptive_concurrency_decrease():
+    concurrency = AdaptiveConcurrency(initial=8, min_limit=2, backoff=0.5)
+    concurrency.acquire()
+    concurrency.release(0.1, overloaded=False)
+    limit = concurrency.limit
+
+    # A burst of overloads within one round trip cuts the limit once.
+    for _ in range(3):
+        concurrency.acquire()
+        concurrency.release(None, overloaded=True)
+    assert concurrency.limit == limit * 0.5
+
+    # A slow response is an overload too.
+    time.sleep(0.15)
+    concurrency.acquire()
+    concurrency.release(1.0, overloaded=False)
+    assert concurrency.limit == limit * 0.25
+
+    # The limit doesn't drop below its minimum.
+    time.sleep(0.25)
+    concurrency.acquire()
+    concurrency.release(None, overloaded=True)
+    assert concurrency.limit == 2
+
+
+def test_adaptive_concurrency_waits_for_a_slot():
+    concurrency = AdaptiveConcurrency(initial=1)
+    concurrency.acquire()
+    acquired = threading.Event()
+
+    def acquire():
+        concurrency.acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=acquire)
+    thread.start()
+    assert not acquired.wait(0.05)
+    concurrency.release(0.01, overloaded=False)
+    assert acquired.wait(1)
+    thread.join()
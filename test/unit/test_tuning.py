@@ -0,0 +1,97 @@
+import json
+
+from bermuda import meyers_tri
+
+from ledger_analytics.tuning import TuningStore, _cheapest, _cost
+
+
+def test_autofit_auto(server, tmp_path):
+    client = server.client(tuning_store=tmp_path / "tuning.jsonl")
+    triangle = client.triangle.create(name="test_meyers_triangle", data=meyers_tri)
+
+    def model_config(model):
+        info = server.models["development-model"][model.id]["modal_task_info"]
+        return info["task_args"]["model_config"]
+
+    # Without history, auto uses the defaults and records the fit.
+    model = client.development_model.create(
+        triangle=triangle,
+        name="test_chain_ladder",
+        model_type="ChainLadder",
+        config={"autofit": "auto"},
+    )
+    assert "autofit" not in model_config(model)
+    assert model_config(model)["autofit_override"] is None
+    assert len(client.tuning_store) == 1
+
+    cheap = client.development_model.create(
+        triangle=triangle,
+        name="test_chain_ladder_cheap",
+        model_type="ChainLadder",
+        config={"autofit_override": {"chains": 2}},
+    )
+    client.tuning_store.add([cheap], n_cells=100)
+
+    client = server.client(tuning_store=tmp_path / "tuning.jsonl")
+    model = client.development_model.create(
+        triangle=triangle,
+        name="test_chain_ladder_tuned",
+        model_type="ChainLadder",
+        config={"autofit": "auto", "autofit_override": {"adapt_delta": 0.9}},
+    )
+    autofit = model_config(model)["autofit_override"]
+    assert autofit["chains"] == 2
+    assert autofit["adapt_delta"] == 0.9
+
+
+def _record(**fields):
+    return {
+        "model_type": "ChainLadder",
+        "status": "success",
+        "budget_exhausted": False,
+        "min_ess": 2000,
+        "max_rhat": 1.0,
+        "line_of_business": None,
+        "n_cells": None,
+        "chains": 4,
+        "samples_per_chain": 1000,
+        "warmup_per_chain": None,
+        "max_chain_seconds": None,
+    } | fields
+
+
+def test_cost():
+    assert _cost(_record(chains=2, samples_per_chain=1000)) == 3000
+    assert _cost(_record(warmup_per_chain=100)) == 4400
+    assert _cost(_record(chains=2, max_chain_seconds=10.0), timed=True) == 20.0
+
+
+def test_cheapest_compares_one_unit():
+    fast = _record(chains=2, samples_per_chain=3000, max_chain_seconds=1.0)
+    slow = _record(chains=4, samples_per_chain=1000, max_chain_seconds=100.0)
+    assert _cheapest([fast, slow]) is fast
+    # Without timings for every record, all are compared in iterations.
+    untimed = _record(chains=4, samples_per_chain=1000)
+    assert _cheapest([fast, untimed]) is untimed
+
+
+def test_recommend(tmp_path):
+    records = [
+        _record(chains=2, line_of_business="CA"),
+        _record(chains=3, line_of_business="PP", n_cells=1000),
+        _record(chains=4, line_of_business="PP", n_cells=50),
+        _record(chains=1, min_ess=10),
+        _record(chains=1, budget_exhausted=True),
+        _record(chains=1, status="failure"),
+    ]
+    path = tmp_path / "tuning.jsonl"
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    store = TuningStore(path)
+    assert len(store) == 6
+
+    # Records with the same line of business and size come first.
+    assert store.recommend("ChainLadder", "PP", n_cells=60)["chains"] == 4
+    assert store.recommend("ChainLadder", "PP")["chains"] == 3
+    assert store.recommend("ChainLadder", "CL")["chains"] == 2
+    assert store.recommend("ChainLadder", min_ess=5000) is None
+    assert store.recommend("GMCL") is None